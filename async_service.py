@@ -0,0 +1,127 @@
+# async_service.py
+# واجهة asyncio فوق TaskService: عمل SQLite الحاجب يُنفَّذ على منفّذ خيوط مخصص بعدد محدود،
+# فلا تتوقف حلقة الأحداث، وطلبات create_task المتزامنة تُدمج في استدعاء create_tasks واحد.
+
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .task_service import CREATED
+except ImportError:  # تشغيل مباشر كسكربت
+    from task_service import CREATED
+
+
+class AsyncTaskService:
+    """Awaitable front-end for a TaskService (either variant).
+
+    The wrapped service's database must be usable from the executor threads:
+    a PooledDatabase / GroupCommitDatabase, or a RealDatabase opened with
+    check_same_thread=False together with max_workers=1.
+    """
+
+    def __init__(self, service, max_workers=1, max_batch=500):
+        self.service = service
+        self.max_workers = max_workers
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-db")
+        self._limits = weakref.WeakKeyDictionary()  # حلقة الأحداث -> Semaphore
+        self._pending = []
+        self._flush_scheduled = False
+        self._flushes = set()
+        self.batches = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _semaphore(self):
+        # Semaphore لكل حلقة أحداث: الكائن مرتبط بالحلقة التي استخدمته أولاً،
+        # فالخدمة نفسها تعمل من عدة استدعاءات asyncio.run() متتالية
+        loop = asyncio.get_running_loop()
+        limit = self._limits.get(loop)
+        if limit is None:
+            limit = self._limits[loop] = asyncio.Semaphore(self.max_workers)
+        return limit
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        async with self._semaphore():
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def create_task(self, name):
+        # الأسماء غير الصالحة، أو خدمة بلا create_tasks، تمر مباشرة لتبقى رسائل الخطأ كما هي
+        if name is None or not str(name).strip() or not hasattr(self.service, "create_tasks"):
+            return await self._run(self.service.create_task, name)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((str(name).strip(), future))
+        if not self._flush_scheduled:
+            self._schedule_flush()
+        return await future
+
+    def _schedule_flush(self):
+        self._flush_scheduled = True
+        flush = asyncio.ensure_future(self._flush())
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        # ننتظر خانة في المنفّذ قبل أخذ الدفعة؛ أثناء الانتظار تتجمع طلبات أكثر
+        async with self._semaphore():
+            self._flush_scheduled = False
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            if self._pending:
+                self._schedule_flush()
+            batch = [(name, future) for name, future in batch if not future.done()]
+            if not batch:
+                return
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.service.create_tasks, [name for name, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        self.batches += 1
+        for (name, future), (_, status) in zip(batch, results):
+            if future.done():
+                continue
+            if status == CREATED:
+                future.set_result({"name": name, "completed": False})
+            else:
+                future.set_exception(ValueError(f"Task with name '{name}' already exists."))
+
+    async def create_tasks(self, names):
+        return await self._run(self.service.create_tasks, list(names))
+
+    async def delete_task(self, name):
+        return await self._run(self.service.delete_task, name)
+
+    async def mark_task_complete(self, name):
+        return await self._run(self.service.mark_task_complete, name)
+
+    async def get_all_tasks(self):
+        return await self._run(self.service.get_all_tasks)
+
+    async def find_task(self, name):
+        return await self._run(self.service.find_task, name)
+
+    async def list_tasks(self, after_rowid=0, limit=100):
+        return await self._run(self.service.list_tasks, after_rowid, limit)
+
+    async def search_tasks(self, query, limit=20, after=None):
+        return await self._run(self.service.search_tasks, query, limit, after)
+
+    async def stats(self):
+        return await self._run(self.service.stats)
@@ -0,0 +1,67 @@
+# benchmarks/bench_async.py
+# آلاف coroutines تنشئ مهام في نفس الوقت: استدعاء TaskService مباشرة من داخل الحلقة
+# (يحجبها) مقابل AsyncTaskService. نقيس الإنتاجية وتأخر حلقة الأحداث عبر coroutine
+# تنام 1ms وتسجل كم تأخرت عن موعدها.
+#
+#   python -m benchmarks.bench_async --coroutines 1000 10000
+
+import argparse
+import asyncio
+import time
+
+from async_service import AsyncTaskService
+from task_service import RealDatabase, TaskService
+
+from .common import print_table
+
+TICK = 0.001
+
+
+async def monitor_lag(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def drive(create, coroutines):
+    stop = asyncio.Event()
+    lags = []
+    monitor = asyncio.ensure_future(monitor_lag(stop, lags))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(create(f"Task_{i}") for i in range(coroutines)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    lags.sort()
+    return coroutines / elapsed, lags[len(lags) // 2] * 1e3, lags[-1] * 1e3
+
+
+async def run(coroutine_counts):
+    rows = []
+    for count in coroutine_counts:
+        service = TaskService(RealDatabase())
+
+        async def blocking_create(name):
+            return service.create_task(name)
+
+        rate, p50, worst = await drive(blocking_create, count)
+        rows.append(("blocking", count, f"{rate:,.0f}", f"{p50:.2f}", f"{worst:.2f}"))
+
+        async_service = AsyncTaskService(TaskService(RealDatabase(check_same_thread=False)))
+        rate, p50, worst = await drive(async_service.create_task, count)
+        rows.append(("AsyncTaskService", count, f"{rate:,.0f}", f"{p50:.2f}", f"{worst:.2f}"))
+        async_service.close()
+    print_table(["front-end", "coroutines", "creates/s", "loop lag p50 ms", "loop lag max ms"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-loop latency and throughput for async creates")
+    parser.add_argument("--coroutines", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+    asyncio.run(run(args.coroutines))
+
+
+if __name__ == "__main__":
+    main()
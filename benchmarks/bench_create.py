@@ -0,0 +1,55 @@
+# benchmarks/bench_create.py
+# يقارن عدد عمليات create_task في الثانية: المسار القديم (find ثم insert)
+# مقابل الجملة الواحدة INSERT ... ON CONFLICT DO NOTHING، على جداول ممتلئة مسبقاً.
+#
+#   python -m benchmarks.bench_create --sizes 10000 100000 1000000
+
+import argparse
+import time
+
+from task_service import RealDatabase, TaskService
+
+from .common import populate, print_table
+
+
+def legacy_create(db, name):
+    """The old create path: a lookup followed by a separate insert."""
+    if db.find(name):
+        raise ValueError(f"Task with name '{name}' already exists.")
+    db.cursor.execute("INSERT INTO tasks (name, completed) VALUES (?, ?)", (name, 0))
+    db.conn.commit()
+
+
+def ops_per_second(create, ops):
+    start = time.perf_counter()
+    for i in range(ops):
+        create(f"New_{i}")
+    return ops / (time.perf_counter() - start)
+
+
+def run(sizes, ops):
+    rows = []
+    for size in sizes:
+        db = RealDatabase()
+        populate(db, size)
+        before = ops_per_second(lambda name: legacy_create(db, name), ops)
+        db.conn.close()
+
+        db = RealDatabase()
+        populate(db, size)
+        after = ops_per_second(TaskService(db).create_task, ops)
+        db.conn.close()
+        rows.append((size, f"{before:,.0f}", f"{after:,.0f}", f"{after / before:.2f}x"))
+    print_table(["existing rows", "find+insert ops/s", "single stmt ops/s", "speedup"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="create_task throughput before/after")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.sizes, args.ops)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_group_commit.py
+# إنشاء متزامن لعدد كبير من المهام: PooledDatabase (كل خيط يلتزم بمفرده ويتنافس على القفل)
+# مقابل GroupCommitDatabase (خيط كاتب واحد يلتزم بمجموعات).
+#
+#   python -m benchmarks.bench_group_commit --threads 1 16 128 512 --profile durable
+
+import argparse
+import concurrent.futures
+import os
+import tempfile
+import time
+
+from connection_pool import PooledDatabase
+from group_commit import GroupCommitDatabase
+from task_service import TaskService
+
+from .common import print_table
+
+
+def throughput(db, threads, ops):
+    service = TaskService(db)
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(service.create_task, (f"Task_{i}" for i in range(ops))))
+    return ops / (time.perf_counter() - start)
+
+
+def run(thread_counts, ops, profile):
+    rows = []
+    for threads in thread_counts:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = PooledDatabase(os.path.join(tmpdir, "pooled.sqlite"), profile=profile)
+            pooled = throughput(db, threads, ops)
+            db.close()
+
+            db = GroupCommitDatabase(os.path.join(tmpdir, "grouped.sqlite"), profile=profile)
+            grouped = throughput(db, threads, ops)
+            avg_group = db.writer.requests_committed / max(db.writer.groups_committed, 1)
+            db.close()
+        rows.append((threads, f"{pooled:,.0f}", f"{grouped:,.0f}", f"{avg_group:.1f}"))
+    print_table(["threads", "pooled ops/s", "group commit ops/s", "avg group"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent create_task throughput")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 16, 128, 512])
+    parser.add_argument("--ops", type=int, default=10_000)
+    parser.add_argument("--profile", default="durable")
+    args = parser.parse_args()
+    run(args.threads, args.ops, args.profile)
+
+
+if __name__ == "__main__":
+    main()
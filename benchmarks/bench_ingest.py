@@ -0,0 +1,68 @@
+# benchmarks/bench_ingest.py
+# معدّل الاستيراد الجماعي: ملف SQLite واحد (task_io.import_tasks بكاتب واحد) مقابل
+# ShardedDatabase.ingest بعملية كاتبة لكل ملف. المكسب يظهر فقط مع عدة أنوية.
+#
+#   python -m benchmarks.bench_ingest
+#   python -m benchmarks.bench_ingest --rows 1000000 --shards 2 4 8
+
+import argparse
+import os
+import tempfile
+import time
+
+from sharded_storage import ShardedDatabase
+from task_io import DEFAULT_TRANSACTION_SIZE
+from task_service import RealDatabase
+
+from .common import print_table
+
+
+def _tasks(rows):
+    return ({"name": f"Task_{i}", "completed": i % 3 == 0} for i in range(rows))
+
+
+def bench_single(directory, rows, transaction_size, profile):
+    db = RealDatabase(os.path.join(directory, "single.sqlite"), profile=profile)
+    tasks = _tasks(rows)
+    start = time.perf_counter()
+    while True:
+        chunk = [task for _, task in zip(range(transaction_size), tasks)]
+        if not chunk:
+            break
+        db.insert_many(chunk)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bench_sharded(directory, rows, shards, transaction_size, profile):
+    db = ShardedDatabase(os.path.join(directory, f"sharded-{shards}"), shards=shards, profile=profile)
+    start = time.perf_counter()
+    db.ingest(_tasks(rows), transaction_size=transaction_size)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-file vs sharded bulk ingest")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--transaction-size", type=int, default=DEFAULT_TRANSACTION_SIZE)
+    parser.add_argument("--profile", default="fast-ingest")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        single = bench_single(tmpdir, args.rows, args.transaction_size, args.profile)
+        rows = [["single file", f"{single:.2f}", f"{args.rows / single:,.0f}", "1.0x"]]
+        for shards in args.shards:
+            elapsed = bench_sharded(tmpdir, args.rows, shards, args.transaction_size, args.profile)
+            rows.append([f"{shards} shards", f"{elapsed:.2f}", f"{args.rows / elapsed:,.0f}",
+                         f"{single / elapsed:.1f}x"])
+    print(f"{args.rows} rows, {args.transaction_size} per transaction, profile={args.profile}, "
+          f"{os.cpu_count()} CPUs\n")
+    print_table(["engine", "seconds", "rows/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_listing.py
+# ذروة الذاكرة (tracemalloc) عند المرور على كل المهام: get_all مقابل iter_tasks.
+#
+#   python -m benchmarks.bench_listing --sizes 10000 100000 1000000
+
+import argparse
+import time
+import tracemalloc
+
+from task_service import RealDatabase
+
+from .common import populate, print_table
+
+
+def peak(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak_bytes / 1024 / 1024, elapsed
+
+
+def consume(tasks):
+    for _ in tasks:
+        pass
+
+
+def run(sizes, chunk_size):
+    rows = []
+    for size in sizes:
+        db = RealDatabase()
+        populate(db, size)
+        full_mb, full_s = peak(lambda: consume(db.get_all()))
+        stream_mb, stream_s = peak(lambda: consume(db.iter_tasks(chunk_size)))
+        rows.append((size, f"{full_mb:.1f}", f"{stream_mb:.2f}", f"{full_s:.2f}", f"{stream_s:.2f}"))
+        db.close()
+    print_table(["rows", "get_all peak MB", "iter_tasks peak MB", "get_all s", "iter_tasks s"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of full vs streamed listing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=1_000)
+    args = parser.parse_args()
+    run(args.sizes, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
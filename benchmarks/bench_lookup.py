@@ -0,0 +1,47 @@
+# benchmarks/bench_lookup.py
+# يقيس زمن البحث بالاسم مع نمو الجدول: المطابقة عبر COLLATE NOCASE (تستعمل الفهرس)
+# مقابل الصيغة القديمة LOWER(name) = LOWER(?) (مسح كامل للجدول).
+#
+#   python -m benchmarks.bench_lookup
+#   python -m benchmarks.bench_lookup --sizes 1000 10000 100000 1000000
+
+import argparse
+import random
+
+from task_service import RealDatabase
+
+from .common import measure, populate, print_table
+
+LEGACY_FIND = "SELECT name, completed FROM tasks WHERE LOWER(name) = LOWER(?)"
+
+
+def run(sizes, lookups, legacy_limit):
+    rows = []
+    for size in sizes:
+        db = RealDatabase()
+        populate(db, size)
+        names = [f"TASK_{random.randrange(size)}" for _ in range(lookups)]
+
+        indexed = measure(lambda i: db.find(names[i]), lookups)
+        if size <= legacy_limit:
+            legacy = measure(lambda i: db.cursor.execute(LEGACY_FIND, (names[i],)).fetchone(), lookups)
+            legacy = f"{legacy:.1f}"
+        else:
+            legacy = "skipped"
+        rows.append((size, f"{indexed:.1f}", legacy))
+        db.conn.close()
+    print_table(["rows", "find us/op", "LOWER() us/op"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Name lookup latency vs. table size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="skip the full-scan query above this many rows")
+    args = parser.parse_args()
+    run(args.sizes, args.lookups, args.legacy_limit)
+
+
+if __name__ == "__main__":
+    main()
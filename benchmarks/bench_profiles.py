@@ -0,0 +1,56 @@
+# benchmarks/bench_profiles.py
+# يقارن ملفات إعداد PRAGMA على قاعدة بيانات في ملف: إدخال فردي (commit لكل مهمة)،
+# إدخال جماعي (create_tasks)، وقراءة بالاسم.
+#
+#   python -m benchmarks.bench_profiles --rows 100000
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlite_profiles import PRAGMA_PROFILES
+from task_service import RealDatabase, TaskService
+
+from .common import print_table
+
+
+def rate(count, func):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def run(profiles, rows, single_rows, lookups):
+    results = []
+    for profile in profiles:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = RealDatabase(os.path.join(tmpdir, "bench.sqlite"), profile=profile)
+            service = TaskService(db)
+
+            def single():
+                for i in range(single_rows):
+                    service.create_task(f"Single_{i}")
+
+            single_rate = rate(single_rows, single)
+            bulk_rate = rate(rows, lambda: service.create_tasks(f"Bulk_{i}" for i in range(rows)))
+            names = [f"Bulk_{random.randrange(rows)}" for _ in range(lookups)]
+            read_rate = rate(lookups, lambda: [db.find(n) for n in names])
+            db.close()
+        results.append((profile, f"{single_rate:,.0f}", f"{bulk_rate:,.0f}", f"{read_rate:,.0f}"))
+    print_table(["profile", "create_task/s", "create_tasks rows/s", "find/s"], results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Insert/read throughput per pragma profile")
+    parser.add_argument("--profiles", nargs="+", default=list(PRAGMA_PROFILES))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single-rows", type=int, default=2_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.profiles, args.rows, args.single_rows, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
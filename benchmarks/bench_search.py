@@ -0,0 +1,116 @@
+# benchmarks/bench_search.py
+# زمن البحث في أسماء المهام: FTS5 (search) والبادئة عبر فهرس الاسم (search_prefix)،
+# مقابل الطريقة القديمة: get_all ثم التصفية في Python.
+# الحالة الكبيرة (--large-rows) تملأ "Task number N" وتفشل (رمز خروج 1) إذا تجاوز أي
+# استعلام يخدمه فهرس الاسم أو ترتيب FTS5 المحدود الحد --max-ms، بما فيها صفحة لاحقة عبر المؤشر.
+#
+#   python -m benchmarks.bench_search
+#   python -m benchmarks.bench_search --rows 1000000 --repeat 50
+#   python -m benchmarks.bench_search --large-rows 1000000 --max-ms 50
+
+import argparse
+import random
+import sys
+import time
+
+from task_service import RealDatabase
+
+from .common import print_table
+
+WORDS = ("alpha beta gamma delta report review deploy fix bug write docs plan meeting budget release "
+         "invoice client server backup audit migrate design onboarding roadmap").split()
+_BATCH = 50_000
+
+
+def _fill(db, rows):
+    rng = random.Random(7)
+    for start in range(0, rows, _BATCH):
+        db.insert_many({"name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}", "completed": False}
+                       for i in range(start, min(start + _BATCH, rows)))
+
+
+def _ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _page(db, query, pages):
+    # الصفحة رقم pages عبر مؤشر keyset، كما يتصفحها مستخدم
+    after = None
+    for _ in range(pages):
+        tasks, after = db.search(query, after=after)
+    return tasks
+
+
+def _large(rows, repeat, max_ms):
+    db = RealDatabase(search_index=True)
+    for start in range(0, rows, _BATCH):
+        db.insert_many({"name": f"Task number {i}", "completed": False}
+                       for i in range(start, min(start + _BATCH, rows)))
+    # max_ms = None: كلمة تطابق كل الصفوف دون أن تبدأ بها الأسماء؛ bm25 يُحسب لكل مطابقة
+    queries = [
+        ("search: 'task'", lambda: db.search("task"), max_ms),
+        ("search: 't'", lambda: db.search("t"), max_ms),
+        ("search: 'Task number 5'", lambda: db.search("Task number 5"), max_ms),
+        ("search: rare word", lambda: db.search(str(rows * 2 // 3)), max_ms),
+        ("search: 'task', page 50", lambda: _page(db, "task", 50), max_ms),
+        ("search: 'number' (bm25 over every row)", lambda: db.search("number"), None),
+    ]
+    table = []
+    slow = []
+    for label, func, bound in queries:
+        ms = _ms(func, repeat if bound else 1)
+        if bound is not None and ms > bound:
+            slow.append(label)
+        table.append([label, f"{ms:.2f}", "-" if bound is None else f"{bound:g}"])
+    db.close()
+    print(f"\n{rows} tasks named 'Task number N'\n")
+    print_table(["query", "ms", "max ms"], table)
+    return slow
+
+
+def _scan(db, text):
+    text = text.casefold()
+    return [task for task in db.get_all() if text in task["name"].casefold()][:20]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search latency with the FTS5 and name indexes")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--large-rows", type=int, default=1_000_000, help="0 skips the large case")
+    parser.add_argument("--max-ms", type=float, default=50.0, help="latency bound for the large case")
+    args = parser.parse_args()
+
+    plain = RealDatabase()
+    start = time.perf_counter()
+    _fill(plain, args.rows)
+    load_plain = time.perf_counter() - start
+    db = RealDatabase(search_index=True)
+    start = time.perf_counter()
+    _fill(db, args.rows)
+    load_indexed = time.perf_counter() - start
+
+    queries = [
+        ("search: rare number", lambda: db.search(str(args.rows // 3))),
+        ("search: two words", lambda: db.search("budget roadm")),
+        ("search: broad prefix", lambda: db.search("rev")),
+        ("search_prefix", lambda: db.search_prefix("review bud")),
+        ("get_all + filter", lambda: _scan(plain, "review bud")),
+    ]
+    rows = [[label, f"{_ms(func, 1 if label.startswith('get_all') else args.repeat):.2f}"] for label, func in queries]
+    print(f"{args.rows} tasks; insert_many load {load_plain:.2f}s without the FTS index, "
+          f"{load_indexed:.2f}s with it\n")
+    print_table(["query", "ms"], rows)
+
+    if args.large_rows:
+        slow = _large(args.large_rows, args.repeat, args.max_ms)
+        if slow:
+            print(f"\nslower than {args.max_ms:g} ms: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_snapshot.py
+# زمن إعادة بناء قاعدة ':memory:' بعد إعادة التشغيل: إعادة إدخال كل المهام (insert_many)
+# مقابل الإقلاع الدافئ من لقطة (RealDatabase.from_snapshot)، وكذلك زمن أخذ اللقطة نفسها.
+#
+#   python -m benchmarks.bench_snapshot
+#   python -m benchmarks.bench_snapshot --rows 1000000
+
+import argparse
+import os
+import tempfile
+import time
+
+from task_service import RealDatabase
+
+from .common import print_table
+
+_BATCH = 50_000
+
+
+def _replay(rows):
+    db = RealDatabase()
+    for start in range(0, rows, _BATCH):
+        db.insert_many({"name": f"Task_{i}", "completed": i % 3 == 0} for i in range(start, min(start + _BATCH, rows)))
+    return db
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay vs warm start from a snapshot")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "tasks.snapshot")
+        db, replay = _timed(lambda: _replay(args.rows))
+        size, snapshot = _timed(lambda: db.snapshot(path))
+        db.close()
+        warm_db, warm = _timed(lambda: RealDatabase.from_snapshot(path))
+        assert warm_db.count() == args.rows
+        warm_db.close()
+
+    mb = size / 1e6
+    rows = [
+        ["replay insert_many", f"{replay:.3f}", "-"],
+        ["snapshot (write)", f"{snapshot:.3f}", f"{mb / snapshot:,.0f}"],
+        ["warm start (read)", f"{warm:.3f}", f"{mb / warm:,.0f}"],
+    ]
+    print(f"{args.rows} tasks, snapshot {mb:.1f} MB, warm start {replay / warm:.0f}x faster than replay\n")
+    print_table(["step", "seconds", "MB/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
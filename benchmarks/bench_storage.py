@@ -0,0 +1,68 @@
+# benchmarks/bench_storage.py
+# يقارن محركات التخزين التي تطبّق storage.TaskStorage على العمليات نفسها:
+# SQLite في الذاكرة، SQLite على ملف (الإعداد balanced)، و MemoryStorage (قواميس Python فقط).
+#
+#   python -m benchmarks.bench_storage
+#   python -m benchmarks.bench_storage --size 100000 --ops 20000
+
+import argparse
+import os
+import random
+import tempfile
+
+from storage import MemoryStorage
+from task_service import RealDatabase, TaskService
+
+from .common import measure, populate, print_table
+
+OPERATIONS = ("insert", "find", "update_completion", "delete", "create_task", "iterate")
+
+
+def bench_engine(db, size, ops):
+    populate(db, size)
+    rng = random.Random(1)
+    names = [f"Task_{rng.randrange(size)}" for _ in range(ops)]
+    distinct = [f"Task_{i}" for i in range(min(ops, size))]
+    service = TaskService(db)
+    return {
+        "insert": measure(lambda i: db.insert({"name": f"New_{i}", "completed": False}), ops),
+        "find": measure(lambda i: db.find(names[i]), ops),
+        "update_completion": measure(lambda i: db.update_completion(names[i], True), ops),
+        "delete": measure(lambda i: db.delete(distinct[i]), len(distinct)),
+        "create_task": measure(lambda i: service.create_task(f"Created_{i}"), ops),
+        # iterate: زمن المرور على كل الصفوف مقسوماً على عددها
+        "iterate": measure(lambda i: sum(1 for _ in db.iter_tasks()), 1) / max(size, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of each storage engine")
+    parser.add_argument("--size", type=int, default=100_000, help="rows loaded before measuring")
+    parser.add_argument("--ops", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engines = {
+            "sqlite :memory:": RealDatabase(),
+            "sqlite file": RealDatabase(os.path.join(tmpdir, "bench.sqlite")),
+            "memory": MemoryStorage(),
+        }
+        results = {}
+        for label, db in engines.items():
+            results[label] = bench_engine(db, args.size, args.ops)
+            db.close()
+
+    baseline = results["sqlite :memory:"]
+    rows = []
+    for op in OPERATIONS:
+        row = [op]
+        for label in engines:
+            row.append(f"{results[label][op]:.2f}")
+        row.append(f"{baseline[op] / results['memory'][op]:.1f}x")
+        rows.append(row)
+    print(f"us/op with {args.size} rows loaded, {args.ops} operations each\n")
+    print_table(["operation", *engines, "memory vs sqlite"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_task_list.py
+# add_task على TaskList (فهرس hash) مقابل قائمة عادية (فحص تكرار خطي، أي O(n²) للإضافات الكثيرة).
+#
+#   python -m benchmarks.bench_task_list --sizes 10000 100000 1000000
+
+import argparse
+import time
+
+from task_module import TaskList, add_task
+
+from .common import print_table
+
+
+def fill(task_list, count):
+    start = time.perf_counter()
+    for i in range(count):
+        add_task(f"Task_{i}", task_list)
+    return time.perf_counter() - start
+
+
+def run(sizes, list_limit):
+    rows = []
+    for size in sizes:
+        tasks = TaskList()
+        indexed = fill(tasks, size)
+        start = time.perf_counter()
+        for i in range(0, size, 7):
+            tasks.find(f"TASK_{i}")
+            tasks.remove(f"task_{i}")
+        lookup_remove = (time.perf_counter() - start) / len(range(0, size, 7)) * 1e6
+
+        if size <= list_limit:
+            plain = f"{fill([], size):.2f}"
+        else:
+            plain = "skipped"
+        rows.append((size, f"{indexed:.2f}", f"{lookup_remove:.2f}", plain))
+    print_table(["tasks", "TaskList add s", "find+remove us", "plain list add s"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk add_task cost: TaskList vs plain list")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--list-limit", type=int, default=10_000,
+                        help="skip the quadratic plain-list run above this many tasks")
+    args = parser.parse_args()
+    run(args.sizes, args.list_limit)
+
+
+if __name__ == "__main__":
+    main()
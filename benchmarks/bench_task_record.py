@@ -0,0 +1,68 @@
+# benchmarks/bench_task_record.py
+# الذاكرة لكل صف وزمن البناء: قاموس لكل مهمة (الأسلوب القديم) مقابل Task بـ __slots__،
+# سواء عند البناء المباشر أو عبر row_factory من مؤشر SQLite.
+#
+#   python -m benchmarks.bench_task_record --rows 1000000
+
+import argparse
+import time
+import tracemalloc
+
+from task_record import Task, task_row_factory
+from task_service import RealDatabase
+
+from .common import populate, print_table
+
+
+def measure(build):
+    # التوقيت بدون tracemalloc لأنه يبطئ كل عملية حجز
+    start = time.perf_counter()
+    rows = build()
+    elapsed = time.perf_counter() - start
+    del rows
+    tracemalloc.start()
+    rows = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, size, elapsed
+
+
+def run(count):
+    db = RealDatabase()
+    populate(db, count)
+    raw = db.conn.execute("SELECT name, completed FROM tasks ORDER BY rowid").fetchall()
+
+    def dicts_from_cursor():
+        cursor = db.conn.execute("SELECT name, completed FROM tasks ORDER BY rowid")
+        return [{"name": row[0], "completed": bool(row[1])} for row in cursor.fetchall()]
+
+    def tasks_from_cursor():
+        cursor = db.conn.cursor()
+        cursor.row_factory = task_row_factory
+        return cursor.execute("SELECT name, completed FROM tasks ORDER BY rowid").fetchall()
+
+    cases = [
+        ("dict (from tuples)", lambda: [{"name": n, "completed": bool(c)} for n, c in raw]),
+        ("Task (from tuples)", lambda: [Task(n, bool(c)) for n, c in raw]),
+        ("dict (cursor)", dicts_from_cursor),
+        ("Task (row_factory)", tasks_from_cursor),
+    ]
+    results = []
+    for label, build in cases:
+        rows, size, elapsed = measure(build)
+        # الأسماء نفسها مشتركة في حالة tuples؛ في حالة المؤشر تُحسب معها
+        results.append((label, f"{size / count:.0f}", f"{elapsed / count * 1e9:.0f}"))
+        del rows
+    db.close()
+    print_table(["rows built as", "bytes/row", "ns/row"], results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and construction cost per task row")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
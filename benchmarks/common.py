@@ -0,0 +1,33 @@
+# benchmarks/common.py
+# أدوات مشتركة لسكربتات القياس. تُشغَّل من جذر المستودع، مثلاً:
+#   python -m benchmarks.bench_lookup --sizes 1000 10000
+
+import time
+
+
+def populate(db, count, prefix="Task_"):
+    """Fill db.tasks with `count` rows directly, bypassing the service layer."""
+    if not hasattr(db, "cursor"):
+        # محركات بلا SQL (storage.MemoryStorage) تُملأ عبر insert_many
+        db.insert_many({"name": f"{prefix}{i}", "completed": False} for i in range(count))
+        return
+    db.cursor.executemany(
+        "INSERT INTO tasks (name, completed) VALUES (?, 0)",
+        ((f"{prefix}{i}",) for i in range(count))
+    )
+    db.conn.commit()
+
+
+def measure(func, repeat):
+    """Run func `repeat` times and return the mean latency in microseconds."""
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,244 @@
+# benchmarks/loadgen.py
+# مولّد حمل بحلقة مفتوحة (open-loop): الطلبات تصل بمعدل ثابت أو عشوائي (Poisson) بغض النظر
+# عن سرعة النظام، والزمن يُقاس من الموعد المقرر للطلب لا من لحظة تنفيذه، فيظهر زمن الانتظار
+# في الطابور بدل أن يختفي (coordinated omission). النتائج لكل عملية: p50/p95/p99/max.
+#
+#   python -m benchmarks.loadgen --rate 2000 --duration 10
+#   python -m benchmarks.loadgen --rate 500 --mix create=70,find=20,list=10 --driver asyncio
+#   python -m benchmarks.loadgen --backend memory --json results.json
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+try:  # مستورد من الاختبارات كجزء من الحزمة: نفس نسخة الوحدات التي تختبرها
+    from ..async_service import AsyncTaskService
+    from ..connection_pool import PooledDatabase
+    from ..latency_histogram import LatencyHistogram
+    from ..task_service import RealDatabase, TaskService
+except ImportError:  # python -m benchmarks.loadgen من جذر المستودع
+    from async_service import AsyncTaskService
+    from connection_pool import PooledDatabase
+    from latency_histogram import LatencyHistogram
+    from task_service import RealDatabase, TaskService
+
+from .common import print_table
+
+DEFAULT_MIX = "create=50,find=30,mark=10,delete=5,list=5"
+OPERATIONS = ("create", "find", "mark", "delete", "list")
+
+
+def parse_mix(text):
+    """'create=50,find=30' -> {'create': 50.0, 'find': 30.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'. Choose from: {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Operation mix needs at least one positive weight.")
+    return mix
+
+
+class Workload:
+    """Picks the next operation and its task name; shared by all drivers."""
+
+    def __init__(self, mix, preload, seed=None):
+        self.ops = list(mix)
+        self.weights = [mix[op] for op in self.ops]
+        self.rng = random.Random(seed)
+        self.preload = preload
+        self._next_id = preload
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            op = self.rng.choices(self.ops, self.weights)[0]
+            if op == "create":
+                name = f"Load_{self._next_id}"
+                self._next_id += 1
+            else:
+                name = f"Load_{self.rng.randrange(max(self._next_id, 1))}"
+            return op, name
+
+
+def call_sync(service, op, name):
+    if op == "create":
+        try:
+            service.create_task(name)
+        except ValueError:
+            pass  # تكرار متوقع ضمن المزيج العشوائي
+    elif op == "find":
+        service.find_task(name)
+    elif op == "mark":
+        service.mark_task_complete(name)
+    elif op == "delete":
+        service.delete_task(name)
+    else:
+        service.list_tasks(limit=50)
+
+
+async def call_async(service, op, name):
+    if op == "create":
+        try:
+            await service.create_task(name)
+        except ValueError:
+            pass
+    elif op == "find":
+        await service.find_task(name)
+    elif op == "mark":
+        await service.mark_task_complete(name)
+    elif op == "delete":
+        await service.delete_task(name)
+    else:
+        await service.list_tasks(limit=50)
+
+
+class Recorder:
+    def __init__(self):
+        self.histograms = {op: LatencyHistogram() for op in OPERATIONS}
+        self.errors = {op: 0 for op in OPERATIONS}
+        self._lock = threading.Lock()
+
+    def record(self, op, intended, error=False):
+        # من الموعد المقرر وليس من بداية التنفيذ الفعلي
+        self.histograms[op].record(time.perf_counter() - intended)
+        if error:
+            with self._lock:
+                self.errors[op] += 1
+
+
+def arrivals(rate, duration, poisson, seed=None):
+    """Yield intended start offsets (seconds from t0) for an open-loop schedule."""
+    rng = random.Random(seed)
+    offset = 0.0
+    while offset < duration:
+        yield offset
+        offset += rng.expovariate(rate) if poisson else 1.0 / rate
+
+
+def run_threads(service, workload, recorder, rate, duration, workers, poisson):
+    def job(op, name, intended):
+        try:
+            call_sync(service, op, name)
+            recorder.record(op, intended)
+        except Exception:
+            recorder.record(op, intended, error=True)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        t0 = time.perf_counter()
+        for offset in arrivals(rate, duration, poisson):
+            intended = t0 + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            op, name = workload.next()
+            executor.submit(job, op, name, intended)
+    return time.perf_counter() - t0
+
+
+async def run_asyncio(service, workload, recorder, rate, duration, poisson):
+    async def job(op, name, intended):
+        try:
+            await call_async(service, op, name)
+            recorder.record(op, intended)
+        except Exception:
+            recorder.record(op, intended, error=True)
+
+    pending = set()
+    t0 = time.perf_counter()
+    for offset in arrivals(rate, duration, poisson):
+        intended = t0 + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        op, name = workload.next()
+        task = asyncio.ensure_future(job(op, name, intended))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+    return time.perf_counter() - t0
+
+
+def run(rate, duration, mix, driver="thread", workers=8, backend="pooled", path=None,
+        preload=10_000, poisson=True, seed=None):
+    """Run one load test and return a JSON-ready report."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if backend == "memory":
+            # اتصال واحد لا يُشارك بين خيوط متعددة، لذلك عامل واحد فقط
+            db = RealDatabase(check_same_thread=False)
+            workers = 1
+        else:
+            db = PooledDatabase(path or os.path.join(tmpdir, "load.sqlite"), pool_size=workers)
+        service = TaskService(db)
+        service.create_tasks(f"Load_{i}" for i in range(preload))
+
+        workload = Workload(mix, preload, seed)
+        recorder = Recorder()
+        if driver == "asyncio":
+            async_service = AsyncTaskService(service, max_workers=workers)
+            elapsed = asyncio.run(run_asyncio(async_service, workload, recorder, rate, duration, poisson))
+            async_service.close()
+        else:
+            elapsed = run_threads(service, workload, recorder, rate, duration, workers, poisson)
+        db.close()
+
+    operations = {}
+    for op, histogram in recorder.histograms.items():
+        if histogram.count:
+            operations[op] = dict(histogram.summary(), errors=recorder.errors[op])
+    completed = sum(h.count for h in recorder.histograms.values())
+    return {
+        "config": {"rate": rate, "duration": duration, "mix": mix, "driver": driver,
+                   "workers": workers, "backend": backend, "preload": preload, "poisson": poisson},
+        "elapsed_s": round(elapsed, 3),
+        "throughput_ops": round(completed / elapsed, 1) if elapsed else 0.0,
+        "operations": operations,
+    }
+
+
+def print_report(report):
+    rows = []
+    for op, s in report["operations"].items():
+        rows.append((op, s["count"], s["errors"], *(f"{s[k] / 1000:.2f}" for k in
+                                                     ("p50_us", "p95_us", "p99_us", "max_us"))))
+    print_table(["op", "count", "errors", "p50 ms", "p95 ms", "p99 ms", "max ms"], rows)
+    print(f"\nTarget {report['config']['rate']:.0f} ops/s, achieved {report['throughput_ops']:.0f} ops/s "
+          f"over {report['elapsed_s']}s ({report['config']['driver']} driver)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for TaskService")
+    parser.add_argument("--rate", type=float, default=1_000, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of arrivals")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--driver", choices=("thread", "asyncio"), default="thread")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--backend", choices=("pooled", "memory"), default="pooled")
+    parser.add_argument("--path", help="SQLite file for the pooled backend (default: temp file)")
+    parser.add_argument("--preload", type=int, default=10_000, help="tasks created before the run")
+    parser.add_argument("--uniform", action="store_true", help="fixed inter-arrival gap instead of Poisson")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = run(args.rate, args.duration, parse_mix(args.mix), driver=args.driver, workers=args.workers,
+                 backend=args.backend, path=args.path, preload=args.preload,
+                 poisson=not args.uniform, seed=args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
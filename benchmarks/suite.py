@@ -0,0 +1,279 @@
+# benchmarks/suite.py
+# مجموعة قياس قابلة للتكرار لطبقتي التخزين والخدمة. تكتب النتائج بصيغة JSON وتقارنها
+# بخط أساس محفوظ، وتنتهي برمز خروج 1 إذا تجاوز أي تراجع الحد المسموح.
+# لا تحتاج أي مكتبة خارجية ولا اتصالاً بالشبكة.
+#
+#   python -m benchmarks.suite                               # 1e3 .. 1e6، مقارنة مع baseline.json
+#   python -m benchmarks.suite --sizes 1000 10000 --output results.json
+#   python -m benchmarks.suite --update-baseline             # بعد تغيير مقصود في الأداء
+#
+# خط الأساس خاص بالجهاز الذي وُلّد عليه؛ أعد توليده على جهاز CI قبل الاعتماد على المقارنة.
+# أي تغيير يبطئ أو يسرّع مساراً مقاساً عن قصد، أو يضيف حالة جديدة، يعيد تسجيل baseline.json
+# في نفس الـcommit؛ وإلا تفشل المقارنة على الفرع الرئيسي ولا تعني شيئاً.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+try:  # مستورد من الاختبارات كجزء من الحزمة: نفس نسخة الوحدات التي تختبرها
+    from ..storage import MemoryStorage
+    from ..task_module import TaskList, add_task
+    from ..task_service import RealDatabase, TaskService
+    from ..task_EtoE import RealDatabase as EtoEDatabase, TaskService as EtoETaskService
+except ImportError:  # python -m benchmarks.suite من جذر المستودع
+    from storage import MemoryStorage
+    from task_module import TaskList, add_task
+    from task_service import RealDatabase, TaskService
+    from task_EtoE import RealDatabase as EtoEDatabase, TaskService as EtoETaskService
+
+from .common import populate, print_table
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+class Case:
+    """One benchmark: setup(size) builds state, run(state, size, repeat, ops) is timed."""
+
+    def __init__(self, name, setup, run, ops=5_000, destructive=False):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.ops = ops
+        # الحالات الهدّامة (حذف/تعليم) تستهلك صفوفاً مختلفة في كل تكرار، فتُحدّ بحجم الجدول
+        self.destructive = destructive
+
+
+def _filled(database_class, size):
+    db = database_class()
+    populate(db, size)
+    return db
+
+
+def _random_names(size, ops, seed):
+    rng = random.Random(seed)
+    return [f"Task_{rng.randrange(size)}" for _ in range(ops)]
+
+
+def _disjoint_names(size, ops, repeat):
+    # الحذف والتعليم يحتاجان أسماء مختلفة في كل تكرار حتى لا تصبح العمليات بلا أثر
+    start = (repeat * ops) % max(size - ops + 1, 1)
+    return [f"Task_{i}" for i in range(start, start + ops)]
+
+
+def _insert(db, size, repeat, ops):
+    for i in range(ops):
+        db.insert({"name": f"New_{repeat}_{i}", "completed": False})
+
+
+def _find(db, size, repeat, ops):
+    for name in _random_names(size, ops, repeat):
+        db.find(name)
+
+
+def _delete(db, size, repeat, ops):
+    for name in _disjoint_names(size, ops, repeat):
+        db.delete(name)
+
+
+def _get_all(db, size, repeat, ops):
+    for _ in range(ops):
+        db.get_all()
+
+
+def _update_completion(db, size, repeat, ops):
+    for name in _disjoint_names(size, ops, repeat):
+        db.update_completion(name, True)
+
+
+def _create_task(service, size, repeat, ops):
+    for i in range(ops):
+        service.create_task(f"New_{repeat}_{i}")
+
+
+def _mark_task_complete(service, size, repeat, ops):
+    for name in _disjoint_names(size, ops, repeat):
+        service.mark_task_complete(name)
+
+
+def _task_list(size):
+    tasks = TaskList()
+    for i in range(size):
+        tasks.add(f"Task_{i}")
+    return tasks
+
+
+def _add_task(tasks, size, repeat, ops):
+    for i in range(ops):
+        add_task(f"New_{repeat}_{i}", tasks)
+
+
+CASES = [
+    Case("RealDatabase.insert", lambda n: _filled(RealDatabase, n), _insert),
+    Case("RealDatabase.find", lambda n: _filled(RealDatabase, n), _find),
+    Case("RealDatabase.delete", lambda n: _filled(RealDatabase, n), _delete, destructive=True),
+    Case("RealDatabase.get_all", lambda n: _filled(RealDatabase, n), _get_all, ops=1),
+    Case("RealDatabase.update_completion", lambda n: _filled(EtoEDatabase, n), _update_completion,
+         destructive=True),
+    Case("TaskService.create_task", lambda n: TaskService(_filled(RealDatabase, n)), _create_task),
+    Case("TaskService.mark_task_complete", lambda n: EtoETaskService(_filled(EtoEDatabase, n)),
+         _mark_task_complete, destructive=True),
+    Case("MemoryStorage.insert", lambda n: _filled(MemoryStorage, n), _insert),
+    Case("MemoryStorage.find", lambda n: _filled(MemoryStorage, n), _find),
+    Case("TaskService.create_task[memory]", lambda n: TaskService(_filled(MemoryStorage, n)), _create_task),
+    Case("add_task", _task_list, _add_task),
+]
+
+
+def run_case(case, size, repeats):
+    state = case.setup(size)
+    ops = max(1, min(case.ops, size // repeats)) if case.destructive else case.ops
+    samples = []
+    # مثل timeit: نوقف جامع القمامة أثناء التوقيت حتى لا تظهر كلفته عشوائياً في عينة دون أخرى
+    gc.collect()
+    gc.disable()
+    try:
+        for repeat in range(repeats):
+            start = time.perf_counter()
+            case.run(state, size, repeat, ops)
+            samples.append((time.perf_counter() - start) / ops * 1e6)
+    finally:
+        gc.enable()
+    # المقارنة تعتمد أقل عينة لأنها الأقل تأثراً بالضجيج من العمليات الأخرى على الجهاز
+    return {"us_per_op": min(samples), "median_us": statistics.median(samples), "ops": ops, "repeats": repeats}
+
+
+def calibrate(repeats=5):
+    """Time a fixed SQLite + Python workload; used to scale results between runs."""
+    conn = sqlite3.connect(":memory:")
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(20_000):
+            row = conn.execute("SELECT ?, ?", (i, "x")).fetchone()
+            {"name": row[1], "completed": bool(row[0])}
+        samples.append((time.perf_counter() - start) / 20_000 * 1e6)
+    conn.close()
+    return min(samples)
+
+
+def run_suite(sizes, repeats, selected=None):
+    calibration = calibrate()
+    results = {}
+    for case in CASES:
+        if selected and case.name not in selected:
+            continue
+        for size in sizes:
+            results[f"{case.name}@{size}"] = run_case(case, size, repeats)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "calibration_us": calibration,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, normalize=True):
+    """Return rows for a report and the list of keys that regressed past threshold.
+
+    With normalize=True each side is divided by its own calibration time, so
+    a machine that is uniformly slower today does not count as a regression.
+    """
+    scale = 1.0
+    base_cal = baseline.get("meta", {}).get("calibration_us")
+    if normalize and base_cal:
+        scale = base_cal / current["meta"]["calibration_us"]
+    rows = []
+    regressions = []
+    for key, result in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            rows.append((key, f"{result['us_per_op']:.2f}", "-", "new"))
+            continue
+        change = result["us_per_op"] * scale / base["us_per_op"] - 1
+        status = "ok"
+        if change > threshold:
+            status = "REGRESSION"
+            regressions.append(key)
+        rows.append((key, f"{result['us_per_op']:.2f}", f"{base['us_per_op']:.2f}", f"{change:+.1%} {status}"))
+    return rows, regressions
+
+
+def merge_baseline(baseline, current):
+    """Return `baseline` with `current`'s results recorded into it.
+
+    A run that covers every recorded key replaces the baseline outright.
+    A partial run (--cases/--sizes) is rescaled to the baseline's own
+    calibration, so old and new entries stay comparable under one meta.
+    """
+    old = baseline.get("results", {})
+    base_cal = baseline.get("meta", {}).get("calibration_us")
+    if not base_cal or set(old) <= set(current["results"]):
+        return {"meta": dict(current["meta"]), "results": dict(current["results"])}
+    scale = base_cal / current["meta"]["calibration_us"]
+    results = dict(old)
+    for key, result in current["results"].items():
+        results[key] = dict(result, us_per_op=result["us_per_op"] * scale,
+                            median_us=result["median_us"] * scale)
+    meta = dict(current["meta"], calibration_us=base_cal)
+    return {"meta": meta, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Storage/service benchmark suite with baseline comparison")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", help="only run these case names")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs. baseline before failing (0.25 = 25%%)")
+    parser.add_argument("--no-normalize", action="store_true",
+                        help="compare raw timings without the calibration scaling")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="merge these results into the baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.sizes, args.repeats, args.cases)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        baseline = {"results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline = merge_baseline(baseline, current)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    rows, regressions = compare(current, baseline, args.threshold, normalize=not args.no_normalize)
+    print_table(["case@rows", "us/op", "baseline us/op", "change"], rows)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
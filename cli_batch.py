@@ -0,0 +1,118 @@
+# cli_batch.py
+# وضع الدفعات غير التفاعلي لواجهتي الأوامر: يقرأ الأوامر من ملف أو stdin، ويجمع الأوامر المتتالية
+# من النوع نفسه (add / mark / del) في استدعاء جماعي واحد (معاملة واحدة)، ويطبع ملخصاً مختصراً
+# في النهاية بدل رسالة لكل أمر.
+#
+#   python task_service.py --batch commands.txt
+#   generate_commands | python task_EtoE.py --batch -
+
+import sqlite3
+import sys
+import time
+
+DEFAULT_RUN_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+
+class BatchResult:
+    def __init__(self):
+        self.ok = {}
+        self.failed = {}
+        self.errors = []  # (line number, message)
+        self.lines = 0
+        self.elapsed = 0.0
+
+    def record(self, command, line_no, ok, detail=None):
+        bucket = self.ok if ok else self.failed
+        bucket[command] = bucket.get(command, 0) + 1
+        if not ok:
+            self.errors.append((line_no, detail))
+
+    def summary(self):
+        out = []
+        for command in sorted(set(self.ok) | set(self.failed)):
+            out.append(f"{command}: {self.ok.get(command, 0)} ok, {self.failed.get(command, 0)} failed")
+        for line_no, message in self.errors[:MAX_REPORTED_ERRORS]:
+            out.append(f"  line {line_no}: {message}")
+        if len(self.errors) > MAX_REPORTED_ERRORS:
+            out.append(f"  ... and {len(self.errors) - MAX_REPORTED_ERRORS} more errors")
+        rate = self.lines / self.elapsed if self.elapsed else 0.0
+        out.append(f"{self.lines} commands in {self.elapsed:.3f}s ({rate:.0f} commands/s)")
+        return "\n".join(out)
+
+
+def read_commands(source):
+    """Yield command lines from a file path, or from stdin when source is '-'."""
+    if source == "-":
+        yield from sys.stdin
+        return
+    with open(source, encoding="utf-8") as f:
+        yield from f
+
+
+def run_batch(lines, handlers, show, out=None, run_size=DEFAULT_RUN_SIZE, commands=None):
+    """Execute CLI commands from ``lines`` without prompts.
+
+    ``handlers`` maps a write command to a bulk function that takes a list of
+    names and returns one (ok, detail) per name. ``show`` returns (or yields)
+    the task listing lines; ``commands`` maps any other command to a function
+    taking its argument and returning output lines. Lines are written to
+    ``out`` as they are produced, followed by the summary.
+    """
+    commands = commands or {}
+    out = sys.stdout if out is None else out
+    result = BatchResult()
+    run_command, run = None, []  # الأوامر المتتالية من النوع نفسه: [(line number, name)]
+
+    def flush():
+        nonlocal run_command, run
+        if run:
+            try:
+                outcomes = handlers[run_command]([name for _, name in run])
+            except Exception as e:
+                outcomes = [(False, f"Unexpected Error: {e}")] * len(run)
+            for (line_no, name), (ok, detail) in zip(run, outcomes):
+                result.record(run_command, line_no, ok, f"{run_command} '{name}': {detail}")
+        run_command, run = None, []
+
+    start = time.perf_counter()
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        result.lines += 1
+        parts = line.split(maxsplit=1)
+        command = parts[0].lower()
+        if command in handlers:
+            if len(parts) < 2:
+                flush()
+                result.record(command, line_no, False, f"'{command}' requires a task name")
+                continue
+            if command != run_command or len(run) >= run_size:
+                flush()
+                run_command = command
+            run.append((line_no, parts[1].strip()))
+            continue
+        flush()
+        if command == "exit":
+            break
+        if command == "show":
+            # القائمة قد تكون ملايين الأسطر: تُكتب سطراً سطراً ولا تُجمع في الذاكرة
+            try:
+                out.writelines(f"{text}\n" for text in show())
+            except sqlite3.Error as e:
+                result.record(command, line_no, False, f"{command}: {e}")
+        elif command in commands:
+            try:
+                argument = parts[1].strip() if len(parts) > 1 else None
+                out.writelines(f"{text}\n" for text in commands[command](argument))
+                result.record(command, line_no, True)
+            except (OSError, ValueError, sqlite3.Error) as e:
+                result.record(command, line_no, False, f"{command}: {e}")
+        else:
+            result.record(command, line_no, False, f"Unknown command: '{command}'")
+    flush()
+    result.elapsed = time.perf_counter() - start
+
+    out.write(result.summary() + "\n")
+    return result
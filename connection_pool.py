@@ -0,0 +1,199 @@
+# connection_pool.py
+# خلفية تخزين آمنة للخيوط: مجموعة محدودة من اتصالات SQLite على ملف واحد يُعاد استخدامها
+# بدل فتح اتصال جديد مع كل إدخال (كما كانت تفعل SafeRealDatabase في tests/test_stress.py).
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from .sqlite_profiles import MEMORY
+    from .task_service import RealDatabase
+except ImportError:  # تشغيل مباشر كسكربت
+    from sqlite_profiles import MEMORY
+    from task_service import RealDatabase
+
+
+class ConnectionPool:
+    """Bounded pool of database objects, each owning one SQLite connection.
+
+    Connections are opened lazily, reused most-recently-used first, and a
+    connection idle for longer than `health_check_interval` seconds is
+    probed with `SELECT 1` before being handed out again.
+    """
+
+    def __init__(self, factory, size=8, health_check_interval=30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self._factory = factory
+        self.size = size
+        self.health_check_interval = health_check_interval
+        # كل خانة إما (db, آخر استخدام) أو (None, 0) لاتصال لم يُفتح بعد
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put((None, 0.0))
+        self._lock = threading.Lock()
+        self._in_use = set()
+        self._closed = False
+        self.opened = 0
+        self.discarded = 0
+
+    def acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+        try:
+            db, last_used = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available within {timeout} seconds.") from None
+        try:
+            if db is not None and time.monotonic() - last_used > self.health_check_interval:
+                if not self._is_healthy(db):
+                    self._close_quietly(db)
+                    db = None
+            if db is None:
+                db = self._factory()
+                with self._lock:
+                    self.opened += 1
+        except BaseException:
+            # نعيد الخانة حتى لا يصغر حجم المجموعة بسبب فشل الفتح
+            self._idle.put((None, 0.0))
+            raise
+        with self._lock:
+            self._in_use.add(db)
+        return db
+
+    def release(self, db, broken=False):
+        with self._lock:
+            self._in_use.discard(db)
+            if broken:
+                self.discarded += 1
+        if broken or self._closed:
+            self._close_quietly(db)
+            self._idle.put((None, 0.0))
+        else:
+            self._idle.put((db, time.monotonic()))
+
+    @contextmanager
+    def connection(self, timeout=None):
+        db = self.acquire(timeout)
+        broken = False
+        try:
+            yield db
+        except sqlite3.DatabaseError as e:
+            # أخطاء القيود والقفل لا تعني أن الاتصال تالف
+            broken = not isinstance(e, (sqlite3.IntegrityError, sqlite3.OperationalError))
+            raise
+        finally:
+            self.release(db, broken)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                db, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if db is not None:
+                self._close_quietly(db)
+
+    @staticmethod
+    def _is_healthy(db):
+        try:
+            db.conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(db):
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+
+
+class PooledDatabase:
+    """Thread-safe drop-in for RealDatabase backed by a ConnectionPool.
+
+    Works with TaskService unchanged; every call borrows one pooled
+    connection for its duration.
+    """
+
+    def __init__(self, path, pool_size=8, profile=None, pragmas=None, timeout=10.0,
+                 health_check_interval=30.0, database_class=RealDatabase, tracer=None, search_index=False):
+        if path == MEMORY:
+            # كل اتصال بـ ':memory:' قاعدة بيانات مستقلة، فلا معنى لمشاركتها
+            raise ValueError("PooledDatabase needs a file path, not ':memory:'.")
+        self.path = path
+
+        def factory():
+            # timeout هو مهلة انتظار قفل الكتابة داخل SQLite نفسها (busy timeout)
+            return database_class(path, profile=profile, pragmas=pragmas, tracer=tracer,
+                                  search_index=search_index, timeout=timeout, check_same_thread=False)
+
+        self.pool = ConnectionPool(factory, size=pool_size, health_check_interval=health_check_interval)
+        # نفتح اتصالاً واحداً مبكراً حتى يُنشأ الجدول وتظهر أخطاء المسار فوراً
+        with self.pool.connection():
+            pass
+
+    def _call(self, method, *args, **kwargs):
+        with self.pool.connection() as db:
+            return getattr(db, method)(*args, **kwargs)
+
+    def insert(self, task):
+        return self._call("insert", task)
+
+    def insert_many(self, tasks, **kwargs):
+        return self._call("insert_many", tasks, **kwargs)
+
+    def find(self, name):
+        return self._call("find", name)
+
+    def delete(self, name):
+        return self._call("delete", name)
+
+    def update_completion(self, name, completed):
+        return self._call("update_completion", name, completed)
+
+    def update_completion_many(self, names, completed, **kwargs):
+        return self._call("update_completion_many", names, completed, **kwargs)
+
+    def delete_many(self, names, **kwargs):
+        return self._call("delete_many", names, **kwargs)
+
+    def delete_where(self, completed, vacuum=False):
+        return self._call("delete_where", completed, vacuum=vacuum)
+
+    def incremental_vacuum(self, max_pages=None):
+        return self._call("incremental_vacuum", max_pages)
+
+    def get_all(self):
+        return self._call("get_all")
+
+    def search(self, query, limit=20, after=None):
+        return self._call("search", query, limit, after)
+
+    def search_scored(self, query, limit, after=None):
+        return self._call("search_scored", query, limit, after)
+
+    def search_prefix(self, prefix, limit=20, after=""):
+        return self._call("search_prefix", prefix, limit, after)
+
+    def task_stats(self):
+        return self._call("task_stats")
+
+    def count(self):
+        return self._call("count")
+
+    def iter_tasks(self, *args, **kwargs):
+        # الاتصال يبقى محجوزاً طوال التكرار، ويعود للمجموعة عند انتهائه أو إغلاق المولّد
+        with self.pool.connection() as db:
+            yield from db.iter_tasks(*args, **kwargs)
+
+    def list_tasks(self, after_rowid=0, limit=100):
+        return self._call("list_tasks", after_rowid, limit)
+
+    def close(self):
+        self.pool.close()
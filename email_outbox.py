@@ -0,0 +1,299 @@
+# email_outbox.py
+# صندوق صادر للبريد: send_email يضع الرسالة في الطابور ويعود فوراً، ومجموعة عمّال محدودة تفرّغه
+# على دفعات، مع إعادة المحاولة بتأخير أُسّي وحالة تسليم لكل رسالة. يعمل كبديل مباشر لـ EmailService:
+#
+#   outbox = EmailOutbox(EmailService(), workers=4)
+#   UserService(outbox).register_user("Alice", "alice@example.com")   # لا ينتظر الإرسال
+#   ...
+#   outbox.close()   # يسلّم ما تبقى ثم يوقف العمّال
+#
+# للاختبارات: EmailOutbox(FileSink("mail.jsonl")) يكتب الرسائل في ملف بدل إرسالها.
+
+import collections
+import heapq
+import itertools
+import json
+import random
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+PENDING = "pending"
+SENDING = "sending"
+RETRYING = "retrying"
+SENT = "sent"
+FAILED = "failed"
+
+
+class Message:
+    __slots__ = ("id", "to", "subject", "body", "status", "attempts", "last_error")
+
+    def __init__(self, message_id, to, subject, body):
+        self.id = message_id
+        self.to = to
+        self.subject = subject
+        self.body = body
+        self.status = PENDING
+        self.attempts = 0
+        self.last_error = None
+
+    def __repr__(self):
+        return f"Message({self.id}, {self.to!r}, {self.status})"
+
+
+class FileSink:
+    """Sender that appends messages to a JSON-lines file instead of mailing them."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send_email(self, to, subject, body):
+        return self.send_many([Message(None, to, subject, body)])[0]
+
+    def send_bulk(self, messages):
+        return self.send_many([Message(None, to, subject, body) for to, subject, body in messages])
+
+    def send_many(self, messages):
+        lines = [json.dumps({"to": m.to, "subject": m.subject, "body": m.body}, ensure_ascii=False)
+                 for m in messages]
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return [True] * len(messages)
+
+
+class SmtpSender:
+    """Sends each batch over a single SMTP connection."""
+
+    def __init__(self, host="localhost", port=25, sender="noreply@localhost", timeout=10.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+
+    def _build(self, to, subject, body):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+
+    def send_email(self, to, subject, body):
+        return self.send_many([Message(None, to, subject, body)])[0]
+
+    def send_bulk(self, messages):
+        return self.send_many([Message(None, to, subject, body) for to, subject, body in messages])
+
+    def send_many(self, messages):
+        """Return one result per message: True, or the exception for that message.
+
+        A message the server rejects fails alone. If the connection is lost,
+        the message in progress and all later ones get the connection error,
+        so a retry never resends what the server already accepted.
+        """
+        try:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except OSError as exc:
+            return [exc] * len(messages)
+        results = []
+        try:
+            for m in messages:
+                try:
+                    smtp.send_message(self._build(m.to, m.subject, m.body))
+                except smtplib.SMTPException as exc:
+                    if _connection_lost(exc):
+                        results += [exc] * (len(messages) - len(results))
+                        break
+                    results.append(exc)
+                except OSError as exc:  # انقطاع المقبس أو انتهاء المهلة
+                    results += [exc] * (len(messages) - len(results))
+                    break
+                else:
+                    results.append(True)
+        finally:
+            try:
+                smtp.quit()
+            except OSError:  # SMTPException يرث OSError؛ الاتصال مغلق أصلاً
+                smtp.close()
+        return results
+
+
+def _connection_lost(exc):
+    # 421 = الخادم يغلق الاتصال؛ الرسائل التالية لن تُرسل عليه
+    return isinstance(exc, smtplib.SMTPServerDisconnected) or getattr(exc, "smtp_code", None) == 421
+
+
+class EmailOutbox:
+    """Queue-backed EmailService replacement with a bounded worker pool.
+
+    Failed sends are retried up to ``max_attempts`` times, waiting
+    ``backoff * 2**(attempt - 1)`` seconds (capped at ``max_backoff``, with
+    jitter) between attempts. ``status(message_id)`` reports delivery state.
+    """
+
+    def __init__(self, sender, workers=4, batch_size=50, max_attempts=5, backoff=0.5,
+                 max_backoff=30.0, max_pending=10_000, keep_finished=10_000):
+        if workers < 1:
+            raise ValueError("Outbox needs at least one worker.")
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_pending = max_pending
+        self._ids = itertools.count(1)
+        self._ready = collections.deque()
+        self._delayed = []  # heap of (due, id, message)
+        self._in_flight = 0
+        self._messages = {}
+        # الرسائل المنتهية تُحفظ لمعرفة حالتها، مع حد أعلى حتى لا تنمو الذاكرة بلا نهاية
+        self._finished = collections.OrderedDict()
+        self._keep_finished = keep_finished
+        self._cond = threading.Condition()
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    # --- واجهة EmailService ---
+    def send_email(self, to, subject, body):
+        """Queue a message and return True without waiting for delivery."""
+        self.enqueue(to, subject, body)
+        return True
+
+    def send_bulk(self, messages):
+        """Queue (to, subject, body) tuples; returns True for each once queued."""
+        return [self.send_email(to, subject, body) for to, subject, body in messages]
+
+    def enqueue(self, to, subject, body, timeout=None):
+        """Queue a message and return its id; raises TimeoutError if the outbox stays full."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Email outbox is closed.")
+            while len(self._messages) >= self.max_pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Email outbox is full.")
+                self._cond.wait(remaining)
+            message = Message(next(self._ids), to, subject, body)
+            self._messages[message.id] = message
+            self._ready.append(message)
+            self._cond.notify_all()
+        return message.id
+
+    def status(self, message_id):
+        message = self.message(message_id)
+        return None if message is None else message.status
+
+    def message(self, message_id):
+        with self._cond:
+            return self._messages.get(message_id) or self._finished.get(message_id)
+
+    @property
+    def pending(self):
+        with self._cond:
+            return len(self._messages)
+
+    # --- العمّال ---
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    self._ready.append(heapq.heappop(self._delayed)[2])
+                if self._ready:
+                    batch = [self._ready.popleft() for _ in range(min(self.batch_size, len(self._ready)))]
+                    for message in batch:
+                        message.status = SENDING
+                        message.attempts += 1
+                    self._in_flight += len(batch)
+                    return batch
+                if self._closed and not self._delayed and not self._in_flight:
+                    return None
+                self._cond.wait(self._delayed[0][0] - now if self._delayed else None)
+
+    def _deliver(self, batch):
+        # نبحث في الصنف لا في الكائن، حتى لا يُعامل Mock() وكأنه يدعم send_many
+        if getattr(type(self.sender), "send_many", None) is not None:
+            try:
+                results = list(self.sender.send_many(batch))
+            except Exception as exc:
+                return [exc] * len(batch)
+            if len(results) != len(batch):
+                return [RuntimeError(f"Sender returned {len(results)} results for {len(batch)} messages.")] * len(batch)
+            return results
+        results = []
+        for message in batch:
+            try:
+                results.append(self.sender.send_email(message.to, message.subject, message.body))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def _work(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            results = self._deliver(batch)
+            with self._cond:
+                self.batches += 1
+                for message, result in zip(batch, results):
+                    # EmailService.send_email يعيد True؛ الاستثناء أو القيمة الكاذبة فشل
+                    if result and not isinstance(result, Exception):
+                        message.status = SENT
+                        self.sent += 1
+                        self._finish(message)
+                        continue
+                    message.last_error = result if isinstance(result, Exception) else "rejected by sender"
+                    if message.attempts >= self.max_attempts:
+                        message.status = FAILED
+                        self.failed += 1
+                        self._finish(message)
+                        continue
+                    message.status = RETRYING
+                    self.retries += 1
+                    delay = min(self.backoff * 2 ** (message.attempts - 1), self.max_backoff)
+                    # تذبذب عشوائي حتى لا تعود كل الرسائل الفاشلة في اللحظة نفسها
+                    due = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                    heapq.heappush(self._delayed, (due, message.id, message))
+                self._in_flight -= len(batch)
+                self._cond.notify_all()
+
+    def _finish(self, message):
+        del self._messages[message.id]
+        self._finished[message.id] = message
+        if len(self._finished) > self._keep_finished:
+            self._finished.popitem(last=False)
+
+    def flush(self, timeout=None):
+        """Wait until every queued message is sent or has failed; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._messages:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """Stop accepting messages, deliver what is queued and stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
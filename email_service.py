@@ -2,4 +2,8 @@ class EmailService:
     def send_email(self, recipient, subject, body):
         # In real life, this would send an actual email
         print(f"Sending email to {recipient}: {subject}")
-        return True
\ No newline at end of file
+        return True
+
+    def send_bulk(self, messages):
+        """Send (recipient, subject, body) tuples; returns one success flag per message."""
+        return [self.send_email(recipient, subject, body) for recipient, subject, body in messages]
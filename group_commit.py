@@ -0,0 +1,217 @@
+# group_commit.py
+# مسار كتابة بـ"الالتزام الجماعي": المستدعون يضعون طلبات الإدخال في طابور، وخيط كاتب
+# وحيد يفرغه ويُدخل كل مجموعة في معاملة واحدة. لا يوجد تنافس على قفل الكتابة في SQLite،
+# وعدد عمليات commit (أي fsync) يقل مع ازدياد الحمل بدل أن ينهار الأداء.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    from .connection_pool import PooledDatabase
+    from .task_service import CREATED, RealDatabase
+except ImportError:  # تشغيل مباشر كسكربت
+    from connection_pool import PooledDatabase
+    from task_service import CREATED, RealDatabase
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer thread that commits queued inserts in groups.
+
+    A group closes when it holds `max_batch` requests or `max_wait` seconds
+    have passed since its first request. The default `max_wait=0` commits
+    whatever is already queued, so a lone caller never waits for company
+    while requests pile up naturally during each commit under load.
+    Each caller gets a Future that
+    resolves to the insert_many status (CREATED, DUPLICATE_IN_BATCH,
+    DUPLICATE_IN_DB or INVALID).
+    """
+
+    def __init__(self, database_factory, max_batch=256, max_wait=0.0):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1.")
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._factory = database_factory
+        self._queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self.groups_committed = 0
+        self.requests_committed = 0
+        self._ready = threading.Event()
+        self._startup_error = None
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    def submit(self, task):
+        future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("Group commit writer is closed.")
+            if not self._thread.is_alive():
+                raise RuntimeError("Group commit writer is not running.")
+            self._queue.put((task, future))
+        return future
+
+    def close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        # الاتصال يُفتح داخل خيط الكاتب نفسه، فلا حاجة لـ check_same_thread=False
+        try:
+            db = self._factory()
+        except Exception as e:
+            self._startup_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                group = [item]
+                deadline = time.monotonic() + self.max_wait
+                while len(group) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    group.append(item)
+                try:
+                    self._commit(db, group)
+                except BaseException:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(RuntimeError("Group commit writer stopped."))
+                    raise
+        finally:
+            db.close()
+            self._fail_pending()
+
+    def _fail_pending(self):
+        # إذا توقف الخيط (إغلاق أو خطأ غير متوقع) لا يبقى مستدعٍ ينتظر نتيجة لن تأتي
+        with self._close_lock:
+            self._closed = True
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("Group commit writer stopped."))
+
+    def _commit(self, db, group):
+        # نتجاهل الطلبات التي ألغاها أصحابها قبل التنفيذ
+        group = [(task, future) for task, future in group if future.set_running_or_notify_cancel()]
+        if not group:
+            return
+        try:
+            results = db.insert_many([task for task, _ in group], chunk_size=len(group))
+        except Exception:
+            # insert_many تراجع عن المجموعة كلها؛ نعيدها طلباً طلباً حتى يفشل الطلب المعيب وحده
+            for task, future in group:
+                try:
+                    status = db.insert_many([task])[0][1]
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    self.requests_committed += 1
+                    future.set_result(status)
+            return
+        self.groups_committed += 1
+        self.requests_committed += len(group)
+        for (_, future), (_, status) in zip(group, results):
+            future.set_result(status)
+
+
+class GroupCommitDatabase:
+    """RealDatabase drop-in whose inserts go through a GroupCommitWriter.
+
+    Reads and the remaining writes use a PooledDatabase on the same file,
+    so TaskService works unchanged.
+    """
+
+    def __init__(self, path, max_batch=256, max_wait=0.0, pool_size=8, profile=None,
+                 pragmas=None, timeout=10.0, tracer=None, search_index=False):
+        self.readers = PooledDatabase(path, pool_size=pool_size, profile=profile, pragmas=pragmas,
+                                      timeout=timeout, tracer=tracer, search_index=search_index)
+        self.writer = GroupCommitWriter(
+            lambda: RealDatabase(path, profile=profile, pragmas=pragmas, timeout=timeout, tracer=tracer),
+            max_batch=max_batch, max_wait=max_wait,
+        )
+
+    def submit(self, task):
+        return self.writer.submit(task)
+
+    def insert(self, task):
+        # نفس عقد TaskStorage.insert: False للاسم الفارغ أو المكرر بدل استثناء
+        return self.writer.submit(task).result() == CREATED
+
+    def insert_many(self, tasks, **kwargs):
+        return self.readers.insert_many(tasks, **kwargs)
+
+    def find(self, name):
+        return self.readers.find(name)
+
+    def delete(self, name):
+        return self.readers.delete(name)
+
+    def update_completion(self, name, completed):
+        return self.readers.update_completion(name, completed)
+
+    def update_completion_many(self, names, completed, **kwargs):
+        return self.readers.update_completion_many(names, completed, **kwargs)
+
+    def delete_many(self, names, **kwargs):
+        return self.readers.delete_many(names, **kwargs)
+
+    def delete_where(self, completed, vacuum=False):
+        return self.readers.delete_where(completed, vacuum=vacuum)
+
+    def incremental_vacuum(self, max_pages=None):
+        return self.readers.incremental_vacuum(max_pages)
+
+    def get_all(self):
+        return self.readers.get_all()
+
+    def search(self, query, limit=20, after=None):
+        return self.readers.search(query, limit, after)
+
+    def search_scored(self, query, limit, after=None):
+        return self.readers.search_scored(query, limit, after)
+
+    def search_prefix(self, prefix, limit=20, after=""):
+        return self.readers.search_prefix(prefix, limit, after)
+
+    def task_stats(self):
+        return self.readers.task_stats()
+
+    def count(self):
+        return self.readers.count()
+
+    def iter_tasks(self, *args, **kwargs):
+        return self.readers.iter_tasks(*args, **kwargs)
+
+    def list_tasks(self, after_rowid=0, limit=100):
+        return self.readers.list_tasks(after_rowid, limit)
+
+    def close(self):
+        self.writer.close()
+        self.readers.close()
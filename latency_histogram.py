@@ -0,0 +1,91 @@
+# latency_histogram.py
+# مدرّج تكراري للزمن بأسلوب HDR: دلاء لوغاريتمية-خطية بدقة نسبية ثابتة (أفضل من 1.6% افتراضياً)،
+# فتكلفة التسجيل O(1) والذاكرة صغيرة مهما كان عدد العينات، والنسب المئوية دقيقة حتى الذيل.
+
+import threading
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in whole microseconds.
+
+    Values below 2**precision_bits are stored exactly; above that every
+    power of two is split into 2**(precision_bits - 1) equal buckets.
+    """
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self._sub = 1 << precision_bits
+        self._half = self._sub >> 1
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value):
+        if value < self._sub:
+            return value
+        shift = value.bit_length() - self.precision_bits
+        return self._sub + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _upper_bound(self, index):
+        # أعلى قيمة تقع في الدلو، كما تفعل HdrHistogram عند حساب النسب المئوية
+        if index < self._sub:
+            return index
+        shift, offset = divmod(index - self._sub, self._half)
+        shift += 1
+        return ((offset + self._half + 1) << shift) - 1
+
+    def record(self, seconds):
+        self.record_us(int(seconds * 1_000_000))
+
+    def record_us(self, value):
+        value = max(int(value), 0)
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total_us += value
+            if self.min_us is None or value < self.min_us:
+                self.min_us = value
+            if value > self.max_us:
+                self.max_us = value
+
+    def merge(self, other):
+        with self._lock:
+            for index, count in other._counts.items():
+                self._counts[index] = self._counts.get(index, 0) + count
+            self.count += other.count
+            self.total_us += other.total_us
+            if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+                self.min_us = other.min_us
+            self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percent):
+        """Latency in microseconds at the given percentile (0-100)."""
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, -(-self.count * percent // 100))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= target:
+                    return min(self._upper_bound(index), self.max_us)
+            return self.max_us
+
+    @property
+    def mean_us(self):
+        return self.total_us / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": round(self.mean_us, 1),
+            "p50_us": self.percentile(50),
+            "p95_us": self.percentile(95),
+            "p99_us": self.percentile(99),
+            "p999_us": self.percentile(99.9),
+            "max_us": self.max_us,
+        }
@@ -0,0 +1,166 @@
+# lookup_cache.py
+# ذاكرة مؤقتة LRU محدودة أمام RealDatabase.find: الأسماء المتكررة لا تصل إلى SQLite،
+# والنتائج السلبية (المهمة غير موجودة) تُخزَّن أيضاً. أي كتابة على اسم تُبطل مدخله.
+
+import threading
+from collections import OrderedDict
+
+try:
+    from .task_service import nocase_key
+except ImportError:  # تشغيل مباشر كسكربت
+    from task_service import nocase_key
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe bounded LRU map with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # يزداد مع كل إبطال؛ قراءة بدأت قبل الإبطال لا يحق لها تعبئة الذاكرة بعده
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _cache_key(name):
+    if name is None:
+        return None
+    name = name.strip()
+    return nocase_key(name) if name else None
+
+
+class CachedDatabase:
+    """Read-through cache for find() in front of any RealDatabase-like object.
+
+    Every write method invalidates the names it touches (delete_where clears
+    the whole cache); everything else is passed straight to the wrapped
+    database.
+    """
+
+    def __init__(self, db, maxsize=1024):
+        self.db = db
+        self.cache = LRUCache(maxsize)
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+    def find(self, name):
+        key = _cache_key(name)
+        if key is None:
+            return self.db.find(name)
+        row = self.cache.get(key)
+        if row is not _MISSING:
+            return row
+        generation = self.cache.generation
+        row = self.db.find(name)
+        self.cache.put(key, row, generation)
+        return row
+
+    def _invalidate(self, name):
+        key = _cache_key(name) if isinstance(name, str) else None
+        if key is not None:
+            self.cache.invalidate(key)
+
+    def insert(self, task):
+        try:
+            return self.db.insert(task)
+        finally:
+            self._invalidate(task['name'])
+
+    def insert_many(self, tasks, **kwargs):
+        return self._invalidate_outcomes(self.db.insert_many, tasks, **kwargs)
+
+    def delete(self, name):
+        try:
+            return self.db.delete(name)
+        finally:
+            self._invalidate(name)
+
+    def update_completion(self, name, completed):
+        try:
+            return self.db.update_completion(name, completed)
+        finally:
+            self._invalidate(name)
+
+    def update_completion_many(self, names, completed, **kwargs):
+        return self._invalidate_outcomes(self.db.update_completion_many, names, completed, **kwargs)
+
+    def delete_many(self, names, **kwargs):
+        return self._invalidate_outcomes(self.db.delete_many, names, **kwargs)
+
+    def delete_where(self, completed, **kwargs):
+        # لا نعرف مسبقاً أي الأسماء ستتأثر
+        try:
+            return self.db.delete_where(completed, **kwargs)
+        finally:
+            self.cache.clear()
+
+    def _invalidate_outcomes(self, method, *args, **kwargs):
+        try:
+            outcomes = method(*args, **kwargs)
+        except Exception:
+            self.cache.clear()
+            raise
+        for name, _ in outcomes:
+            self._invalidate(name)
+        return outcomes
+
+    def stats(self):
+        return self.cache.stats()
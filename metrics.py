@@ -0,0 +1,214 @@
+# metrics.py
+# قياسات تشغيلية لـ TaskService و RealDatabase: عدد الاستدعاءات، مدرّج زمني، الأخطاء، التكرارات
+# وعدد الصفوف لكل عملية. القياس مطفأ افتراضياً؛ عندها لا يكلّف المُزخرِف سوى فحص متغير واحد.
+#
+#   sink = metrics.InMemorySink()
+#   metrics.enable(sink)
+#   ...
+#   print(sink.snapshot()["db.insert"])
+#
+# أو للإنتاج (مجمّع textfile الخاص بـ node_exporter):
+#   metrics.enable(metrics.PrometheusFileExporter("/var/lib/node_exporter/tasks.prom", interval=15))
+
+import abc
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from .latency_histogram import LatencyHistogram
+except ImportError:  # تشغيل مباشر كسكربت
+    from latency_histogram import LatencyHistogram
+
+_sink = None
+
+
+class MetricsSink(abc.ABC):
+    """Receives one observation per instrumented call."""
+
+    @abc.abstractmethod
+    def observe(self, operation, seconds, error=False, duplicates=0, rows=None):
+        """Record one call: its duration, whether it raised, duplicates and row count."""
+
+
+def enable(sink):
+    global _sink
+    _sink = sink
+    return sink
+
+
+def disable():
+    global _sink
+    _sink = None
+
+
+def active_sink():
+    return _sink
+
+
+@contextmanager
+def recording(sink=None):
+    """Enable a sink for the duration of a with-block and restore the previous one."""
+    previous = _sink
+    sink = enable(sink if sink is not None else InMemorySink())
+    try:
+        yield sink
+    finally:
+        enable(previous)
+
+
+def is_duplicate_error(exc):
+    return isinstance(exc, ValueError) and "already exists" in str(exc)
+
+
+def count_rows(result):
+    """Rows in a list result, or in the rows of a (rows, last_rowid) page."""
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], list):
+        result = result[0]
+    return len(result) if isinstance(result, list) else None
+
+
+def count_found(result):
+    return 0 if result is None else 1
+
+
+def instrumented(operation, rows=None, duplicates=None):
+    """Time a method and report it to the active sink, if any.
+
+    ``rows`` and ``duplicates`` map the return value to counts.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            sink = _sink
+            if sink is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                duplicate = is_duplicate_error(exc)
+                sink.observe(operation, time.perf_counter() - start,
+                             error=not duplicate, duplicates=int(duplicate))
+                raise
+            sink.observe(operation, time.perf_counter() - start,
+                         duplicates=duplicates(result) if duplicates else 0,
+                         rows=rows(result) if rows else None)
+            return result
+        return wrapper
+    return decorate
+
+
+class OperationStats:
+    __slots__ = ("calls", "errors", "duplicates", "rows", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.duplicates = 0
+        self.rows = 0
+        self.latency = LatencyHistogram()
+
+
+class InMemorySink(MetricsSink):
+    """Aggregates observations per operation; read them with snapshot()."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def observe(self, operation, seconds, error=False, duplicates=0, rows=None):
+        with self._lock:
+            stats = self._stats.get(operation)
+            if stats is None:
+                stats = self._stats[operation] = OperationStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.duplicates += duplicates
+            if rows:
+                stats.rows += rows
+        stats.latency.record(seconds)
+
+    def operations(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def snapshot(self):
+        return {
+            operation: {"calls": s.calls, "errors": s.errors, "duplicates": s.duplicates,
+                        "rows": s.rows, **s.latency.summary()}
+            for operation, s in sorted(self.operations().items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(sink, prefix="taskservice"):
+    """Render an InMemorySink in the Prometheus text exposition format."""
+    operations = sorted(sink.operations().items())
+    lines = []
+    for metric, kind, help_text, attr in (
+        ("calls_total", "counter", "Instrumented calls", "calls"),
+        ("errors_total", "counter", "Calls that raised an error", "errors"),
+        ("duplicates_total", "counter", "Rows rejected as duplicates", "duplicates"),
+        ("rows_total", "counter", "Rows affected or returned", "rows"),
+    ):
+        name = f"{prefix}_{metric}"
+        lines += [f"# HELP {name} {help_text}.", f"# TYPE {name} {kind}"]
+        for operation, stats in operations:
+            lines.append(f'{name}{{operation="{_escape(operation)}"}} {getattr(stats, attr)}')
+
+    name = f"{prefix}_latency_seconds"
+    lines += [f"# HELP {name} Call latency.", f"# TYPE {name} summary"]
+    for operation, stats in operations:
+        label = f'operation="{_escape(operation)}"'
+        for quantile in (0.5, 0.95, 0.99):
+            value = stats.latency.percentile(quantile * 100) / 1_000_000
+            lines.append(f'{name}{{{label},quantile="{quantile}"}} {value:.6f}')
+        lines.append(f"{name}_sum{{{label}}} {stats.latency.total_us / 1_000_000:.6f}")
+        lines.append(f"{name}_count{{{label}}} {stats.latency.count}")
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusFileExporter(InMemorySink):
+    """In-memory sink that also writes a Prometheus text file.
+
+    Call write() yourself, or pass ``interval`` to rewrite the file from a
+    background thread. The file is replaced atomically, so a scraper never
+    reads a half-written file.
+    """
+
+    def __init__(self, path, prefix="taskservice", interval=None):
+        super().__init__()
+        self.path = path
+        self.prefix = prefix
+        self._stop = threading.Event()
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+            self._thread.start()
+
+    def write(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(render_prometheus(self, self.prefix))
+        os.replace(tmp_path, self.path)
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.write()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
@@ -0,0 +1,289 @@
+# sharded_storage.py
+# تخزين مجزّأ على عدة ملفات SQLite: كل مهمة تذهب إلى ملف يحدده هاش اسمها بعد طيّ الحالة،
+# فالاسم نفسه (بأي حالة حروف) يصل دائماً إلى الملف نفسه ويبقى قيد UNIQUE صحيحاً داخل كل ملف.
+# لكل ملف كاتب مستقل، فالكتابة على ملفات مختلفة لا تنتظر قفلاً واحداً. الاستيراد الكبير
+# يُوزَّع على عمليات منفصلة (عملية كاتبة لكل ملف) فلا يحدّه قفل GIL ولا نواة واحدة.
+#
+#   db = ShardedDatabase("data/tasks", shards=8)
+#   db.ingest(task_io.read_jsonl(open("tasks.jsonl")))     # عملية لكل ملف
+#   TaskService(db).create_task("Ship it")
+
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import zlib
+
+try:
+    from .connection_pool import PooledDatabase
+    from .storage import (
+        CREATED, DEFAULT_CHUNK_SIZE, DEFAULT_FETCH_SIZE, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID,
+        TaskStorage, _clean, nocase_key,
+    )
+    from .task_service import RealDatabase
+except ImportError:  # تشغيل مباشر كسكربت
+    from connection_pool import PooledDatabase
+    from storage import (
+        CREATED, DEFAULT_CHUNK_SIZE, DEFAULT_FETCH_SIZE, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID,
+        TaskStorage, _clean, nocase_key,
+    )
+    from task_service import RealDatabase
+
+MANIFEST = "shards.json"
+# list_tasks يرمّز موضعه كـ (رقم الملف << 40) | rowid حتى يبقى المؤشر عدداً صحيحاً واحداً
+_ROWID_BITS = 40
+_ROWID_MASK = (1 << _ROWID_BITS) - 1
+# عدد الدفعات المعلّقة لكل ملف أثناء ingest؛ يبقي الذاكرة ثابتة مهما كان حجم المدخلات
+_MAX_PENDING_PER_SHARD = 2
+
+
+def shard_index(name, shards):
+    """Stable shard number for a task name (same in every process and run)."""
+    return zlib.crc32(nocase_key(_clean(name)).encode("utf-8")) % shards
+
+
+# --- عامل الاستيراد (يعمل داخل عملية منفصلة) ---
+_worker_dbs = {}
+
+
+def _ingest_chunk(path, profile, pragmas, tasks):
+    db = _worker_dbs.get(path)
+    if db is None:
+        db = _worker_dbs[path] = RealDatabase(path, profile=profile, pragmas=pragmas)
+    return collections.Counter(status for _, status in db.insert_many(tasks))
+
+
+class ShardedDatabase(TaskStorage):
+    """TaskStorage over N SQLite files, hash-partitioned by case-folded name.
+
+    Lookups and writes go to one shard; iteration, listing and counting
+    stream shard by shard, so ``iter_tasks`` keeps insertion order only
+    within a shard. The shard count is fixed when the directory is created.
+    """
+
+    def __init__(self, directory, shards=4, pool_size=4, profile=None, pragmas=None, timeout=10.0,
+                 search_index=False):
+        os.makedirs(directory, exist_ok=True)
+        manifest = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                existing = json.load(f)["shards"]
+            if existing != shards:
+                raise ValueError(f"'{directory}' was created with {existing} shards, not {shards}.")
+        else:
+            with open(manifest, "w", encoding="utf-8") as f:
+                json.dump({"shards": shards}, f)
+        self.directory = directory
+        self.profile = profile
+        self.pragmas = pragmas
+        self.paths = [os.path.join(directory, f"shard-{i:03d}.sqlite") for i in range(shards)]
+        self.shards = [PooledDatabase(path, pool_size=pool_size, profile=profile, pragmas=pragmas,
+                                      timeout=timeout, search_index=search_index) for path in self.paths]
+        # دفعات insert_many تُكتب على كل الملفات في وقت واحد
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=shards)
+
+    def shard_for(self, name):
+        return self.shards[shard_index(name, len(self.shards))]
+
+    def _fan_out(self, parts, call):
+        """Run call(shard, items) on every shard concurrently.
+
+        ``parts`` maps shard index -> [(input position, item)]; returns
+        [(input position, outcome)] sorted by position.
+        """
+        futures = {
+            index: self._executor.submit(call, self.shards[index], [item for _, item in items])
+            for index, items in parts.items()
+        }
+        results = []
+        for index, items in parts.items():
+            results.extend(zip((position for position, _ in items), futures[index].result()))
+        results.sort(key=lambda pair: pair[0])
+        return results
+
+    def insert(self, task):
+        name = _clean(task['name'])
+        if not name:
+            return False
+        return self.shard_for(name).insert(task)
+
+    def insert_many(self, tasks, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Insert ``chunk_size`` tasks at a time, each chunk fanned out to its shards.
+
+        Every task in a chunk is checked before any shard writes it, so a
+        malformed task raises without committing its chunk. Each shard
+        commits on its own, though: this is not atomic across shards, and
+        chunks committed before the failing one stay.
+        """
+        shards = len(self.shards)
+        created = set()  # أسماء هذا الاستدعاء، حتى يبقى تكرارها في دفعة لاحقة DUPLICATE_IN_BATCH
+        results = []
+        tasks = iter(tasks)
+        while True:
+            chunk = list(itertools.islice(tasks, chunk_size))
+            if not chunk:
+                return results
+            parts = collections.defaultdict(list)
+            outcomes = [None] * len(chunk)
+            for position, task in enumerate(chunk):
+                name = _clean(task['name'])
+                int(task['completed'])  # نفس فحص RealDatabase، قبل أن يكتب أي ملف
+                if name:
+                    parts[shard_index(name, shards)].append((position, task))
+                else:
+                    outcomes[position] = (name, INVALID)
+            for position, (name, status) in self._fan_out(
+                    parts, lambda shard, items: shard.insert_many(items, chunk_size=chunk_size)):
+                key = nocase_key(name)
+                if status == DUPLICATE_IN_DB and key in created:
+                    status = DUPLICATE_IN_BATCH
+                elif status == CREATED:
+                    created.add(key)
+                outcomes[position] = (name, status)
+            results.extend(outcomes)
+
+    def find(self, name):
+        if not isinstance(name, str) or not name.strip():
+            return None
+        return self.shard_for(name).find(name)
+
+    def delete(self, name):
+        if not isinstance(name, str) or not name.strip():
+            return False
+        return self.shard_for(name).delete(name)
+
+    def update_completion(self, name, completed):
+        if not isinstance(name, str) or not name.strip():
+            return False
+        return self.shard_for(name).update_completion(name, completed)
+
+    def _by_name(self, names, call):
+        """Route a list of names to their shards; returns [(name, flag)] in input order."""
+        names = [name.strip() if isinstance(name, str) else "" for name in names]
+        parts = collections.defaultdict(list)
+        for position, name in enumerate(names):
+            if name:
+                parts[shard_index(name, len(self.shards))].append((position, name))
+        outcomes = [(name, False) for name in names]
+        for position, outcome in self._fan_out(parts, call):
+            outcomes[position] = outcome
+        return outcomes
+
+    def update_completion_many(self, names, completed, chunk_size=DEFAULT_CHUNK_SIZE):
+        return self._by_name(names, lambda shard, items: shard.update_completion_many(
+            items, completed, chunk_size=chunk_size))
+
+    def delete_many(self, names, vacuum=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        return self._by_name(names, lambda shard, items: shard.delete_many(
+            items, vacuum=vacuum, chunk_size=chunk_size))
+
+    def delete_where(self, completed, vacuum=False):
+        futures = [self._executor.submit(shard.delete_where, completed, vacuum=vacuum) for shard in self.shards]
+        return [name for future in futures for name in future.result()]
+
+    def incremental_vacuum(self, max_pages=None):
+        return sum(shard.incremental_vacuum(max_pages) for shard in self.shards)
+
+    def count(self):
+        return sum(self._executor.map(lambda shard: shard.count(), self.shards))
+
+    def task_stats(self):
+        totals = collections.Counter()
+        for stats in self._executor.map(lambda shard: shard.task_stats(), self.shards):
+            totals.update(stats)
+        return {key: totals[key] for key in ("total", "completed", "pending")}
+
+    def iter_tasks(self, chunk_size=DEFAULT_FETCH_SIZE):
+        for shard in self.shards:
+            yield from shard.iter_tasks(chunk_size)
+
+    def list_tasks(self, after_rowid=0, limit=100):
+        """Keyset paging across shards; the returned cursor encodes (shard, rowid)."""
+        index, rowid = after_rowid >> _ROWID_BITS, after_rowid & _ROWID_MASK
+        tasks = []
+        last = None
+        while index < len(self.shards) and len(tasks) < limit:
+            page, page_last = self.shards[index].list_tasks(rowid, limit - len(tasks))
+            if page:
+                tasks.extend(page)
+                last = (index << _ROWID_BITS) | page_last
+            if len(tasks) < limit:
+                index, rowid = index + 1, 0
+        return tasks, last
+
+    def search_scored(self, query, limit, after=None):
+        """Merged top ``limit`` matches; each cursor holds one position per shard."""
+        # كل ملف يعيد أفضل limit نتيجة بعد موضعه هو؛ الدمج يأخذ الأفضل من الكل (bm25 متقارب لأن
+        # التوزيع متجانس). rowid لا يتفرّد عبر الملفات، لذلك يحفظ المؤشر موضع كل ملف على حدة
+        shards = len(self.shards)
+        start = tuple(after) if after is not None else (None,) * shards
+        ranked = self._executor.map(
+            lambda index: [(key, index, task) for key, task in
+                           self.shards[index].search_scored(query, limit, start[index])],
+            range(shards))
+        positions = list(start)
+        results = []
+        for key, index, task in itertools.islice(heapq.merge(*ranked, key=lambda item: item[:2]), limit):
+            positions[index] = key
+            results.append((tuple(positions), task))
+        return results
+
+    def search_prefix(self, prefix, limit=20, after=""):
+        pages = self._executor.map(lambda shard: shard.search_prefix(prefix, limit, after)[0], self.shards)
+        tasks = list(itertools.islice(heapq.merge(*pages, key=lambda task: nocase_key(task['name'])), limit))
+        return tasks, (tasks[-1]['name'] if tasks else None)
+
+    def ingest(self, tasks, transaction_size=10_000, processes=None):
+        """Bulk-load tasks with one writer process per shard; returns status counts.
+
+        Rows are routed as they are read and sent in transactions of
+        ``transaction_size`` per shard, with at most two pending per shard, so
+        memory stays bounded. A name repeated in different transactions is
+        counted as DUPLICATE_IN_DB.
+        """
+        shards = len(self.shards)
+        workers = shards if processes is None else max(1, min(processes, shards))
+        buffers = [[] for _ in range(shards)]
+        pending = [collections.deque() for _ in range(shards)]
+        totals = collections.Counter()
+        # عملية واحدة لكل مجموعة من الملفات: الملف i يُكتب دائماً من العملية i % workers.
+        # spawn لا fork: fork بينما خيوط المجمّع واتصالات SQLite حيّة قد يورث أقفالاً محجوزة
+        context = multiprocessing.get_context("spawn")
+        pools = [concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(workers)]
+
+        def submit(index):
+            queue = pending[index]
+            if len(queue) >= _MAX_PENDING_PER_SHARD:
+                totals.update(queue.popleft().result())
+            queue.append(pools[index % workers].submit(
+                _ingest_chunk, self.paths[index], self.profile, self.pragmas, buffers[index]))
+            buffers[index] = []
+
+        try:
+            for task in tasks:
+                name = _clean(task['name'])
+                if not name:
+                    totals[INVALID] += 1
+                    continue
+                index = shard_index(name, shards)
+                buffers[index].append(task)
+                if len(buffers[index]) >= transaction_size:
+                    submit(index)
+            for index in range(shards):
+                if buffers[index]:
+                    submit(index)
+            for queue in pending:
+                while queue:
+                    totals.update(queue.popleft().result())
+        finally:
+            for pool in pools:
+                pool.shutdown()
+        return totals
+
+    def close(self):
+        self._executor.shutdown()
+        for shard in self.shards:
+            shard.close()
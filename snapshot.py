@@ -0,0 +1,108 @@
+# snapshot.py
+# لقطات لقاعدة بيانات SQLite (خاصة ':memory:') عبر Online Backup API: النسخ يتم صفحةً صفحة
+# على خطوات صغيرة، فالكتابة على الاتصال نفسه تستمر بين الخطوات ولا تنتظر انتهاء اللقطة.
+# الإقلاع الدافئ يقرأ ملف اللقطة تسلسلياً إلى الذاكرة بدل إعادة إدخال كل صف.
+#
+#   db = RealDatabase(check_same_thread=False)
+#   scheduler = SnapshotScheduler(db.conn, "tasks.snapshot", interval=60)
+#   ...
+#   scheduler.close()                                   # لقطة أخيرة عند الإغلاق
+#   db = RealDatabase.from_snapshot("tasks.snapshot")   # عند الإقلاع التالي
+
+import os
+import pathlib
+import sqlite3
+import threading
+
+# عدد الصفحات في كل خطوة نسخ، والاستراحة بين الخطوات (ثوانٍ) لإفساح المجال للكتابة
+DEFAULT_STEP_PAGES = 1024
+DEFAULT_STEP_SLEEP = 0.001
+
+
+def save_snapshot(conn, path, pages=DEFAULT_STEP_PAGES, sleep=DEFAULT_STEP_SLEEP, progress=None):
+    """Copy the connection's main database to ``path``; returns the file size.
+
+    The copy is written to a temporary file and renamed, so ``path`` always
+    holds a complete snapshot. Only committed data is copied: a step that
+    meets an open write transaction waits for it to finish.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        target = sqlite3.connect(tmp_path)
+    except sqlite3.OperationalError as e:
+        # مجلد غير موجود أو بلا صلاحية كتابة: خطأ ملفات وليس خطأ قاعدة بيانات
+        raise OSError(f"Cannot write snapshot '{path}': {e}") from None
+    try:
+        conn.backup(target, pages=pages, progress=progress, sleep=sleep)
+        target.close()
+    except BaseException:
+        target.close()
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def load_snapshot(path, conn):
+    """Replace the connection's main database with the snapshot at ``path``."""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Snapshot '{path}' does not exist.")
+    # mode=ro: الإقلاع لا يعدّل اللقطة، ولا ينشئ ملفاً فارغاً إذا اختفى المسار فجأة
+    source = sqlite3.connect(pathlib.Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        # pages=-1: نسخة واحدة متصلة، قراءة تسلسلية للملف كله
+        source.backup(conn)
+    finally:
+        source.close()
+
+
+class SnapshotScheduler:
+    """Snapshot a connection on demand or every ``interval`` seconds.
+
+    The periodic snapshots run on a background thread, so the connection
+    must be opened with ``check_same_thread=False``. close() stops the
+    thread and writes a final snapshot.
+    """
+
+    def __init__(self, conn, path, interval=None, pages=DEFAULT_STEP_PAGES, sleep=DEFAULT_STEP_SLEEP):
+        self.conn = conn
+        self.path = path
+        self.pages = pages
+        self.sleep = sleep
+        self.count = 0
+        self.last_error = None
+        self._lock = threading.Lock()  # لقطة واحدة في كل مرة
+        self._stop = threading.Event()
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+            self._thread.start()
+
+    def snapshot(self):
+        with self._lock:
+            size = save_snapshot(self.conn, self.path, self.pages, self.sleep)
+            self.count += 1
+            return size
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.snapshot()
+                self.last_error = None
+            except (OSError, sqlite3.Error) as e:
+                # نحتفظ بآخر خطأ ونحاول في الدورة التالية؛ اللقطة السابقة تبقى سليمة
+                self.last_error = e
+
+    def close(self, final=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if final:
+            self.snapshot()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
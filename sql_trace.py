@@ -0,0 +1,227 @@
+# sql_trace.py
+# تتبّع جمل SQL لطبقة SQLite: نص الجملة وعدد الجمل التي نفّذتها SQLite (عبر set_trace_callback)،
+# شكل المعاملات، المدة، الصفوف المتأثرة وعدد خطوات المحرّك الافتراضي (عبر progress handler). الجمل الأبطأ من العتبة
+# تذهب إلى سجل الجمل البطيئة، ومعها خطة EXPLAIN QUERY PLAN اختيارياً لكشف مسح الجدول الكامل.
+#
+#   tracer = SqlTracer(slow_threshold=0.01, explain=True, slow_log="slow.jsonl")
+#   db = RealDatabase("tasks.sqlite", tracer=tracer)
+#   ...
+#   for record in tracer.slow_queries:
+#       print(record.duration, record.sql, record.plan)
+
+import collections
+import json
+import sqlite3
+import threading
+import time
+
+# جمل لا معنى لخطة تنفيذها
+_NO_PLAN = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "CREATE", "DROP", "ALTER", "SAVEPOINT", "RELEASE", "VACUUM")
+# حد طول نص الجملة في السجل؛ insert_many وحده يبني جملاً بآلاف المحارف
+MAX_SQL_LENGTH = 1000
+
+
+def parameter_shape(parameters, many=False):
+    """Describe parameters without their values, e.g. 'tuple[2]' or '500 x tuple[2]'."""
+    if many:
+        rows = parameters if isinstance(parameters, (list, tuple)) else list(parameters)
+        first = parameter_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        return "dict[" + ", ".join(sorted(parameters)) + "]"
+    return f"{type(parameters).__name__}[{len(parameters)}]"
+
+
+def clip_sql(sql, limit=MAX_SQL_LENGTH):
+    """Collapse whitespace and cut ``sql`` to ``limit`` characters."""
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= limit else f"{sql[:limit]}... [{len(sql)} chars]"
+
+
+class TraceRecord:
+    """One traced call. ``sql`` is the statement as written, with ``?``
+    placeholders; ``statements`` counts what SQLite ran for it. Parameter
+    values are never kept, only their shape.
+    """
+
+    __slots__ = ("sql", "statements", "params", "duration", "rows", "vm_steps", "plan")
+
+    def __init__(self, sql, statements, params, duration, rows, vm_steps, plan=None):
+        self.sql = sql
+        self.statements = statements
+        self.params = params
+        self.duration = duration
+        self.rows = rows
+        self.vm_steps = vm_steps
+        self.plan = plan
+
+    @property
+    def full_scan(self):
+        """True when the plan walks a whole table or index (SCAN) instead of a SEARCH."""
+        # "SCAN ... VIRTUAL TABLE" هو استعلام FTS5 عبر فهرسه الخاص، وليس مسحاً كاملاً،
+        # و"SCAN f" لاستعلام فرعي مُجسَّد (MATERIALIZE f) يمرّ على نتيجته الصغيرة لا على جدول
+        plan = self.plan or ()
+        subqueries = {line.split()[-1] for line in plan if line.startswith(("MATERIALIZE", "CO-ROUTINE"))}
+        return any(line.startswith("SCAN") and "VIRTUAL TABLE" not in line and line.split()[1] not in subqueries
+                   for line in plan)
+
+    def to_dict(self):
+        return {
+            "sql": self.sql,
+            "statements": self.statements,
+            "params": self.params,
+            "duration_ms": round(self.duration * 1000, 3),
+            "rows": self.rows,
+            "vm_steps": self.vm_steps,
+            "plan": self.plan,
+            "full_scan": self.full_scan,
+        }
+
+    def __repr__(self):
+        return f"TraceRecord({self.sql!r}, {self.params}, {self.duration * 1000:.3f}ms)"
+
+
+class SqlTracer:
+    """Collects per-statement timings from connections created with it.
+
+    ``slow_threshold`` is in seconds; slower statements are kept in
+    ``slow_queries`` and, if ``slow_log`` is a path, appended to it as
+    JSON lines. ``keep`` bounds how many recent records are retained.
+    """
+
+    def __init__(self, slow_threshold=0.1, explain=False, slow_log=None, keep=1000,
+                 progress_interval=1000):
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self.slow_log = slow_log
+        self.progress_interval = progress_interval
+        self.records = collections.deque(maxlen=keep)
+        self.slow_queries = collections.deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def attach(self, conn):
+        conn.tracer = self
+        conn.set_trace_callback(self._on_statement)
+        if self.progress_interval:
+            conn.set_progress_handler(self._on_progress, self.progress_interval)
+        return conn
+
+    def _on_statement(self, sql):
+        # النص هنا موسّع بقيم المعاملات، فلا يُحفظ: نعدّ الجمل فقط.
+        # الأسطر "-- ..." جمل داخلية لـ FTS5، والتوابع تعيد الإبلاغ عن الجملة نفسها عند كل إطلاق
+        local = self._local
+        if getattr(local, "statements", None) is None or sql.startswith("--") or sql == local.last:
+            return
+        local.statements += 1
+        local.last = sql
+
+    def _on_progress(self):
+        self._local.steps = getattr(self._local, "steps", 0) + 1
+        return 0  # صفر = تابع التنفيذ
+
+    def run(self, conn, sql, params, run, many=False):
+        """Execute ``run()`` as one traced call and return its result."""
+        local = self._local
+        if getattr(local, "statements", None) is not None:
+            return run()  # استدعاء متداخل (مثل EXPLAIN أدناه) لا يُسجَّل مرتين
+        local.statements = 0
+        local.last = None
+        local.steps = 0
+        start = time.perf_counter()
+        try:
+            result = run()
+        finally:
+            duration = time.perf_counter() - start
+            statements, local.statements, local.last = local.statements, None, None
+        rows = getattr(result, "rowcount", -1)
+        record = TraceRecord(
+            sql=clip_sql(sql),
+            statements=statements,
+            params=parameter_shape(params, many) if params is not None else None,
+            duration=duration,
+            rows=None if rows < 0 else rows,
+            vm_steps=local.steps * self.progress_interval,
+        )
+        if duration >= self.slow_threshold:
+            if self.explain:
+                record.plan = self.explain_plan(conn, sql, params, many)
+            self._slow(record)
+        with self._lock:
+            self.records.append(record)
+        return result
+
+    def explain_plan(self, conn, sql, params=None, many=False):
+        """EXPLAIN QUERY PLAN detail lines for ``sql``, or None if not applicable."""
+        if sql.lstrip().upper().startswith(_NO_PLAN) or ";" in sql.strip().rstrip(";"):
+            return None
+        if many:
+            params = next(iter(params), ())
+        local = self._local
+        local.statements = 0  # يمنع تسجيل جملة EXPLAIN نفسها
+        local.last = None
+        try:
+            rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+        except sqlite3.Error:
+            return None
+        finally:
+            local.statements = local.last = None
+        return [row[-1] for row in rows]
+
+    def _slow(self, record):
+        with self._lock:
+            self.slow_queries.append(record)
+            if self.slow_log:
+                with open(self.slow_log, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.slow_queries.clear()
+
+
+class TracingCursor(sqlite3.Cursor):
+    def _traced(self, sql, params, run, many=False):
+        tracer = self.connection.tracer
+        if tracer is None:
+            return run()
+        return tracer.run(self.connection, sql, params, run, many)
+
+    def execute(self, sql, parameters=()):
+        run = super().execute
+        return self._traced(sql, parameters, lambda: run(sql, parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        run = super().executemany
+        return self._traced(sql, seq_of_parameters, lambda: run(sql, seq_of_parameters), many=True)
+
+    def executescript(self, sql_script):
+        run = super().executescript
+        return self._traced(sql_script, None, lambda: run(sql_script))
+
+
+class TracingConnection(sqlite3.Connection):
+    """Connection whose cursors, shortcuts and commits are timed by its tracer."""
+
+    tracer = None
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    # Connection.execute في CPython لا يمرّ عبر cursor()، لذلك نعيد توجيهه صراحة
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        # زمن COMMIT يشمل fsync، وهو غالباً سبب القفزات في الوضع durable
+        if self.tracer is None or not self.in_transaction:
+            return super().commit()
+        return self.tracer.run(self, "COMMIT", None, super().commit)
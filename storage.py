@@ -0,0 +1,328 @@
+# storage.py
+# واجهة موحّدة لمحركات تخزين المهام، ومحرك في الذاكرة بقواميس Python فقط.
+# المحرك الافتراضي هو task_service.RealDatabase (SQLite)؛ MemoryStorage بديل سريع للأحمال
+# المؤقتة التي لا تحتاج SQL ولا بقاء البيانات بعد إغلاق البرنامج. كلا الخدمتين TaskService
+# (في task_service و task_EtoE) تعملان فوق أي محرك يطبّق TaskStorage.
+
+import abc
+import itertools
+import re
+import string
+import threading
+
+try:
+    from .metrics import count_found, instrumented
+    from .task_record import Task
+except ImportError:  # تشغيل مباشر كسكربت
+    from metrics import count_found, instrumented
+    from task_record import Task
+
+# نتائج الإدخال الجماعي لكل عنصر (insert_many / create_tasks)
+CREATED = "created"
+DUPLICATE_IN_BATCH = "duplicate_in_batch"
+DUPLICATE_IN_DB = "duplicate_in_db"
+INVALID = "invalid"
+
+# حجم الدفعة الافتراضي؛ أقل من الحد الأدنى لعدد المتغيرات في SQLite (999)
+DEFAULT_CHUNK_SIZE = 500
+# عدد الصفوف التي يجلبها iter_tasks في كل fetchmany
+DEFAULT_FETCH_SIZE = 1000
+
+# COLLATE NOCASE في SQLite يطوي حروف ASCII فقط، لذلك نطابقه هنا بدل lower()
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def nocase_key(name):
+    """Fold a task name the same way the column's COLLATE NOCASE does."""
+    return name.translate(_NOCASE)
+
+
+# حدود الكلمات في البحث بلا فهرس؛ تقريب لـ tokenizer unicode61 في FTS5
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _clean(name):
+    return name.strip() if isinstance(name, str) else ""
+
+
+def _count_rejected(created):
+    return 0 if created else 1
+
+
+def _count_duplicates(statuses):
+    return sum(status in (DUPLICATE_IN_BATCH, DUPLICATE_IN_DB) for _, status in statuses)
+
+
+def _count_matched(outcomes):
+    return sum(found for _, found in outcomes)
+
+
+class TaskStorage(abc.ABC):
+    """Storage engine contract shared by the SQLite and in-memory engines.
+
+    Names are stripped and unique ignoring ASCII case. ``insert`` returns
+    False instead of raising when the name is taken or blank; reporting why
+    is the service's job. ``insert_many`` adds all of its tasks or none.
+    """
+
+    @abc.abstractmethod
+    def insert(self, task):
+        """Add {'name', 'completed'}; returns False if the name is blank or already exists."""
+
+    @abc.abstractmethod
+    def insert_many(self, tasks, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Add many tasks; returns [(name, status)] with CREATED, DUPLICATE_* or INVALID."""
+
+    @abc.abstractmethod
+    def find(self, name):
+        """Return (name, completed) for a task, or None."""
+
+    @abc.abstractmethod
+    def delete(self, name):
+        """Remove a task; returns True if it existed."""
+
+    @abc.abstractmethod
+    def update_completion(self, name, completed):
+        """Set the completed flag; returns True if the task exists."""
+
+    @abc.abstractmethod
+    def iter_tasks(self, chunk_size=DEFAULT_FETCH_SIZE):
+        """Yield every task as a Task, in insertion order."""
+
+    def get_all(self):
+        return list(self.iter_tasks())
+
+    def count(self):
+        return sum(1 for _ in self.iter_tasks())
+
+    def task_stats(self):
+        """Return {'total', 'completed', 'pending'}; engines override this with O(1) counters."""
+        total = completed = 0
+        for task in self.iter_tasks():
+            total += 1
+            completed += bool(task['completed'])
+        return {"total": total, "completed": completed, "pending": total - completed}
+
+    def update_completion_many(self, names, completed, chunk_size=DEFAULT_CHUNK_SIZE):
+        return [(name, self.update_completion(name, completed)) for name in map(_clean, names)]
+
+    def search(self, query, limit=20, after=None):
+        """Ranked word-prefix search; returns (tasks, cursor or None).
+
+        Pass the cursor back as ``after`` for the next page (keyset paging,
+        so later pages cost no more than the first).
+        """
+        scored = self.search_scored(query, limit + 1, after)
+        page = [task for _, task in scored[:limit]]
+        return page, (scored[limit - 1][0] if len(scored) > limit else None)
+
+    def search_scored(self, query, limit, after=None):
+        """Top ``limit`` matches after cursor ``after`` as [(cursor, Task)], best first.
+
+        Names starting with the query come first, in name order, so an exact
+        match leads; then the other tasks whose words start with every query
+        word. Passing an item's cursor as ``after`` continues right after it.
+        """
+        # مسح كامل بدل فهرس؛ RealDatabase يستبدله بفهرس الاسم و FTS5
+        text = _clean(query)
+        key = nocase_key(text)
+        if not key:
+            return []
+        words = _WORD.findall(text.casefold())
+        scored = []
+        for position, task in enumerate(self.iter_tasks()):
+            name = nocase_key(task['name'])
+            if name.startswith(key):
+                scored.append(((0, name), task))
+            elif words:
+                tokens = _WORD.findall(task['name'].casefold())
+                if all(any(token.startswith(word) for token in tokens) for word in words):
+                    scored.append(((1, 0.0, position), task))
+        scored.sort(key=lambda pair: pair[0])
+        if after is not None:
+            scored = [pair for pair in scored if pair[0] > tuple(after)]
+        return scored[:limit]
+
+    def search_prefix(self, prefix, limit=20, after=""):
+        """Tasks whose name starts with ``prefix`` ignoring case; returns (tasks, last_name)."""
+        key = nocase_key(_clean(prefix))
+        if not key:
+            return [], None
+        after = nocase_key(after or "")
+        matches = sorted((task for task in self.iter_tasks()
+                          if nocase_key(task['name']).startswith(key) and nocase_key(task['name']) > after),
+                         key=lambda task: nocase_key(task['name']))[:limit]
+        return matches, (matches[-1]['name'] if matches else None)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MemoryStorage(TaskStorage):
+    """Dict-indexed in-memory engine with the same results as RealDatabase.
+
+    Nothing is persisted. All operations are O(1) per name except iteration,
+    listing and delete_where. Safe to share between threads.
+    """
+
+    def __init__(self):
+        # nocase_key(name) -> [rowid, name, completed]؛ القاموس يحفظ ترتيب الإدخال
+        self._rows = {}
+        self._rowids = itertools.count(1)
+        self._completed = 0  # عدد المهام المنجزة، يُحدَّث مع كل تعديل تحت القفل نفسه
+        self._lock = threading.RLock()
+
+    @instrumented("memory.insert", duplicates=_count_rejected)
+    def insert(self, task):
+        name = _clean(task['name'])
+        if not name:
+            return False
+        completed = bool(task['completed'])
+        key = nocase_key(name)
+        with self._lock:
+            if key in self._rows:
+                return False
+            self._rows[key] = [next(self._rowids), name, completed]
+            self._completed += completed
+            return True
+
+    @instrumented("memory.insert_many", duplicates=_count_duplicates)
+    def insert_many(self, tasks, chunk_size=DEFAULT_CHUNK_SIZE):
+        statuses = []
+        added = {}  # nocase_key -> (name, completed)، لا يُطبَّق إلا بعد نجاح الدفعة كلها
+        with self._lock:
+            for task in tasks:
+                name = _clean(task['name'])
+                key = nocase_key(name)
+                if not name:
+                    statuses.append((name, INVALID))
+                elif key in added:
+                    statuses.append((name, DUPLICATE_IN_BATCH))
+                elif key in self._rows:
+                    statuses.append((name, DUPLICATE_IN_DB))
+                else:
+                    added[key] = (name, bool(task['completed']))
+                    statuses.append((name, CREATED))
+            # مثل معاملة RealDatabase: خطأ في أي مهمة أعلاه لا يترك شيئاً مُدخلاً
+            for key, (name, completed) in added.items():
+                self._rows[key] = [next(self._rowids), name, completed]
+                self._completed += completed
+        return statuses
+
+    @instrumented("memory.find", rows=count_found)
+    def find(self, name):
+        name = _clean(name)
+        if not name:
+            return None
+        with self._lock:
+            row = self._rows.get(nocase_key(name))
+            # نفس شكل صف SQLite: completed كعدد صحيح
+            return None if row is None else (row[1], int(row[2]))
+
+    @instrumented("memory.delete")
+    def delete(self, name):
+        name = _clean(name)
+        if not name:
+            return False
+        with self._lock:
+            return self._pop(nocase_key(name)) is not None
+
+    def _pop(self, key):
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._completed -= row[2]
+        return row
+
+    @instrumented("memory.update_completion")
+    def update_completion(self, name, completed):
+        name = _clean(name)
+        if not name:
+            return False
+        with self._lock:
+            row = self._rows.get(nocase_key(name))
+            if row is None:
+                return False
+            self._completed += bool(completed) - row[2]
+            row[2] = bool(completed)
+            return True
+
+    def update_completion_many(self, names, completed, chunk_size=DEFAULT_CHUNK_SIZE):
+        with self._lock:
+            return [(name, self.update_completion(name, completed)) for name in map(_clean, names)]
+
+    def delete_many(self, names, vacuum=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        # مثل RealDatabase: كل اسم في الدفعة يُبلَّغ عنه True إذا كان موجوداً قبل حذف الدفعة
+        outcomes = []
+        names = iter(names)
+        with self._lock:
+            while True:
+                chunk = [_clean(name) for name in itertools.islice(names, chunk_size)]
+                if not chunk:
+                    break
+                deleted = {nocase_key(name) for name in chunk
+                           if name and self._pop(nocase_key(name)) is not None}
+                outcomes.extend((name, bool(name) and nocase_key(name) in deleted) for name in chunk)
+        return outcomes
+
+    def delete_where(self, completed, vacuum=False):
+        with self._lock:
+            keys = [key for key, row in self._rows.items() if row[2] == bool(completed)]
+            return [self._pop(key)[1] for key in keys]
+
+    def incremental_vacuum(self, max_pages=None):
+        return 0
+
+    def iter_tasks(self, chunk_size=DEFAULT_FETCH_SIZE):
+        with self._lock:
+            rows = list(self._rows.values())
+        for _, name, completed in rows:
+            yield Task(name, completed)
+
+    def list_tasks(self, after_rowid=0, limit=100):
+        tasks = []
+        last = None
+        with self._lock:
+            # الصفوف مرتبة بـ rowid لأن القاموس يحفظ ترتيب الإدخال
+            for rowid, name, completed in self._rows.values():
+                if rowid <= after_rowid:
+                    continue
+                tasks.append(Task(name, completed))
+                last = rowid
+                if len(tasks) == limit:
+                    break
+        return tasks, last
+
+    def close(self):
+        with self._lock:
+            self._rows.clear()
+            self._completed = 0
+
+    def count(self):
+        return len(self._rows)
+
+    def task_stats(self):
+        with self._lock:
+            total = len(self._rows)
+            return {"total": total, "completed": self._completed, "pending": total - self._completed}
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def create_storage(engine="sqlite", **kwargs):
+    """Open a storage engine by name: 'sqlite' (RealDatabase) or 'memory'."""
+    if engine == "memory":
+        return MemoryStorage(**kwargs)
+    if engine == "sqlite":
+        try:
+            from .task_service import RealDatabase
+        except ImportError:
+            from task_service import RealDatabase
+        return RealDatabase(**kwargs)
+    raise ValueError(f"Unknown storage engine '{engine}'. Choose 'sqlite' or 'memory'.")
@@ -1,55 +1,24 @@
 # task_E2E.py
-import sqlite3
-
-class RealDatabase:
-    """In-memory SQLite DB with case-insensitive UNIQUE on name."""
-    def __init__(self):
-        self.conn = sqlite3.connect(':memory:')
-        self.cursor = self.conn.cursor()
-        # استخدمنا COLLATE NOCASE لمنع التكرار بغض النظر عن حالة الحروف
-        self.cursor.execute(
-            "CREATE TABLE IF NOT EXISTS tasks (name TEXT UNIQUE COLLATE NOCASE, completed INTEGER)"
-        )
-        self.conn.commit()
-
-    def insert(self, task):
-        try:
-            # صرحنا أسماء الأعمدة صراحة
-            self.cursor.execute(
-                "INSERT INTO tasks (name, completed) VALUES (?, ?)",
-                (task['name'], int(task['completed']))
-            )
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
-
-    def get_all(self):
-        # ترتيب ثابت حسب الإدخال
-        self.cursor.execute("SELECT name, completed FROM tasks ORDER BY rowid")
-        return [{"name": row[0], "completed": bool(row[1])} for row in self.cursor.fetchall()]
-
-    def update_completion(self, name, completed):
-        # نستخدم نفس سلوك الـ COLLATE NOCASE في WHERE بواسطة LOWER() أو نعتمد COLLATE NOCASE
-        self.cursor.execute("UPDATE tasks SET completed = ? WHERE LOWER(name) = LOWER(?)", (int(completed), name.strip()))
-        affected = self.cursor.rowcount
-        self.conn.commit()
-        return affected > 0
-
-    def find(self, name):
-        if name is None:
-            return None
-        n = name.strip()
-        if not n:
-            return None
-        self.cursor.execute("SELECT name, completed FROM tasks WHERE LOWER(name) = LOWER(?)", (n,))
-        return self.cursor.fetchone()
+try:
+    from .cli_batch import read_commands, run_batch
+    from .metrics import count_rows, instrumented
+    from .sqlite_profiles import MEMORY
+    from .storage import CREATED, _count_duplicates, _count_matched
+    # محرك SQLite واحد مشترك؛ كان هنا نسخة ثانية من RealDatabase تختلف في سلوك insert
+    from .task_service import RealDatabase
+except ImportError:  # تشغيل مباشر: python task_EtoE.py
+    from cli_batch import read_commands, run_batch
+    from metrics import count_rows, instrumented
+    from sqlite_profiles import MEMORY
+    from storage import CREATED, _count_duplicates, _count_matched
+    from task_service import RealDatabase
 
 
 class TaskService:
     def __init__(self, db):
         self.db = db
 
+    @instrumented("etoe.service.create_task")
     def create_task(self, name):
         if name is None or not str(name).strip():
             raise ValueError("Task name cannot be empty or just whitespace.")
@@ -58,22 +27,41 @@ class TaskService:
             raise ValueError(f"Task with name '{task_name}' already exists.")
         return {"name": task_name, "completed": False}
 
+    @instrumented("etoe.service.create_tasks", duplicates=_count_duplicates)
+    def create_tasks(self, names):
+        tasks = ({"name": "" if name is None else str(name), "completed": False} for name in names)
+        return self.db.insert_many(tasks)
+
+    @instrumented("etoe.service.get_all_tasks", rows=count_rows)
     def get_all_tasks(self):
         return self.db.get_all()
 
+    @instrumented("etoe.service.mark_task_complete")
     def mark_task_complete(self, name):
         if name is None or not str(name).strip():
             raise ValueError("Task name cannot be empty or just whitespace.")
         task_name = str(name).strip()
         return self.db.update_completion(task_name, True)
 
+    @instrumented("etoe.service.mark_tasks_complete", rows=_count_matched)
+    def mark_tasks_complete(self, names):
+        return self.db.update_completion_many(names, True)
+
+    @instrumented("etoe.service.stats")
+    def stats(self):
+        return self.db.task_stats()
+
+
+def _format_stats(stats):
+    return f"{stats['total']} tasks: ✅ {stats['completed']} completed, ⏳ {stats['pending']} pending"
+
 
 def run_cli_app():
     db = RealDatabase()
     service = TaskService(db)
 
     print("--- Task Management CLI App ---")
-    print("Commands: add <name> | show | mark <name> | exit")
+    print("Commands: add <name> | show | mark <name> | stats | exit")
 
     while True:
         try:
@@ -98,6 +86,9 @@ def run_cli_app():
                         print(f"{status} {t['name']}")
                 print("---------------------\n")
 
+            elif command == 'stats':
+                print(_format_stats(service.stats()))
+
             elif command == 'add':
                 if len(parts) < 2:
                     print("Error: 'add' command requires a task name.")
@@ -134,5 +125,43 @@ def run_cli_app():
             print(f"An unexpected error occurred: {e}")
 
 
+def run_batch_app(source, path=MEMORY):
+    """Run add/mark/show/stats commands from a file (or '-' for stdin) without prompts."""
+    db = RealDatabase(path)
+    service = TaskService(db)
+
+    def add(names):
+        return [(status == CREATED, "added" if status == CREATED else "invalid name or already exists")
+                for _, status in service.create_tasks(names)]
+
+    def mark(names):
+        return [(found, "marked complete" if found else "not found")
+                for _, found in service.mark_tasks_complete(names)]
+
+    def show():
+        # مولّد: يكتب run_batch كل سطر فور قراءته بدل بناء القائمة كاملة
+        empty = True
+        for t in db.iter_tasks():
+            empty = False
+            yield f"{'✅' if t['completed'] else '⏳'} {t['name']}"
+        if empty:
+            yield "No tasks yet."
+
+    try:
+        return run_batch(read_commands(source), {"add": add, "mark": mark}, show,
+                         commands={"stats": lambda _: [_format_stats(service.stats())]})
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    run_cli_app()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task management CLI app")
+    parser.add_argument("--batch", metavar="FILE", help="run commands from FILE ('-' for stdin) without prompts")
+    parser.add_argument("--db", default=MEMORY, help="SQLite file for batch mode (default: in memory)")
+    args = parser.parse_args()
+    if args.batch:
+        run_batch_app(args.batch, args.db)
+    else:
+        run_cli_app()
@@ -0,0 +1,123 @@
+# task_io.py
+# استيراد وتصدير المهام بصيغة CSV أو JSONL بالتدفق: الملف يُقرأ سطراً بسطر ويُدخل على دفعات،
+# كل دفعة معاملة مستقلة عبر insert_many، والتصدير يكتب من المؤشر مباشرة إلى الملف،
+# فتبقى الذاكرة ثابتة مهما كان عدد الصفوف.
+#
+#   import_tasks(db, "tasks.csv", progress=print)
+#   export_tasks(db, "tasks.jsonl")
+
+import collections
+import csv
+import itertools
+import json
+import os
+
+FORMATS = ("csv", "jsonl")
+# عدد الصفوف في كل معاملة استيراد؛ insert_many يقسّمها داخلياً لجمل INSERT أصغر
+DEFAULT_TRANSACTION_SIZE = 10_000
+
+_TRUE = {"1", "true", "yes", "y", "done", "completed"}
+
+
+def detect_format(path, fmt=None):
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(ext)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format for '{path}'. Use .csv, .jsonl or pass fmt='csv'/'jsonl'.")
+    return fmt
+
+
+def _completed(value):
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE
+    return bool(value)
+
+
+def read_csv(f):
+    """Yield {'name', 'completed'} dicts from a CSV file with a 'name' header."""
+    reader = csv.DictReader(f)
+    if reader.fieldnames is None or "name" not in reader.fieldnames:
+        raise ValueError("CSV input needs a 'name' column.")
+    for row in reader:
+        yield {"name": row["name"] or "", "completed": _completed(row.get("completed") or "")}
+
+
+def read_jsonl(f):
+    """Yield {'name', 'completed'} dicts from one JSON object per line."""
+    for line_no, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_no}: invalid JSON ({e.msg}).") from None
+        if not isinstance(row, dict):
+            raise ValueError(f"Line {line_no}: expected a JSON object.")
+        name = row.get("name")
+        yield {"name": name if isinstance(name, str) else "", "completed": _completed(row.get("completed", False))}
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.transactions = 0
+        self.statuses = collections.Counter()
+
+    def __str__(self):
+        details = ", ".join(f"{count} {status.replace('_', ' ')}" for status, count in sorted(self.statuses.items()))
+        return f"{self.rows} rows in {self.transactions} transactions ({details or 'nothing imported'})"
+
+
+def import_tasks(db, source, fmt=None, transaction_size=DEFAULT_TRANSACTION_SIZE, progress=None):
+    """Stream tasks from a CSV/JSONL path or open text file into ``db``.
+
+    Every ``transaction_size`` rows are inserted and committed with one
+    insert_many call; duplicates and invalid names are counted, not raised.
+    ``progress(report)`` is called after each transaction.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        fmt = detect_format(os.fspath(source), fmt)
+        with open(source, newline="", encoding="utf-8") as f:
+            return import_tasks(db, f, fmt, transaction_size, progress)
+    if fmt not in FORMATS:
+        raise ValueError("Pass fmt='csv' or fmt='jsonl' when importing from an open file.")
+
+    rows = read_csv(source) if fmt == "csv" else read_jsonl(source)
+    report = ImportReport()
+    while True:
+        chunk = list(itertools.islice(rows, transaction_size))
+        if not chunk:
+            break
+        for _, status in db.insert_many(chunk):
+            report.statuses[status] += 1
+        report.rows += len(chunk)
+        report.transactions += 1
+        if progress is not None:
+            progress(report)
+    return report
+
+
+def export_tasks(db, destination, fmt=None, chunk_size=DEFAULT_TRANSACTION_SIZE):
+    """Write every task to a CSV/JSONL path or open text file; returns the row count."""
+    if isinstance(destination, (str, os.PathLike)):
+        fmt = detect_format(os.fspath(destination), fmt)
+        with open(destination, "w", newline="", encoding="utf-8") as f:
+            return export_tasks(db, f, fmt, chunk_size)
+    if fmt not in FORMATS:
+        raise ValueError("Pass fmt='csv' or fmt='jsonl' when exporting to an open file.")
+
+    count = 0
+    tasks = db.iter_tasks(chunk_size)
+    if fmt == "csv":
+        writer = csv.writer(destination)
+        writer.writerow(("name", "completed"))
+        for task in tasks:
+            writer.writerow((task["name"], int(task["completed"])))
+            count += 1
+    else:
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        for task in tasks:
+            destination.write(dumps({"name": task["name"], "completed": task["completed"]}) + "\n")
+            count += 1
+    return count
@@ -1,19 +1,62 @@
 # task_module.py
 
-def add_task(task_name, task_list):
-    # if not task_name:
-    #     raise ValueError("Task name is required")
+try:
+    from .task_record import Task
+except ImportError:  # تشغيل مباشر: python task_module.py
+    from task_record import Task
+
+
+class TaskList:
+    """Task container with a case-folded name index.
+
+    add, find and remove are O(1); ids come from a counter that never
+    goes backwards, so removing a task never causes an id to be reused.
+    """
+
+    def __init__(self):
+        self._by_name = {}  # casefold(name) -> Task، مرتبة حسب الإضافة
+        self._next_id = 1
+
+    def add(self, task_name):
+        if not task_name:
+            raise ValueError("Task name is required")
+        key = task_name.casefold()
+        if key in self._by_name:
+            raise ValueError(f"Task with name '{task_name}' already exists.")
+        task = Task(task_name, False, id=self._next_id)
+        self._next_id += 1
+        self._by_name[key] = task
+        return task
+
+    def find(self, task_name):
+        return self._by_name.get(task_name.casefold())
 
+    def remove(self, task_name):
+        return self._by_name.pop(task_name.casefold(), None) is not None
+
+    def __contains__(self, task_name):
+        return isinstance(task_name, str) and task_name.casefold() in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __len__(self):
+        return len(self._by_name)
+
+
+def add_task(task_name, task_list):
+    if isinstance(task_list, TaskList):
+        return task_list.add(task_name)
 
-    # if any(task["name"] == task_name for task in task_list):
-    #     raise ValueError(f"Task with name '{task_name}' already exists.")
+    # قائمة عادية: نفس القواعد لكن الفحص خطي O(n)؛ استخدم TaskList للإضافات الكثيرة
+    if not task_name:
+        raise ValueError("Task name is required")
 
+    key = task_name.casefold()
+    if any(task["name"].casefold() == key for task in task_list):
+        raise ValueError(f"Task with name '{task_name}' already exists.")
 
-    new_task = {
-        "id": len(task_list) + 1,
-        "name": task_name,
-        "completed": False
-    }
+    new_task = Task(task_name, False, id=len(task_list) + 1)
     task_list.append(new_task)
     return new_task
 
@@ -22,7 +65,7 @@ if __name__ == "__main__":
     print("--- Simple Task Management Application ---")
     print("Enter 'show' to view tasks, 'exit' to quit.")
 
-    my_tasks = []
+    my_tasks = TaskList()
 
     while True:
         user_input = input("\nEnter task name to add: ").strip()  # .strip() removes leading/trailing whitespace
@@ -0,0 +1,60 @@
+# task_record.py
+# سجل مهمة مضغوط: __slots__ بدل dict لكل صف، مع إبقاء الوصول بأسلوب القاموس
+# (task["name"]) حتى لا يتغير أي كود يستخدم النتائج.
+
+from collections.abc import MutableMapping
+
+_KEYS = ("name", "completed")
+_ID_KEYS = ("id", "name", "completed")
+_FIELDS = frozenset(_ID_KEYS)
+
+
+class Task(MutableMapping):
+    """A task row that behaves like {"name": ..., "completed": ...}.
+
+    `id` is optional; it only shows up as a key when it is set (task_module
+    assigns one, the databases do not). Task is not a dict, so json.dumps
+    raises TypeError on it; serialise `task.to_dict()` instead.
+    """
+
+    __slots__ = ("name", "completed", "id")
+
+    def __init__(self, name, completed=False, id=None):
+        self.name = name
+        self.completed = completed
+        self.id = id
+
+    def __getitem__(self, key):
+        if key in _FIELDS and (key != "id" or self.id is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("Task fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(_KEYS if self.id is None else _ID_KEYS)
+
+    def __len__(self):
+        return 2 if self.id is None else 3
+
+    def __contains__(self, key):
+        return key in _FIELDS and (key != "id" or self.id is not None)
+
+    def __repr__(self):
+        return f"Task({self.to_dict()!r})"
+
+    def to_dict(self):
+        if self.id is None:
+            return {"name": self.name, "completed": self.completed}
+        return {"id": self.id, "name": self.name, "completed": self.completed}
+
+
+def task_row_factory(cursor, row):
+    """sqlite3 row_factory for `SELECT name, completed ...` queries."""
+    return Task(row[0], bool(row[1]))
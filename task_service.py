@@ -1,60 +1,510 @@
 # task_service.py
 # نسخة مُصلَحة: لا ثغرات — تمنع الأسماء الفارغة، تمنع التكرار (غير حسّاسة للحالة)، وتعالج أخطاء DB.
 
+import itertools
+import os
 import sqlite3
 
-class RealDatabase:
-    def __init__(self):
-        # تعريف الجدول مع UNIQUE و COLLATE NOCASE لمنع التكرار بغض النظر عن حالة الحروف
-        self.conn = sqlite3.connect(':memory:')
+try:
+    from .cli_batch import read_commands, run_batch
+    from .metrics import count_found, count_rows, instrumented
+    from .snapshot import DEFAULT_STEP_PAGES, DEFAULT_STEP_SLEEP, SnapshotScheduler, load_snapshot, save_snapshot
+    from .sql_trace import TracingConnection
+    from .sqlite_profiles import MEMORY, connect
+    from .storage import (
+        CREATED, DEFAULT_CHUNK_SIZE, DEFAULT_FETCH_SIZE, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID,
+        TaskStorage, _clean, _count_duplicates, _count_matched, _count_rejected, nocase_key,
+    )
+    from .task_io import export_tasks, import_tasks
+    from .task_record import Task, task_row_factory
+except ImportError:  # تشغيل مباشر: python task_service.py
+    from cli_batch import read_commands, run_batch
+    from metrics import count_found, count_rows, instrumented
+    from snapshot import DEFAULT_STEP_PAGES, DEFAULT_STEP_SLEEP, SnapshotScheduler, load_snapshot, save_snapshot
+    from sql_trace import TracingConnection
+    from sqlite_profiles import MEMORY, connect
+    from storage import (
+        CREATED, DEFAULT_CHUNK_SIZE, DEFAULT_FETCH_SIZE, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID,
+        TaskStorage, _clean, _count_duplicates, _count_matched, _count_rejected, nocase_key,
+    )
+    from task_io import export_tasks, import_tasks
+    from task_record import Task, task_row_factory
+
+
+def _count_deleted(outcomes):
+    return sum(deleted for _, deleted in outcomes)
+
+
+def _count_page(page):
+    return len(page[0])
+
+
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    name, content='tasks', content_rowid='rowid', prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF name ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO tasks_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+"""
+
+
+# صفّان من المتغيرات لكل مهمة؛ 499 صفاً تبقى تحت الحد الأدنى لعدد المتغيرات في SQLite (999)
+_ROWS_PER_INSERT = 499
+
+
+# صف واحد من العدّادات تحدّثه المشغّلات داخل معاملة كل تعديل، فتُقرأ الإحصاءات بـ O(1)
+# بدل COUNT(*) على الجدول كله. completed غير الصفر يُعدّ منجزاً، و NULL يُعدّ معلّقاً كما في Task
+_STATS_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS task_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL, completed INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO task_stats (id, total, completed)
+    SELECT 1, COUNT(*), COUNT(*) FILTER (WHERE IFNULL(completed, 0) != 0) FROM tasks;
+CREATE TRIGGER IF NOT EXISTS task_stats_insert AFTER INSERT ON tasks BEGIN
+    UPDATE task_stats SET total = total + 1, completed = completed + (IFNULL(new.completed, 0) != 0) WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON tasks BEGIN
+    UPDATE task_stats SET total = total - 1, completed = completed - (IFNULL(old.completed, 0) != 0) WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS task_stats_update AFTER UPDATE OF completed ON tasks
+    WHEN (IFNULL(old.completed, 0) != 0) != (IFNULL(new.completed, 0) != 0) BEGIN
+    UPDATE task_stats SET completed = completed + (IFNULL(new.completed, 0) != 0) - (IFNULL(old.completed, 0) != 0)
+        WHERE id = 1;
+END;
+COMMIT;
+"""
+
+
+def _like_prefix(prefix):
+    # LIKE 'abc%' على عمود COLLATE NOCASE يصبح بحث نطاق على فهرس UNIQUE (case_sensitive_like مطفأ)
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _fts_query(text):
+    # كل كلمة عبارة بين علامتي تنصيص مع * للبادئة، فلا تُفسَّر AND/OR/NEAR أو الرموز كصيغة FTS5
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+
+class RealDatabase(TaskStorage):
+    """SQLite storage engine (in memory by default, or a file with a PRAGMA profile).
+
+    ``search_index=True`` adds the FTS5 word index that ``search`` ranks
+    with. It is off by default because its triggers make every insert and
+    delete several times slower; a file that already has the index keeps
+    using it. Without it ``search`` returns name-prefix matches only.
+    """
+
+    def __init__(self, path=MEMORY, profile=None, pragmas=None, tracer=None, search_index=False, **connect_kwargs):
+        # path: ':memory:' افتراضياً، أو مسار ملف مع ملف إعداد PRAGMA (انظر sqlite_profiles.py)
+        if tracer is not None:
+            # tracer (sql_trace.SqlTracer) يقيس كل جملة؛ يحتاج اتصالاً من نوع TracingConnection
+            connect_kwargs["factory"] = TracingConnection
+        self.conn = connect(path, profile=profile, pragmas=pragmas, **connect_kwargs)
+        if tracer is not None:
+            tracer.attach(self.conn)
         self.cursor = self.conn.cursor()
+        self.search_index = search_index
+        self._create_schema()
+
+    def _create_schema(self):
+        # تعريف الجدول مع UNIQUE و COLLATE NOCASE لمنع التكرار بغض النظر عن حالة الحروف
         self.cursor.execute(
             "CREATE TABLE IF NOT EXISTS tasks (name TEXT UNIQUE COLLATE NOCASE, completed INTEGER)"
         )
         self.conn.commit()
+        # العدّادات تُنشأ وتُملأ مع مشغّلاتها في معاملة واحدة، فلا يفوتها إدخال من اتصال آخر.
+        # الفحص أولاً: اتصالات المجموعة الجديدة لا تطلب قفل الكتابة إذا كان المخطط موجوداً
+        if not self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'task_stats_update'").fetchone():
+            self.conn.executescript(_STATS_SCHEMA)
+        # الفهرس اختياري؛ لكن إن كان موجوداً في الملف فمشغّلاته تعمل أصلاً، فنستفيد منه
+        if self.search_index or self._has_search_index():
+            self.search_index = self._create_search_index()
+
+    def _has_search_index(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'").fetchone() is not None
 
+    def _create_search_index(self):
+        # فهرس FTS5 خارجي المحتوى: يخزّن الكلمات فقط ويقرأ الأسماء من tasks عبر rowid.
+        # المشغّلات تحدّثه في المعاملة نفسها؛ تحديث completed وحده لا يلمسه
+        exists = self._has_search_index()
+        try:
+            self.conn.executescript(_SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            # SQLite مبني بلا FTS5: search يعود إلى البحث بالبادئة عبر فهرس الاسم
+            return False
+        if not exists:
+            # جدول قائم (ملف أو لقطة أقدم) يُفهرس مرة واحدة
+            self.rebuild_search_index()
+        return True
+
+    def rebuild_search_index(self):
+        """Re-index every name; needed only after a full VACUUM renumbers rowids."""
+        self.conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+        self.conn.commit()
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path, path=MEMORY, **kwargs):
+        """Warm start: open a database (in memory by default) loaded from a snapshot file."""
+        db = cls(path, **kwargs)
+        try:
+            load_snapshot(snapshot_path, db.conn)
+            # لقطة من إصدار أقدم قد لا تحمل فهرس البحث
+            db._create_schema()
+        except Exception:
+            db.close()
+            raise
+        return db
+
+    @instrumented("db.snapshot")
+    def snapshot(self, path, pages=DEFAULT_STEP_PAGES, sleep=DEFAULT_STEP_SLEEP, progress=None):
+        """Write a consistent copy of the database to ``path``; see snapshot.save_snapshot."""
+        return save_snapshot(self.conn, path, pages, sleep, progress)
+
+    @instrumented("db.insert", duplicates=_count_rejected)
     def insert(self, task):
-        # إدخال محمي: نحاول الإدخال ونحوّل IntegrityError إلى ValueError لرسالة أوضح
+        # إدخال في جملة واحدة: ON CONFLICT DO NOTHING يترك rowcount = 0 عند تكرار الاسم
+        # طبقاً لقيد UNIQUE، فنعيد False بدل استثناء كما تنص TaskStorage
+        name = _clean(task['name'])
+        if not name:
+            return False
+        self.cursor.execute(
+            "INSERT INTO tasks (name, completed) VALUES (?, ?) ON CONFLICT(name) DO NOTHING",
+            (name, int(task['completed']))
+        )
+        self.conn.commit()
+        return self.cursor.rowcount > 0
+
+    @instrumented("db.insert_many", duplicates=_count_duplicates)
+    def insert_many(self, tasks, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Insert many tasks in one transaction.
+
+        Returns a list of (name, status) in input order, where status is one of
+        CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB or INVALID.
+        """
+        results = []
+        tasks = iter(tasks)
         try:
+            # الصفوف التي يُدخلها هذا الاستدعاء تأخذ rowid أكبر من الحد الحالي،
+            # وبهذا نميّز تكرار الدفعة عن تكرار قاعدة البيانات دون الاحتفاظ بكل الأسماء.
+            # BEGIN IMMEDIATE يأخذ قفل الكتابة قبل قراءة الحد، فلا يُدخل اتصال آخر صفاً فوقه
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self.cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM tasks")
+            batch_start = self.cursor.fetchone()[0]
+            while True:
+                chunk = list(itertools.islice(tasks, chunk_size))
+                if not chunk:
+                    break
+                results.extend(self._insert_chunk(chunk, batch_start))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return results
+
+    def _insert_chunk(self, chunk, batch_start):
+        statuses = []
+        pending = {}
+        for task in chunk:
+            name = task['name']
+            name = name.strip() if isinstance(name, str) else ""
+            if not name:
+                statuses.append((name, INVALID))
+                continue
+            key = nocase_key(name)
+            if key in pending:
+                statuses.append((name, DUPLICATE_IN_BATCH))
+                continue
+            pending[key] = (name, int(task['completed']))
+            statuses.append((name, CREATED))
+
+        existing = {}
+        if pending:
+            placeholders = ", ".join("?" * len(pending))
             self.cursor.execute(
-                "INSERT INTO tasks (name, completed) VALUES (?, ?)",
-                (task['name'], int(task['completed']))
+                f"SELECT rowid, name FROM tasks WHERE name IN ({placeholders})",
+                [row[0] for row in pending.values()]
             )
-            self.conn.commit()
-        except sqlite3.IntegrityError:
-            # يحدث عندما يكون الاسم مكررًا طبقاً لقيد UNIQUE
-            raise ValueError(f"Task with name '{task['name']}' already exists.")
+            existing = {nocase_key(name): rowid for rowid, name in self.cursor.fetchall()}
+            self._insert_rows([row for key, row in pending.items() if key not in existing])
 
+        for i, (name, status) in enumerate(statuses):
+            if status != CREATED:
+                continue
+            rowid = existing.get(nocase_key(name))
+            if rowid is None:
+                continue
+            if rowid > batch_start:
+                statuses[i] = (name, DUPLICATE_IN_BATCH)
+            else:
+                statuses[i] = (name, DUPLICATE_IN_DB)
+        return statuses
+
+    def _insert_rows(self, rows):
+        # INSERT متعدد القيم بدل executemany: مشغّل FTS5 يعمل داخل جملة واحدة لكل مجموعة،
+        # و FTS5 يفرّغ بياناته المعلّقة عند نهاية كل جملة، فصفّ لكل جملة أبطأ بعدة مرات
+        for start in range(0, len(rows), _ROWS_PER_INSERT):
+            group = rows[start:start + _ROWS_PER_INSERT]
+            self.cursor.execute(
+                "INSERT INTO tasks (name, completed) VALUES " + ", ".join(["(?, ?)"] * len(group)),
+                [value for row in group for value in row]
+            )
+
+    @instrumented("db.delete")
     def delete(self, name):
         if name is None:
             return False
         name_to_delete = name.strip()
         if not name_to_delete:
             return False
-        self.cursor.execute("DELETE FROM tasks WHERE LOWER(name) = LOWER(?)", (name_to_delete,))
+        self.cursor.execute("DELETE FROM tasks WHERE name = ?", (name_to_delete,))
+        affected = self.cursor.rowcount
+        self.conn.commit()
+        return affected > 0
+
+    @instrumented("db.update_completion")
+    def update_completion(self, name, completed):
+        if name is None or not name.strip():
+            return False
+        self.cursor.execute("UPDATE tasks SET completed = ? WHERE name = ?", (int(completed), name.strip()))
         affected = self.cursor.rowcount
         self.conn.commit()
         return affected > 0
 
+    @instrumented("db.update_completion_many", rows=_count_matched)
+    def update_completion_many(self, names, completed, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Set `completed` on many tasks in one transaction; returns [(name, found)]."""
+        outcomes = []
+        names = iter(names)
+        try:
+            while True:
+                chunk = [n.strip() if isinstance(n, str) else "" for n in itertools.islice(names, chunk_size)]
+                if not chunk:
+                    break
+                wanted = [n for n in chunk if n]
+                updated = set()
+                if wanted:
+                    # جملة UPDATE واحدة لكل دفعة؛ RETURNING يعيد الأسماء التي طابقت
+                    placeholders = ", ".join("?" * len(wanted))
+                    self.cursor.execute(
+                        f"UPDATE tasks SET completed = ? WHERE name IN ({placeholders}) RETURNING name",
+                        [int(completed), *wanted]
+                    )
+                    updated = {nocase_key(row[0]) for row in self.cursor.fetchall()}
+                outcomes.extend((n, bool(n) and nocase_key(n) in updated) for n in chunk)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return outcomes
+
+    @instrumented("db.delete_many", rows=_count_deleted)
+    def delete_many(self, names, vacuum=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Delete many tasks in one transaction.
+
+        Returns a list of (name, deleted) in input order; deleted is True when
+        the task existed before the call. With vacuum=True
+        the freed pages are returned to the file afterwards.
+        """
+        outcomes = []
+        names = iter(names)
+        try:
+            while True:
+                chunk = list(itertools.islice(names, chunk_size))
+                if not chunk:
+                    break
+                cleaned = [name.strip() if isinstance(name, str) else "" for name in chunk]
+                wanted = list({nocase_key(name): name for name in cleaned if name}.values())
+                deleted = set()
+                if wanted:
+                    # جملة واحدة لكل دفعة؛ RETURNING يخبرنا أي الأسماء كانت موجودة فعلاً
+                    placeholders = ", ".join("?" * len(wanted))
+                    self.cursor.execute(f"DELETE FROM tasks WHERE name IN ({placeholders}) RETURNING name", wanted)
+                    deleted = {nocase_key(row[0]) for row in self.cursor.fetchall()}
+                outcomes.extend((name, bool(name) and nocase_key(name) in deleted) for name in cleaned)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        if vacuum:
+            self.incremental_vacuum()
+        return outcomes
+
+    @instrumented("db.delete_where", rows=count_rows)
+    def delete_where(self, completed, vacuum=False):
+        """Delete every task whose completed flag matches; returns the deleted names."""
+        self.cursor.execute("DELETE FROM tasks WHERE completed = ? RETURNING name", (int(completed),))
+        deleted = [row[0] for row in self.cursor.fetchall()]
+        self.conn.commit()
+        if vacuum:
+            self.incremental_vacuum()
+        return deleted
+
+    def incremental_vacuum(self, max_pages=None):
+        """Return free pages to the OS; needs auto_vacuum=INCREMENTAL (see sqlite_profiles).
+
+        Returns the number of pages released. Refuses to run inside an open
+        transaction, because executescript would commit it first.
+        """
+        if self.conn.in_transaction:
+            raise RuntimeError("incremental_vacuum needs the open transaction committed or rolled back first.")
+        before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        pages = "" if max_pages is None else f"({int(max_pages)})"
+        # execute() يخطو الجملة مرة واحدة فتُحرَّر صفحة واحدة فقط؛ executescript يكملها حتى النهاية
+        self.conn.executescript(f"PRAGMA incremental_vacuum{pages};")
+        return before - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    @instrumented("db.find", rows=count_found)
     def find(self, name):
         if name is None:
             return None
         name_to_find = name.strip()
         if not name_to_find:
             return None
-        # بحث غير حساس لحالة الحروف لضمان توافق مع CREATE TABLE COLLATE NOCASE
-        self.cursor.execute("SELECT name, completed FROM tasks WHERE LOWER(name) = LOWER(?)", (name_to_find,))
+        # المقارنة تستخدم COLLATE NOCASE الخاص بالعمود، فيُستعمل فهرس UNIQUE بدل مسح الجدول
+        self.cursor.execute("SELECT name, completed FROM tasks WHERE name = ?", (name_to_find,))
         return self.cursor.fetchone()
 
+    def _task_cursor(self):
+        # row_factory يبني Task مباشرة من صفوف المؤشر بدل قاموس لكل صف
+        cursor = self.conn.cursor()
+        cursor.row_factory = task_row_factory
+        return cursor
+
+    @instrumented("db.get_all", rows=count_rows)
     def get_all(self):
-        self.cursor.execute("SELECT name, completed FROM tasks ORDER BY rowid")
-        return [{"name": row[0], "completed": bool(row[1])} for row in self.cursor.fetchall()]
+        cursor = self._task_cursor()
+        cursor.execute("SELECT name, completed FROM tasks ORDER BY rowid")
+        return cursor.fetchall()
+
+    def count(self):
+        return self.task_stats()["total"]
+
+    @instrumented("db.task_stats")
+    def task_stats(self):
+        """Task counts from the trigger-maintained task_stats row (no table scan)."""
+        total, completed = self.conn.execute("SELECT total, completed FROM task_stats WHERE id = 1").fetchone()
+        return {"total": total, "completed": completed, "pending": total - completed}
+
+    def iter_tasks(self, chunk_size=DEFAULT_FETCH_SIZE):
+        """Yield tasks in insertion order, fetching `chunk_size` rows at a time."""
+        # مؤشر مستقل حتى لا تقطع العمليات الأخرى على self.cursor هذا التكرار
+        cursor = self._task_cursor()
+        try:
+            cursor.execute("SELECT name, completed FROM tasks ORDER BY rowid")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    @instrumented("db.list_tasks", rows=count_rows)
+    def list_tasks(self, after_rowid=0, limit=100):
+        """Return (tasks, last_rowid) for the page after `after_rowid`.
+
+        Pass last_rowid back as `after_rowid` to get the next page; it is
+        None once there are no more rows.
+        """
+        # ترقيم بالمفتاح (keyset): WHERE rowid > ? يقفز مباشرة عبر مفتاح الجدول بدل OFFSET
+        self.cursor.execute(
+            "SELECT rowid, name, completed FROM tasks WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (after_rowid, limit)
+        )
+        rows = self.cursor.fetchall()
+        tasks = [Task(row[1], bool(row[2])) for row in rows]
+        return tasks, (rows[-1][0] if rows else None)
+
+    @instrumented("db.search", rows=_count_page)
+    def search(self, query, limit=20, after=None):
+        """Ranked search for tasks whose words start with every word of ``query``.
+
+        Returns (tasks, cursor); pass the cursor back as ``after`` for the
+        next page, or stop when it is None. Names starting with the query
+        come first in name order (an exact match leads), then FTS5's bm25
+        relevance.
+        """
+        return super().search(query, limit, after)
+
+    def search_scored(self, query, limit, after=None):
+        """Top ``limit`` matches after cursor ``after`` as [(cursor, Task)]; used to merge shards."""
+        text = query.strip() if isinstance(query, str) else ""
+        if not text:
+            return []
+        scored = []
+        # الطبقة الأولى من فهرس الاسم: مسح نطاق يتوقف عند limit مهما كان عدد المطابقات
+        if after is None or after[0] == 0:
+            scored = [((0, nocase_key(name)), Task(name, bool(completed)))
+                      for name, completed in self._prefix_rows(text, limit, after[1] if after else "")]
+            after = None
+        if len(scored) < limit and self.search_index:
+            scored.extend(self._ranked_words(text, limit - len(scored), after))
+        return scored
+
+    def _ranked_words(self, text, limit, after):
+        # الطبقة الثانية: أفضل limit من FTS5 حسب bm25 دون ربط كل المطابقات بالجدول.
+        # (rank, rowid) ترتيب كامل حتى مع تساوي rank، فيصلح مؤشراً للصفحة التالية
+        match = _fts_query(text)
+        key = nocase_key(text)
+        rank, rowid = (after[1], after[2]) if after else (float("-inf"), 0)
+        found = []
+        batch = limit
+        while True:
+            rows = self.conn.execute(
+                "SELECT f.rank, f.rowid, tasks.name, tasks.completed FROM"
+                " (SELECT rank, rowid FROM tasks_fts WHERE tasks_fts MATCH ? AND (rank, rowid) > (?, ?)"
+                "  ORDER BY rank, rowid LIMIT ?) AS f"
+                " JOIN tasks ON tasks.rowid = f.rowid ORDER BY f.rank, f.rowid",
+                (match, rank, rowid, batch)
+            ).fetchall()
+            for rank, rowid, name, completed in rows:
+                # ما يبدأ بنص البحث ظهر في الطبقة الأولى
+                if not nocase_key(name).startswith(key):
+                    found.append(((1, rank, rowid), Task(name, bool(completed))))
+            if len(found) >= limit or len(rows) < batch:
+                return found[:limit]
+            batch *= 4  # كل الدفعة كانت من الطبقة الأولى؛ نوسّع بدل تكرار استعلام FTS5 لكل صف
+
+    @instrumented("db.search_prefix", rows=_count_page)
+    def search_prefix(self, prefix, limit=20, after=""):
+        """Tasks whose name starts with ``prefix`` (ignoring case), in name order.
+
+        Returns (tasks, last_name); pass last_name back as ``after`` for the
+        next page. Uses the name index, so it never scans the table.
+        """
+        prefix = prefix.strip() if isinstance(prefix, str) else ""
+        if not prefix:
+            return [], None
+        rows = self._prefix_rows(prefix, limit, after)
+        return [Task(name, bool(completed)) for name, completed in rows], (rows[-1][0] if rows else None)
+
+    def _prefix_rows(self, prefix, limit, after):
+        return self.conn.execute(
+            "SELECT name, completed FROM tasks WHERE name LIKE ? ESCAPE '\\' AND name > ? ORDER BY name LIMIT ?",
+            (_like_prefix(prefix), after or "", limit)
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
 
 
 class TaskService:
     def __init__(self, db):
         self.db = db
 
+    @instrumented("service.create_task")
     def create_task(self, name):
         # التحقق من الاسم الفارغ / المسافات
         if name is None or not str(name).strip():
@@ -62,33 +512,99 @@ class TaskService:
 
         task_name = str(name).strip()
 
-        # فحص احتياطي في طبقة الخدمة قبل الإدخال (يجعل الرسالة أوضح قبل محاولة DB)
-        existing = self.db.find(task_name)
-        if existing:
-            raise ValueError(f"Task with name '{task_name}' already exists.")
-
+        # لا نستدعي find() قبل الإدخال: insert() يكتشف التكرار في نفس الجملة
+        # ويعيد False، فلا يوجد سباق بين الفحص والإدخال
         task = {"name": task_name, "completed": False}
-        self.db.insert(task)
+        if not self.db.insert(task):
+            raise ValueError(f"Task with name '{task_name}' already exists.")
         return task
 
+    @instrumented("service.create_tasks", duplicates=_count_duplicates)
+    def create_tasks(self, names, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Create many tasks at once; see RealDatabase.insert_many for the result format."""
+        tasks = ({"name": "" if name is None else str(name), "completed": False} for name in names)
+        return self.db.insert_many(tasks, chunk_size=chunk_size)
+
+    @instrumented("service.find_task", rows=count_found)
+    def find_task(self, name):
+        return self.db.find(name)
+
+    @instrumented("service.mark_task_complete")
+    def mark_task_complete(self, name):
+        if name is None or not str(name).strip():
+            raise ValueError("Invalid task name")
+        return self.db.update_completion(str(name).strip(), True)
+
+    @instrumented("service.delete_task")
     def delete_task(self, name):
         return self.db.delete(name)
 
+    @instrumented("service.delete_tasks", rows=_count_deleted)
+    def delete_tasks(self, names, vacuum=False):
+        return self.db.delete_many(names, vacuum=vacuum)
+
+    @instrumented("service.delete_completed_tasks", rows=count_rows)
+    def delete_completed_tasks(self, vacuum=False):
+        return self.db.delete_where(completed=True, vacuum=vacuum)
+
+    @instrumented("service.get_all_tasks", rows=count_rows)
     def get_all_tasks(self):
         return self.db.get_all()
 
+    def iter_tasks(self, chunk_size=DEFAULT_FETCH_SIZE):
+        return self.db.iter_tasks(chunk_size)
+
+    @instrumented("service.list_tasks", rows=count_rows)
+    def list_tasks(self, after_rowid=0, limit=100):
+        return self.db.list_tasks(after_rowid, limit)
+
+    @instrumented("service.stats")
+    def stats(self):
+        """{'total', 'completed', 'pending'} task counts, read in O(1)."""
+        return self.db.task_stats()
 
-def run_cli():
+    @instrumented("service.search_tasks", rows=_count_page)
+    def search_tasks(self, query, limit=20, after=None):
+        """Ranked search by words or name prefix; returns (tasks, cursor or None)."""
+        return self.db.search(query, limit, after)
+
+
+def _open_memory_db(snapshot):
+    # check_same_thread=False: SnapshotScheduler ينسخ من خيط في الخلفية
+    if snapshot and os.path.isfile(snapshot):
+        return RealDatabase.from_snapshot(snapshot, check_same_thread=False, search_index=True)
+    return RealDatabase(check_same_thread=False, search_index=True)
+
+
+def run_cli(snapshot=None, snapshot_interval=None):
+    """Interactive CLI; with ``snapshot`` the tasks are loaded from and saved to that file."""
     print("--- Interactive Task Management App (fixed) ---")
-    db = RealDatabase()
+    db = _open_memory_db(snapshot)
+    scheduler = SnapshotScheduler(db.conn, snapshot, snapshot_interval) if snapshot else None
     service = TaskService(db)
     print("✅ Database and Service initialized successfully.\n")
+    if snapshot:
+        print(f"💾 Snapshot file: '{snapshot}' ({db.count()} tasks loaded).\n")
     print("Available Commands:")
     print("  add <Task Name>   -> add a task")
     print("  del <Task Name>   -> delete a task")
     print("  show              -> show all tasks")
+    print("  import <file>     -> import tasks from .csv / .jsonl")
+    print("  export <file>     -> export tasks to .csv / .jsonl")
+    print("  search <words>    -> find tasks by words or name prefix")
+    print("  stats             -> count total / completed / pending tasks")
+    print("  snapshot [file]   -> save a snapshot now")
     print("  exit              -> quit\n")
 
+    try:
+        _interactive_loop(db, service, scheduler)
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+        db.close()
+
+
+def _interactive_loop(db, service, scheduler):
     while True:
         try:
             user_input = input("Enter your command: ").strip()
@@ -103,14 +619,13 @@ def run_cli():
                 break
 
             elif command == "show":
-                tasks = service.get_all_tasks()
+                # نطبع أثناء القراءة بدل تحميل الجدول كاملاً في الذاكرة
                 print("\n--- Your Task List ---")
-                if not tasks:
+                count = 0
+                for count, task in enumerate(service.iter_tasks(), start=1):
+                    print(_format_task(count, task))
+                if not count:
                     print("Your list is empty.")
-                else:
-                    for i, task in enumerate(tasks, start=1):
-                        status = "✅ Completed" if task["completed"] else "⏳ Pending"
-                        print(f"{i}. {task['name']} | {status}")
                 print("")
 
             elif command == "add":
@@ -135,6 +650,42 @@ def run_cli():
                 else:
                     print(f"⚠️ Task '{name}' not found or invalid name.\n")
 
+            elif command in ("import", "export"):
+                if len(parts) < 2:
+                    print(f"❌ Error: '{command}' requires a file path.")
+                    continue
+                path = parts[1].strip()
+                try:
+                    if command == "import":
+                        report = import_tasks(db, path, progress=lambda r: print(f"  ... {r}"))
+                        print(f"📥 Imported from '{path}': {report}.\n")
+                    else:
+                        count = export_tasks(db, path)
+                        print(f"📤 Exported {count} tasks to '{path}'.\n")
+                except (OSError, ValueError) as e:
+                    print(f"🛑 {command.capitalize()} Error: {e}\n")
+
+            elif command == "stats":
+                print(f"📊 {_format_stats(service.stats())}\n")
+
+            elif command == "search":
+                if len(parts) < 2:
+                    print("❌ Error: 'search' requires some words.")
+                    continue
+                print("")
+                print("\n".join(_search_lines(service, parts[1])) + "\n")
+
+            elif command == "snapshot":
+                path = parts[1].strip() if len(parts) > 1 else None
+                if path is None and scheduler is None:
+                    print("❌ Error: 'snapshot' requires a file path (or start with --snapshot).")
+                    continue
+                try:
+                    size = scheduler.snapshot() if path is None else db.snapshot(path)
+                    print(f"💾 Snapshot saved to '{path or scheduler.path}' ({size} bytes).\n")
+                except (OSError, sqlite3.Error) as e:
+                    print(f"🛑 Snapshot Error: {e}\n")
+
             else:
                 print(f"❌ Unknown command: '{command}'.\n")
 
@@ -143,5 +694,113 @@ def run_cli():
             print(f"🛑 Unexpected Error: {e}\n")
 
 
+_ADD_MESSAGES = {
+    CREATED: "added",
+    DUPLICATE_IN_BATCH: "already exists",
+    DUPLICATE_IN_DB: "already exists",
+    INVALID: "invalid task name",
+}
+
+
+def _format_task(number, task):
+    status = "✅ Completed" if task["completed"] else "⏳ Pending"
+    return f"{number}. {task['name']} | {status}"
+
+
+def _format_stats(stats):
+    return f"Tasks: {stats['total']} total, {stats['completed']} completed, {stats['pending']} pending"
+
+
+def _search_lines(service, query, limit=20):
+    tasks, more = service.search_tasks(query, limit=limit)
+    lines = [f"--- Search: '{query.strip()}' ---"]
+    lines.extend(_format_task(number, task) for number, task in enumerate(tasks, start=1))
+    if not tasks:
+        lines.append("No matching tasks.")
+    elif more is not None:
+        lines.append(f"... showing the best {limit} matches; refine the search for more.")
+    return lines
+
+
+def run_batch_cli(source, path=MEMORY, snapshot=None):
+    """Run add/del/show/import/export/search/stats/snapshot commands from a file (or '-' for stdin) without prompts.
+
+    With ``snapshot`` the database starts from that file (if it exists) and
+    is saved back to it at the end.
+    """
+    if snapshot and os.path.isfile(snapshot):
+        db = RealDatabase.from_snapshot(snapshot, path, search_index=True)
+    else:
+        db = RealDatabase(path, search_index=True)
+    service = TaskService(db)
+
+    def add(names):
+        return [(status == CREATED, _ADD_MESSAGES[status]) for _, status in service.create_tasks(names)]
+
+    def delete(names):
+        # delete_many يبلغ عن الاسم المكرر داخل الدفعة كمحذوف في كل مرة؛
+        # عند التنفيذ المتتالي لا يُحذف إلا أول ظهور، فنطابق ذلك هنا
+        seen = set()
+        outcomes = []
+        for name, deleted in service.delete_tasks(names):
+            ok = deleted and nocase_key(name) not in seen
+            seen.add(nocase_key(name))
+            outcomes.append((ok, "deleted" if ok else "not found or invalid name"))
+        return outcomes
+
+    def show():
+        number = 0
+        for number, task in enumerate(service.iter_tasks(), start=1):
+            yield _format_task(number, task)
+        if not number:
+            yield "Your list is empty."
+
+    def import_file(path):
+        if not path:
+            raise ValueError("'import' requires a file path")
+        return [f"import {path}: {import_tasks(db, path)}"]
+
+    def export_file(path):
+        if not path:
+            raise ValueError("'export' requires a file path")
+        return [f"export {path}: {export_tasks(db, path)} tasks"]
+
+    def search(query):
+        if not query:
+            raise ValueError("'search' requires some words")
+        return _search_lines(service, query)
+
+    def stats(_):
+        return [_format_stats(service.stats())]
+
+    def snapshot_file(path):
+        path = path or snapshot
+        if not path:
+            raise ValueError("'snapshot' requires a file path")
+        return [f"snapshot {path}: {db.snapshot(path)} bytes"]
+
+    try:
+        result = run_batch(read_commands(source), {"add": add, "del": delete}, show,
+                           commands={"import": import_file, "export": export_file, "search": search,
+                                     "stats": stats, "snapshot": snapshot_file})
+        if snapshot:
+            db.snapshot(snapshot)
+        return result
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    run_cli()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task management CLI")
+    parser.add_argument("--batch", metavar="FILE", help="run commands from FILE ('-' for stdin) without prompts")
+    parser.add_argument("--db", default=MEMORY, help="SQLite file for batch mode (default: in memory)")
+    parser.add_argument("--snapshot", metavar="FILE", help="load tasks from FILE at start and save them on exit")
+    parser.add_argument("--snapshot-interval", type=float, metavar="SECONDS",
+                        help="also save the snapshot every SECONDS in the background (interactive mode)")
+    args = parser.parse_args()
+    if args.batch:
+        run_batch_cli(args.batch, args.db, args.snapshot)
+    else:
+        run_cli(args.snapshot, args.snapshot_interval)
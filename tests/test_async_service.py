@@ -0,0 +1,67 @@
+# tests/test_async_service.py
+import asyncio
+import unittest
+
+from ..async_service import AsyncTaskService
+from ..task_service import RealDatabase, TaskService
+from ..task_EtoE import RealDatabase as EtoEDatabase, TaskService as EtoETaskService
+
+
+class TestAsyncTaskService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.db = RealDatabase(check_same_thread=False)
+        self.service = AsyncTaskService(TaskService(self.db))
+
+    async def asyncTearDown(self):
+        self.service.close()
+
+    async def test_concurrent_creates_are_coalesced(self):
+        names = [f"Task_{i}" for i in range(200)]
+        created = await asyncio.gather(*(self.service.create_task(n) for n in names))
+        self.assertEqual([t["name"] for t in created], names)
+        self.assertEqual(len(await self.service.get_all_tasks()), 200)
+        self.assertLess(self.service.batches, 200)
+
+    async def test_duplicates_and_invalid_names_raise_value_error(self):
+        await self.service.create_task("Existing")
+        results = await asyncio.gather(
+            self.service.create_task("existing"),
+            self.service.create_task("New"),
+            self.service.create_task("NEW"),
+            self.service.create_task("   "),
+            return_exceptions=True,
+        )
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1], {"name": "New", "completed": False})
+        self.assertEqual(str(results[2]), "Task with name 'NEW' already exists.")
+        self.assertEqual(str(results[3]), "Invalid task name")
+
+    async def test_delete_task(self):
+        await self.service.create_task("Temp")
+        self.assertTrue(await self.service.delete_task("temp"))
+        self.assertEqual(await self.service.get_all_tasks(), [])
+
+    async def test_etoe_service_without_create_tasks(self):
+        service = AsyncTaskService(EtoETaskService(EtoEDatabase(check_same_thread=False)))
+        await asyncio.gather(service.create_task("A"), service.create_task("B"))
+        self.assertTrue(await service.mark_task_complete("a"))
+        self.assertEqual(await service.get_all_tasks(),
+                         [{"name": "A", "completed": True}, {"name": "B", "completed": False}])
+        service.close()
+
+
+class TestAsyncServiceAcrossLoops(unittest.TestCase):
+    def test_service_survives_a_second_event_loop(self):
+        service = AsyncTaskService(TaskService(RealDatabase(check_same_thread=False)))
+        self.addCleanup(service.close)
+
+        async def lookups():
+            # عدة طلبات متزامنة مع max_workers=1 تجعل الـ Semaphore ينتظر فيرتبط بالحلقة
+            return await asyncio.gather(*(service.find_task(f"t{i}") for i in range(5)))
+
+        self.assertEqual(asyncio.run(lookups()), [None] * 5)
+        self.assertEqual(asyncio.run(lookups()), [None] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# tests/test_benchmark_suite.py
+import unittest
+
+from ..benchmarks.suite import compare, merge_baseline, run_suite
+
+
+def results(calibration, **timings):
+    return {"meta": {"calibration_us": calibration},
+            "results": {key: {"us_per_op": value, "median_us": value} for key, value in timings.items()}}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_regressions_over_threshold_are_reported(self):
+        baseline = results(1.0, find=10.0, insert=10.0)
+        current = results(1.0, find=13.0, insert=11.0, delete=5.0)
+        rows, regressions = compare(current, baseline, threshold=0.25)
+        self.assertEqual(regressions, ["find"])
+        self.assertEqual(rows[-1][-1], "new")
+
+    def test_uniformly_slower_machine_is_not_a_regression(self):
+        baseline = results(1.0, find=10.0)
+        current = results(2.0, find=20.0)
+        self.assertEqual(compare(current, baseline, 0.25)[1], [])
+        self.assertEqual(compare(current, baseline, 0.25, normalize=False)[1], ["find"])
+
+    def test_partial_update_keeps_one_calibration(self):
+        baseline = results(1.0, find=10.0, insert=10.0)
+        merged = merge_baseline(baseline, results(2.0, insert=30.0, delete=8.0))
+        self.assertEqual(merged["meta"]["calibration_us"], 1.0)
+        self.assertEqual({key: r["us_per_op"] for key, r in merged["results"].items()},
+                         {"find": 10.0, "insert": 15.0, "delete": 4.0})
+        self.assertEqual(compare(results(2.0, find=20.0, insert=30.0), merged, 0.25)[1], [])
+        # تشغيل يغطي كل المفاتيح يستبدل خط الأساس كاملاً
+        full = merge_baseline(baseline, results(2.0, find=20.0, insert=30.0))
+        self.assertEqual(full, results(2.0, find=20.0, insert=30.0))
+
+    def test_run_suite_produces_json_ready_results(self):
+        report = run_suite([100], repeats=2, selected=["RealDatabase.find", "add_task"])
+        self.assertEqual(sorted(report["results"]), ["RealDatabase.find@100", "add_task@100"])
+        self.assertGreater(report["results"]["add_task@100"]["us_per_op"], 0)
+        self.assertIn("calibration_us", report["meta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# tests/test_bulk_operations.py
+import os
+import tempfile
+import threading
+import unittest
+
+from ..lookup_cache import CachedDatabase
+from ..task_service import CREATED, DUPLICATE_IN_BATCH, RealDatabase, TaskService
+from ..task_EtoE import RealDatabase as EtoEDatabase, TaskService as EtoETaskService
+
+
+def count_statements(db, action):
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        result = action()
+    finally:
+        db.conn.set_trace_callback(None)
+    # SQLite يعيد طباعة الجملة نفسها كلما شغّلت مشغّلات فهرس البحث، فنعدّ الجمل المختلفة
+    return result, list(dict.fromkeys(s for s in statements if s.startswith(("UPDATE", "DELETE"))))
+
+
+class TestBulkInsertConcurrency(unittest.TestCase):
+    def test_concurrent_insert_is_not_reported_as_batch_duplicate(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.sqlite")
+            db = RealDatabase(path, timeout=5)
+            other = RealDatabase(path, timeout=5, check_same_thread=False)
+            other_result = []
+
+            def tasks():
+                # اتصال آخر يُدخل "late" بعد أن بدأ insert_many وقبل أن يصل إليه
+                writer = threading.Thread(target=lambda: other_result.append(
+                    other.insert({"name": "late", "completed": False})))
+                writer.start()
+                writer.join(0.2)
+                yield {"name": "early", "completed": False}
+                yield {"name": "late", "completed": False}
+                yield {"name": "LATE", "completed": False}
+
+            results = db.insert_many(tasks(), chunk_size=1)
+            # الاتصال الآخر ينتظر قفل الكتابة حتى ينتهي insert_many، فيجد الاسم موجوداً
+            while not other_result:
+                threading.Event().wait(0.01)
+            self.assertEqual(results, [("early", CREATED), ("late", CREATED), ("LATE", DUPLICATE_IN_BATCH)])
+            self.assertEqual(other_result, [False])
+            db.close()
+            other.close()
+
+
+class TestBulkDelete(unittest.TestCase):
+    def setUp(self):
+        self.db = RealDatabase()
+        self.service = TaskService(self.db)
+        self.service.create_tasks(["a", "b", "c", "d"])
+
+    def test_delete_tasks_reports_per_name(self):
+        outcomes, statements = count_statements(
+            self.db, lambda: self.service.delete_tasks(["A", " b ", "missing", "", "a"])
+        )
+        self.assertEqual(outcomes, [("A", True), ("b", True), ("missing", False), ("", False), ("a", True)])
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([t["name"] for t in self.service.get_all_tasks()], ["c", "d"])
+
+    def test_delete_completed_tasks(self):
+        self.db.cursor.execute("UPDATE tasks SET completed = 1 WHERE name IN ('a', 'c')")
+        self.db.conn.commit()
+        self.assertEqual(sorted(self.service.delete_completed_tasks()), ["a", "c"])
+        self.assertEqual([t["name"] for t in self.service.get_all_tasks()], ["b", "d"])
+        self.assertEqual(self.service.delete_completed_tasks(), [])
+
+    def test_cache_is_invalidated(self):
+        db = CachedDatabase(RealDatabase())
+        TaskService(db).create_tasks(["x", "y"])
+        self.assertIsNotNone(db.find("x"))
+        db.delete_many(["X"])
+        self.assertIsNone(db.find("x"))
+        db.delete_where(completed=False)
+        self.assertIsNone(db.find("y"))
+
+
+class TestBulkMark(unittest.TestCase):
+    def test_mark_tasks_complete(self):
+        db = EtoEDatabase()
+        service = EtoETaskService(db)
+        for name in ("Plan", "Build", "Ship"):
+            service.create_task(name)
+        outcomes, statements = count_statements(db, lambda: service.mark_tasks_complete(["plan", "SHIP", "nope"]))
+        self.assertEqual(outcomes, [("plan", True), ("SHIP", True), ("nope", False)])
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([t["completed"] for t in service.get_all_tasks()], [True, False, True])
+
+
+class TestIncrementalVacuum(unittest.TestCase):
+    def test_file_shrinks_after_large_delete(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "vacuum.sqlite")
+            db = RealDatabase(path)
+            service = TaskService(db)
+            names = [f"Task_{i:05d}_" + "x" * 100 for i in range(5000)]
+            service.create_tasks(names)
+            page_count = db.conn.execute("PRAGMA page_count").fetchone()[0]
+
+            service.delete_tasks(names[:4500], vacuum=True)
+            self.assertEqual(db.conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+            self.assertLess(db.conn.execute("PRAGMA page_count").fetchone()[0], page_count / 2)
+            db.close()
+
+    def test_refuses_to_commit_an_open_transaction(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = RealDatabase(os.path.join(tmpdir, "vacuum.sqlite"))
+            db.conn.execute("INSERT INTO tasks (name, completed) VALUES ('Pending', 0)")
+            with self.assertRaises(RuntimeError):
+                db.incremental_vacuum()
+            db.conn.rollback()
+            self.assertIsNone(db.find("pending"))
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# tests/test_cli_batch.py
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from ..cli_batch import run_batch
+from ..task_EtoE import run_batch_app
+from ..task_service import run_batch_cli
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_consecutive_commands_are_grouped_into_runs(self):
+        calls = []
+
+        def handler(names):
+            calls.append(list(names))
+            return [(True, "ok")] * len(names)
+
+        out = io.StringIO()
+        result = run_batch(["add a", "add b", "del a", "add c", "add d", "add e"],
+                           {"add": handler, "del": handler}, show=list, out=out, run_size=2)
+        self.assertEqual(calls, [["a", "b"], ["a"], ["c", "d"], ["e"]])
+        self.assertEqual(result.ok, {"add": 5, "del": 1})
+        self.assertEqual(out.getvalue().count("\n"), 3)
+
+    def test_errors_are_reported_with_line_numbers(self):
+        out = io.StringIO()
+        result = run_batch(["# comment", "add", "bogus x", "exit", "add never"],
+                           {"add": lambda names: [(True, "")] * len(names)}, show=list, out=out)
+        self.assertEqual(result.lines, 3)
+        self.assertEqual(result.errors, [(2, "'add' requires a task name"), (3, "Unknown command: 'bogus'")])
+        self.assertIn("line 3: Unknown command: 'bogus'", out.getvalue())
+
+    def test_show_streams_lines_to_out(self):
+        out = io.StringIO()
+
+        def show():
+            for i in range(3):
+                # كل سطر سابق وصل إلى out قبل إنتاج السطر التالي
+                self.assertEqual(out.getvalue(), "".join(f"task {j}\n" for j in range(i)))
+                yield f"task {i}"
+
+        run_batch(["show"], {}, show, out=out)
+        self.assertTrue(out.getvalue().startswith("task 0\ntask 1\ntask 2\n"))
+
+    def test_sqlite_errors_are_reported_on_their_line(self):
+        def locked(_):
+            raise sqlite3.OperationalError("database is locked")
+
+        def broken_show():
+            raise sqlite3.DatabaseError("database disk image is malformed")
+            yield
+
+        out = io.StringIO()
+        result = run_batch(["stats", "show", "echo hi"], {}, broken_show, out=out,
+                           commands={"stats": locked, "echo": lambda text: [text]})
+        self.assertEqual(result.errors, [(1, "stats: database is locked"),
+                                         (2, "show: database disk image is malformed")])
+        self.assertEqual(result.ok, {"echo": 1})
+        self.assertTrue(out.getvalue().startswith("hi\n"))
+
+
+class TestBatchClis(unittest.TestCase):
+    def run_script(self, runner, script):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "commands.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(script)
+            out = io.StringIO()
+            with redirect_stdout(out):
+                result = runner(path)
+        return result, out.getvalue()
+
+    def test_task_service_batch_matches_sequential_semantics(self):
+        result, output = self.run_script(run_batch_cli, "add Alpha\nadd alpha\nadd Beta\ndel alpha\ndel ALPHA\nshow\n")
+        self.assertEqual(result.ok, {"add": 2, "del": 1})
+        self.assertEqual([message for _, message in result.errors],
+                         ["add 'alpha': already exists", "del 'ALPHA': not found or invalid name"])
+        self.assertIn("1. Beta | ⏳ Pending", output)
+
+    def test_task_service_batch_stats(self):
+        result, output = self.run_script(run_batch_cli, "add A\nadd B\ndel a\nstats\n")
+        self.assertEqual(result.ok, {"add": 2, "del": 1, "stats": 1})
+        self.assertIn("Tasks: 1 total, 0 completed, 1 pending", output)
+
+    def test_task_service_batch_exports_and_imports(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_path = os.path.join(tmpdir, "tasks.csv")
+            result, output = self.run_script(
+                run_batch_cli, f"add One\nadd Two\nexport {export_path}\nimport {export_path}\nimport\n")
+        self.assertIn("tasks.csv: 2 tasks", output)
+        self.assertIn("2 rows in 1 transactions (2 duplicate in db)", output)
+        self.assertEqual(result.ok, {"add": 2, "export": 1, "import": 1})
+        self.assertEqual(result.errors, [(5, "import: 'import' requires a file path")])
+
+    def test_etoe_batch_marks_tasks(self):
+        result, output = self.run_script(run_batch_app, "add One\nadd Two\nmark two\nmark Three\nshow\nstats\n")
+        self.assertEqual(result.ok, {"add": 2, "mark": 1, "stats": 1})
+        self.assertIn("2 tasks: ✅ 1 completed, ⏳ 1 pending", output)
+        self.assertIn("✅ Two", output)
+        self.assertIn("line 4: mark 'Three': not found", output)
+
+    def test_etoe_batch_show_on_empty_list(self):
+        _, output = self.run_script(run_batch_app, "show\n")
+        self.assertIn("No tasks yet.", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# tests/test_connection_pool.py
+import os
+import tempfile
+import threading
+import unittest
+
+from ..connection_pool import ConnectionPool, PooledDatabase
+from ..task_service import TaskService
+from ..task_EtoE import RealDatabase as EtoEDatabase, TaskService as EtoETaskService
+
+
+class TestPooledDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "pool.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_task_service_runs_unchanged(self):
+        db = PooledDatabase(self.path, pool_size=2)
+        service = TaskService(db)
+        service.create_task("Pooled")
+        with self.assertRaises(ValueError):
+            service.create_task("pooled")
+        self.assertEqual(service.get_all_tasks(), [{"name": "Pooled", "completed": False}])
+        self.assertTrue(service.delete_task("POOLED"))
+        db.close()
+
+    def test_iter_tasks_holds_one_connection(self):
+        db = PooledDatabase(self.path, pool_size=1)
+        TaskService(db).create_tasks(["a", "b"])
+        stream = db.iter_tasks(chunk_size=1)
+        self.assertEqual(next(stream)["name"], "a")
+        with self.assertRaises(TimeoutError):
+            db.pool.acquire(timeout=0.01)
+        self.assertEqual([t["name"] for t in stream], ["b"])
+        self.assertEqual(db.list_tasks(limit=1)[0], [{"name": "a", "completed": False}])
+        db.close()
+
+    def test_etoe_database_class(self):
+        db = PooledDatabase(self.path, database_class=EtoEDatabase)
+        service = EtoETaskService(db)
+        service.create_task("Mark me")
+        self.assertTrue(service.mark_task_complete("mark me"))
+        self.assertEqual(db.find("Mark me"), ("Mark me", 1))
+        db.close()
+
+    def test_connections_are_reused_and_bounded(self):
+        db = PooledDatabase(self.path, pool_size=3)
+        service = TaskService(db)
+        errors = []
+
+        def worker(start):
+            try:
+                for i in range(start, start + 50):
+                    service.create_task(f"Task_{i}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n * 50,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(db.get_all()), 400)
+        self.assertLessEqual(db.pool.opened, 3)
+        db.close()
+
+    def test_acquire_times_out_when_pool_exhausted(self):
+        db = PooledDatabase(self.path, pool_size=1)
+        held = db.pool.acquire()
+        with self.assertRaises(TimeoutError):
+            db.pool.acquire(timeout=0.01)
+        db.pool.release(held)
+        db.close()
+
+    def test_unhealthy_connection_is_replaced(self):
+        db = PooledDatabase(self.path, pool_size=1, health_check_interval=0)
+        conn = db.pool.acquire()
+        db.pool.release(conn)
+        conn.close()  # يحاكي اتصالاً انقطع أثناء خموله
+        TaskService(db).create_task("After reconnect")
+        self.assertEqual(db.pool.opened, 2)
+        self.assertIsNotNone(db.find("after reconnect"))
+        db.close()
+
+    def test_memory_path_is_rejected(self):
+        with self.assertRaises(ValueError):
+            PooledDatabase(":memory:")
+        with self.assertRaises(ValueError):
+            ConnectionPool(lambda: None, size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# tests/test_email_outbox.py
+import json
+import os
+import smtplib
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from unittest.mock import Mock
+
+from ..email_outbox import FAILED, SENT, EmailOutbox, FileSink, SmtpSender
+from ..task_mock import RegistrationService
+from ..user_service import UserService
+
+
+class SlowSender:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def send_email(self, to, subject, body):
+        time.sleep(self.delay)
+        return True
+
+
+class FlakySender:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def send_email(self, to, subject, body):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("SMTP unavailable")
+        return True
+
+
+class FakeSmtp:
+    """smtplib.SMTP stand-in: refused@ and spam@ are rejected, drop@ loses the connection once."""
+
+    delivered = []
+    dropped = set()
+
+    def __init__(self, *args, **kwargs):
+        self.connected = True
+
+    def send_message(self, message):
+        to = message["To"]
+        if to.startswith("refused@"):
+            raise smtplib.SMTPRecipientsRefused({to: (550, b"No such user")})
+        if to.startswith("spam@"):
+            raise smtplib.SMTPDataError(554, b"Rejected as spam")
+        if to.startswith("drop@") and to not in FakeSmtp.dropped:
+            FakeSmtp.dropped.add(to)
+            self.connected = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        FakeSmtp.delivered.append(to)
+
+    def quit(self):
+        if not self.connected:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+
+    def close(self):
+        self.connected = False
+
+
+class TestSmtpSender(unittest.TestCase):
+    def setUp(self):
+        FakeSmtp.delivered = []
+        FakeSmtp.dropped = set()
+        patcher = mock.patch.object(smtplib, "SMTP", FakeSmtp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_result_per_message(self):
+        results = SmtpSender().send_bulk([
+            ("a@example.com", "s", "b"),
+            ("refused@example.com", "s", "b"),
+            ("spam@example.com", "s", "b"),
+            ("c@example.com", "s", "b"),
+            ("drop@example.com", "s", "b"),
+            ("d@example.com", "s", "b"),
+        ])
+        self.assertEqual(results[0], True)
+        self.assertIsInstance(results[1], smtplib.SMTPRecipientsRefused)
+        self.assertIsInstance(results[2], smtplib.SMTPDataError)
+        self.assertEqual(results[3], True)
+        # بعد انقطاع الاتصال: الرسالة الجارية وما بعدها فقط تُعاد
+        self.assertIsInstance(results[4], smtplib.SMTPServerDisconnected)
+        self.assertIs(results[5], results[4])
+        self.assertEqual(FakeSmtp.delivered, ["a@example.com", "c@example.com"])
+
+    def test_outbox_retries_only_unsent_messages(self):
+        recipients = ["a@example.com", "drop@example.com", "b@example.com"]
+        with EmailOutbox(SmtpSender(), workers=1, backoff=0.001) as outbox:
+            for to in recipients:
+                outbox.enqueue(to, "Welcome!", "Hello!")
+        self.assertEqual(sorted(FakeSmtp.delivered), sorted(recipients))
+        self.assertEqual((outbox.sent, outbox.retries), (3, 2))
+
+
+class TestEmailOutbox(unittest.TestCase):
+    def test_registration_does_not_wait_for_delivery(self):
+        outbox = EmailOutbox(SlowSender(0.3), workers=1)
+        self.addCleanup(outbox.close)
+        start = time.perf_counter()
+        self.assertTrue(UserService(outbox).register_user("Alice", "alice@example.com"))
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(outbox.flush(timeout=5))
+        self.assertEqual(outbox.sent, 1)
+
+    def test_file_sink_receives_batched_messages(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "mail.jsonl")
+            sink = FileSink(path)
+            gate = threading.Event()
+            original = sink.send_many
+            sink.send_many = lambda batch: gate.wait(5) and original(batch)
+            outbox = EmailOutbox(sink, workers=1, batch_size=50)
+            ids = [outbox.enqueue(f"user{i}@example.com", "Welcome!", "Hello!") for i in range(101)]
+            gate.set()
+            outbox.close()
+            with open(path, encoding="utf-8") as f:
+                recipients = [json.loads(line)["to"] for line in f]
+        self.assertEqual(len(recipients), 101)
+        self.assertLessEqual(outbox.batches, 4)
+        self.assertTrue(all(outbox.status(i) == SENT for i in ids))
+
+    def test_failed_sends_are_retried_with_backoff(self):
+        sender = FlakySender(failures=2)
+        with EmailOutbox(sender, workers=1, backoff=0.01) as outbox:
+            message_id = outbox.enqueue("bob@example.com", "Welcome!", "Hello Bob!")
+        message = outbox.message(message_id)
+        self.assertEqual((message.status, message.attempts, outbox.retries), (SENT, 3, 2))
+
+    def test_message_fails_after_max_attempts(self):
+        with EmailOutbox(FlakySender(failures=10), workers=2, max_attempts=3, backoff=0.001) as outbox:
+            message_id = outbox.enqueue("carol@example.com", "Welcome!", "Hello!")
+        message = outbox.message(message_id)
+        self.assertEqual(message.status, FAILED)
+        self.assertIsInstance(message.last_error, ConnectionError)
+        self.assertEqual(outbox.failed, 1)
+
+    def test_mock_email_service_works_behind_the_outbox(self):
+        mock_email = Mock()
+        with EmailOutbox(mock_email) as outbox:
+            RegistrationService(outbox).register({"email": "alice@example.com"})
+        mock_email.send_email.assert_called_once_with("alice@example.com", "Welcome!", "Hello!")
+
+    def test_full_outbox_times_out(self):
+        gate = threading.Event()
+        sender = Mock()
+        sender.send_email.side_effect = lambda *args: gate.wait(5)
+        outbox = EmailOutbox(sender, workers=1, max_pending=1)
+        self.addCleanup(outbox.close)
+        self.addCleanup(gate.set)
+        outbox.enqueue("a@example.com", "s", "b")
+        with self.assertRaises(TimeoutError):
+            outbox.enqueue("b@example.com", "s", "b", timeout=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# tests/test_group_commit.py
+import concurrent.futures
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ..group_commit import GroupCommitDatabase, GroupCommitWriter
+from ..task_service import CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, RealDatabase, TaskService
+
+
+class TestGroupCommit(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "group.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_futures_resolve_per_request(self):
+        release = threading.Event()
+
+        def factory():
+            db = RealDatabase(self.path)
+            db.insert({"name": "Existing", "completed": False})
+            original = db.insert_many
+
+            def insert_many(tasks, **kwargs):
+                release.wait()  # نجمع كل الطلبات في مجموعة واحدة
+                return original(tasks, **kwargs)
+
+            db.insert_many = insert_many
+            return db
+
+        writer = GroupCommitWriter(factory, max_batch=10, max_wait=0.5)
+        futures = [writer.submit({"name": n, "completed": False}) for n in ("a", "A", "existing", "b")]
+        release.set()
+        self.assertEqual([f.result(timeout=5) for f in futures],
+                         [CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, CREATED])
+        self.assertEqual(writer.groups_committed, 1)
+        writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.submit({"name": "late", "completed": False})
+
+    def test_malformed_task_fails_alone(self):
+        release = threading.Event()
+
+        def factory():
+            db = RealDatabase(self.path)
+            original = db.insert_many
+
+            def insert_many(tasks, **kwargs):
+                release.wait()
+                return original(tasks, **kwargs)
+
+            db.insert_many = insert_many
+            return db
+
+        writer = GroupCommitWriter(factory, max_batch=10, max_wait=0.5)
+        futures = [writer.submit({"name": n, "completed": c}) for n, c in (("a", False), ("bad", None), ("b", True))]
+        release.set()
+        self.assertEqual(futures[0].result(timeout=5), CREATED)
+        with self.assertRaises(TypeError):
+            futures[1].result(timeout=5)
+        self.assertEqual(futures[2].result(timeout=5), CREATED)
+        writer.close()
+
+    def test_dead_writer_fails_fast(self):
+        def factory():
+            db = RealDatabase(self.path)
+
+            def insert_many(tasks, **kwargs):
+                raise SystemExit  # يقتل خيط الكاتب
+            db.insert_many = insert_many
+            return db
+
+        with mock.patch.object(threading, "excepthook", lambda args: None):
+            writer = GroupCommitWriter(factory)
+            first = writer.submit({"name": "a", "completed": False})
+            with self.assertRaises(RuntimeError):
+                first.result(timeout=5)
+            writer._thread.join(5)
+        with self.assertRaises(RuntimeError):
+            writer.submit({"name": "b", "completed": False})
+
+    def test_task_service_runs_unchanged(self):
+        db = GroupCommitDatabase(self.path)
+        service = TaskService(db)
+        service.create_task("Grouped")
+        with self.assertRaisesRegex(ValueError, "already exists"):
+            service.create_task("grouped")
+        self.assertEqual(db.find("GROUPED"), ("Grouped", 0))
+        self.assertTrue(service.delete_task("grouped"))
+        db.close()
+
+    def test_concurrent_creates_are_grouped(self):
+        db = GroupCommitDatabase(self.path, max_batch=64, max_wait=0.005)
+        service = TaskService(db)
+        duplicates = []
+
+        def create(i):
+            try:
+                service.create_task(f"Task_{i % 500}")
+            except ValueError:
+                duplicates.append(i)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+            list(executor.map(create, range(600)))
+
+        self.assertEqual(len(db.get_all()), 500)
+        self.assertEqual(len(duplicates), 100)
+        self.assertLess(db.writer.groups_committed, 600)
+        db.close()
+
+    def test_startup_errors_are_raised(self):
+        def factory():
+            raise OSError("disk gone")
+
+        with self.assertRaises(OSError):
+            GroupCommitWriter(factory)
+
+
+if __name__ == "__main__":
+    unittest.main()
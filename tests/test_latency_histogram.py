@@ -0,0 +1,45 @@
+# tests/test_latency_histogram.py
+import random
+import unittest
+
+from ..benchmarks.loadgen import parse_mix, run
+from ..latency_histogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_stay_within_bucket_precision(self):
+        rng = random.Random(7)
+        samples = sorted(rng.lognormvariate(6, 1.5) for _ in range(20_000))
+        hist = LatencyHistogram()
+        for us in samples:
+            hist.record_us(us)
+        for p in (50, 95, 99, 99.9):
+            exact = samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+            self.assertAlmostEqual(hist.percentile(p) / exact, 1.0, delta=0.02)
+        self.assertEqual(hist.count, len(samples))
+
+    def test_merge_combines_counts_and_max(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(0.001)
+        b.record(0.050)
+        a.merge(b)
+        summary = a.summary()
+        self.assertEqual(summary["count"], 2)
+        self.assertGreaterEqual(summary["max_us"], 50_000)
+
+    def test_empty_histogram_reports_zero(self):
+        self.assertEqual(LatencyHistogram().percentile(99), 0)
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def test_parse_mix_rejects_unknown_operations(self):
+        self.assertEqual(parse_mix("create=3,find=1"), {"create": 3.0, "find": 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix("explode=1")
+
+    def test_short_run_reports_every_operation(self):
+        report = run(rate=400, duration=0.5, mix=parse_mix("create=1,find=1,mark=1,delete=1,list=1"),
+                     workers=2, preload=50, seed=1)
+        self.assertEqual(set(report["operations"]), {"create", "find", "mark", "delete", "list"})
+        self.assertTrue(all(s["errors"] == 0 for s in report["operations"].values()))
+        self.assertGreater(report["throughput_ops"], 0)
@@ -0,0 +1,71 @@
+# tests/test_lookup_cache.py
+import unittest
+from unittest.mock import MagicMock
+
+from ..lookup_cache import CachedDatabase, LRUCache
+from ..task_service import RealDatabase, TaskService
+from ..task_EtoE import RealDatabase as EtoEDatabase
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("b", None), None)
+        self.assertEqual(cache.get("a"), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1))
+
+    def test_stale_fill_is_dropped(self):
+        cache = LRUCache()
+        generation = cache.generation
+        cache.invalidate("a")
+        self.assertFalse(cache.put("a", None, generation))
+        self.assertEqual(len(cache), 0)
+
+
+class TestCachedDatabase(unittest.TestCase):
+    def setUp(self):
+        self.real = RealDatabase()
+        self.spy = MagicMock(wraps=self.real)
+        self.db = CachedDatabase(self.spy, maxsize=16)
+        self.service = TaskService(self.db)
+
+    def test_repeated_lookups_hit_the_cache(self):
+        self.service.create_task("Hot")
+        for name in ("Hot", "hot", " HOT "):
+            self.assertEqual(self.db.find(name), ("Hot", 0))
+        self.assertEqual(self.spy.find.call_count, 1)
+        self.assertEqual(self.db.stats()["hits"], 2)
+
+    def test_negative_lookups_are_cached_and_invalidated_by_insert(self):
+        self.assertIsNone(self.db.find("Later"))
+        self.assertIsNone(self.db.find("later"))
+        self.assertEqual(self.spy.find.call_count, 1)
+        self.service.create_task("Later")
+        self.assertEqual(self.db.find("LATER"), ("Later", 0))
+
+    def test_insert_many_and_delete_invalidate(self):
+        self.assertIsNone(self.db.find("Bulk"))
+        self.service.create_tasks(["bulk", "other"])
+        self.assertEqual(self.db.find("Bulk"), ("bulk", 0))
+        self.service.delete_task("BULK")
+        self.assertIsNone(self.db.find("bulk"))
+
+    def test_update_completion_invalidates(self):
+        db = CachedDatabase(EtoEDatabase())
+        db.insert({"name": "Mark", "completed": False})
+        self.assertEqual(db.find("mark"), ("Mark", 0))
+        self.assertTrue(db.update_completion("MARK", True))
+        self.assertEqual(db.find("mark"), ("Mark", 1))
+
+    def test_other_methods_pass_through(self):
+        self.service.create_task("Listed")
+        self.assertEqual(self.service.get_all_tasks(), [{"name": "Listed", "completed": False}])
+
+
+if __name__ == "__main__":
+    unittest.main()
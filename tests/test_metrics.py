@@ -0,0 +1,61 @@
+# tests/test_metrics.py
+import os
+import tempfile
+import unittest
+
+from .. import metrics
+from ..task_service import RealDatabase, TaskService
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.service = TaskService(RealDatabase())
+        self.addCleanup(metrics.disable)
+
+    def test_disabled_sink_records_nothing(self):
+        self.assertIsNone(metrics.active_sink())
+        sink = metrics.enable(metrics.InMemorySink())
+        metrics.disable()
+        self.service.create_task("Quiet")
+        self.assertEqual(sink.snapshot(), {})
+
+    def test_counts_calls_duplicates_errors_and_rows(self):
+        with metrics.recording() as sink:
+            self.service.create_task("Alpha")
+            with self.assertRaises(ValueError):
+                self.service.create_task("alpha")
+            with self.assertRaises(ValueError):
+                self.service.create_task("")
+            self.service.create_tasks(["Beta", "BETA", "Alpha"])
+            self.service.get_all_tasks()
+            self.service.find_task("Beta")
+        stats = sink.snapshot()
+        self.assertEqual(stats["service.create_task"]["calls"], 3)
+        self.assertEqual(stats["service.create_task"]["duplicates"], 1)
+        self.assertEqual(stats["service.create_task"]["errors"], 1)
+        self.assertEqual(stats["db.insert_many"]["duplicates"], 2)
+        self.assertEqual(stats["service.get_all_tasks"]["rows"], 2)
+        self.assertEqual(stats["db.find"]["rows"], 1)
+        self.assertGreater(stats["db.insert"]["p99_us"], 0)
+        self.assertIsNone(metrics.active_sink())
+
+    def test_prometheus_file_exporter_writes_text_format(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.prom")
+            exporter = metrics.enable(metrics.PrometheusFileExporter(path))
+            self.service.create_task("Gamma")
+            exporter.close()
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        self.assertIn('taskservice_calls_total{operation="db.insert"} 1', text)
+        self.assertIn("# TYPE taskservice_latency_seconds summary", text)
+        self.assertIn('taskservice_latency_seconds_count{operation="service.create_task"} 1', text)
+        self.assertIn("# HELP taskservice_rows_total Rows affected or returned.", text)
+
+    def test_sink_must_implement_observe(self):
+        with self.assertRaises(TypeError):
+            metrics.MetricsSink()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from Testing_Mocking.task_module import add_task
+from Testing_Mocking.task_module import TaskList, add_task
 
 class TestAddTask(unittest.TestCase):
 
@@ -31,6 +31,30 @@ class TestAddTask(unittest.TestCase):
 
 
 
+class TestTaskList(unittest.TestCase):
+
+    def test_add_task_uses_task_list(self):
+        tasks = TaskList()
+        result = add_task("Study", tasks)
+        self.assertEqual(len(tasks), 1)
+        self.assertEqual(result["id"], 1)
+        self.assertIs(tasks.find("STUDY"), result)
+        with self.assertRaises(ValueError):
+            add_task("study", tasks)
+        with self.assertRaises(ValueError):
+            add_task("", tasks)
+
+    def test_ids_are_not_reused_after_remove(self):
+        tasks = TaskList()
+        add_task("A", tasks)
+        add_task("B", tasks)
+        self.assertTrue(tasks.remove("a"))
+        self.assertFalse(tasks.remove("a"))
+        self.assertEqual(add_task("C", tasks)["id"], 3)
+        self.assertEqual([t["name"] for t in tasks], ["B", "C"])
+        self.assertNotIn("A", tasks)
+        self.assertIn("c", tasks)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
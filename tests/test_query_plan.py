@@ -0,0 +1,56 @@
+# tests/test_query_plan.py
+# نتحقق عبر EXPLAIN QUERY PLAN أن البحث بالاسم يستعمل فهرس UNIQUE ولا يمسح الجدول كاملاً.
+import unittest
+
+from ..task_service import RealDatabase
+from ..task_EtoE import RealDatabase as EtoEDatabase
+
+
+def query_plans(db, action):
+    """Run action(), then EXPLAIN every statement it sent to SQLite."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        db.conn.set_trace_callback(None)
+    plans = []
+    for sql in statements:
+        if "WHERE" not in sql:
+            continue
+        db.cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        plans.append(" | ".join(row[-1] for row in db.cursor.fetchall()))
+    return plans
+
+
+class TestNameLookupUsesIndex(unittest.TestCase):
+    def assertUsesIndex(self, plans):
+        self.assertTrue(plans)
+        for plan in plans:
+            self.assertIn("USING INDEX sqlite_autoindex_tasks_1", plan)
+            self.assertNotIn("SCAN", plan)
+
+    def test_find_and_delete_use_index(self):
+        db = RealDatabase()
+        self.assertUsesIndex(query_plans(db, lambda: db.find("Buy Milk")))
+        self.assertUsesIndex(query_plans(db, lambda: db.delete("Buy Milk")))
+
+    def test_update_completion_and_find_use_index(self):
+        db = EtoEDatabase()
+        self.assertUsesIndex(query_plans(db, lambda: db.update_completion("Buy Milk", True)))
+        self.assertUsesIndex(query_plans(db, lambda: db.find("Buy Milk")))
+
+    def test_lookups_stay_case_insensitive(self):
+        db = RealDatabase()
+        db.insert({"name": "Buy Milk", "completed": False})
+        self.assertEqual(db.find("buy milk"), ("Buy Milk", 0))
+        self.assertTrue(db.delete("BUY MILK"))
+
+        etoe = EtoEDatabase()
+        etoe.insert({"name": "Buy Milk", "completed": False})
+        self.assertTrue(etoe.update_completion("bUY mILK", True))
+        self.assertEqual(etoe.find("buy milk"), ("Buy Milk", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
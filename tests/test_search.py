@@ -0,0 +1,121 @@
+# tests/test_search.py
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from ..sql_trace import SqlTracer
+from ..task_service import RealDatabase, TaskService, run_batch_cli
+
+
+def names(page):
+    return [task["name"] for task in page[0]]
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.db = RealDatabase(search_index=True)
+        self.service = TaskService(self.db)
+        self.service.create_tasks(["Write docs", "Review docs", "Docs review meeting", "Café plans"])
+
+    def test_triggers_follow_insert_delete_and_rename(self):
+        self.service.create_task("Docs backlog")
+        self.assertIn("Docs backlog", names(self.service.search_tasks("docs")))
+        self.service.delete_tasks(["write docs"])
+        self.assertNotIn("Write docs", names(self.db.search("write")))
+        self.db.conn.execute("UPDATE tasks SET name = 'Ship release' WHERE name = 'Review docs'")
+        self.db.conn.commit()
+        self.assertEqual(names(self.db.search("review")), ["Docs review meeting"])
+        self.assertEqual(names(self.db.search("ship rel")), ["Ship release"])
+        # تحديث completed لا يلمس الفهرس ولا يغيّر النتائج
+        self.db.update_completion("ship release", True)
+        self.assertEqual(self.db.search("ship")[0][0]["completed"], True)
+
+    def test_query_text_is_not_fts_syntax(self):
+        self.assertEqual(names(self.db.search("cafe")), ["Café plans"])
+        self.assertEqual(self.db.search('docs OR "'), ([], None))
+        self.assertEqual(self.db.search("NEAR("), ([], None))
+
+    def test_prefix_search_uses_name_index_and_escapes_wildcards(self):
+        self.service.create_tasks(["100% done", "100 things", "a_b", "axb"])
+        self.assertEqual(names(self.db.search_prefix("100%")), ["100% done"])
+        self.assertEqual(names(self.db.search_prefix("A_")), ["a_b"])
+        tracer = SqlTracer(slow_threshold=0, explain=True)
+        traced = RealDatabase(tracer=tracer, search_index=True)
+        tracer.reset()
+        traced.search_prefix("doc")
+        traced.search("docs review")
+        plans = [record.plan for record in tracer.records]
+        # search_prefix، ثم search: طبقة البادئة من الفهرس نفسه وطبقة الكلمات من FTS5
+        self.assertEqual(len(plans), 3)
+        self.assertIn("SEARCH tasks USING INDEX sqlite_autoindex_tasks_1", plans[0][0])
+        self.assertEqual(plans[1], plans[0])
+        self.assertIn("VIRTUAL TABLE", " ".join(plans[2]))
+        self.assertFalse([r.sql for r in tracer.records if r.full_scan])
+
+    def test_keyset_pages_cover_every_match_once(self):
+        self.service.create_tasks([f"Docs page {i}" for i in range(30)] + ["Old docs", "docs"])
+        seen, after = [], None
+        while True:
+            page, after = self.db.search("docs", limit=7, after=after)
+            seen.extend(task["name"] for task in page)
+            if after is None:
+                break
+        self.assertEqual(len(seen), len(set(seen)))
+        # المطابقة التامة أولاً، ثم البادئة بترتيب الاسم، ثم الكلمات حسب bm25
+        self.assertEqual(seen[:2], ["docs", "Docs page 0"])
+        self.assertEqual(seen[-4], "Docs review meeting")
+        self.assertEqual(set(seen[-3:]), {"Write docs", "Review docs", "Old docs"})
+        self.assertEqual(len(seen), 35)
+
+    def test_existing_table_is_indexed_on_open(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.sqlite")
+            with RealDatabase(path, search_index=False) as old:
+                old.insert_many([{"name": "Legacy task", "completed": False}])
+            with RealDatabase(path, search_index=True) as db:
+                self.assertEqual(names(db.search("legacy")), ["Legacy task"])
+                db.insert({"name": "New task", "completed": False})
+                self.assertEqual(len(db.search("task")[0]), 2)
+            # اتصال لاحق بلا الخيار يستخدم الفهرس الموجود في الملف
+            with RealDatabase(path) as db:
+                self.assertTrue(db.search_index)
+                self.assertEqual(names(db.search("task")), ["Legacy task", "New task"])
+
+    def test_old_snapshot_gets_an_index_on_warm_start(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.snapshot")
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE tasks (name TEXT UNIQUE COLLATE NOCASE, completed INTEGER)")
+            conn.execute("INSERT INTO tasks VALUES ('From snapshot', 1)")
+            conn.commit()
+            conn.close()
+            with RealDatabase.from_snapshot(path, search_index=True) as db:
+                self.assertEqual(names(db.search("snap")), ["From snapshot"])
+
+    def test_index_is_opt_in(self):
+        with RealDatabase() as db:
+            self.assertFalse(db.search_index)
+            self.assertIsNone(db.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone())
+            db.insert_many([{"name": n, "completed": False} for n in ("Docs", "Write docs")])
+            # بلا الفهرس: مطابقات البادئة فقط عبر فهرس الاسم
+            self.assertEqual(names(db.search("doc")), ["Docs"])
+
+    def test_batch_cli_search(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, "commands.txt")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("add Write docs\nadd Docs\nadd Other\nsearch doc\nsearch zzz\n")
+            out = io.StringIO()
+            with redirect_stdout(out):
+                result = run_batch_cli(script)
+        self.assertEqual(result.ok, {"add": 3, "search": 2})
+        self.assertIn("--- Search: 'doc' ---\n1. Docs | ⏳ Pending\n2. Write docs | ⏳ Pending", out.getvalue())
+        self.assertIn("No matching tasks.", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
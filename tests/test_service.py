@@ -1,8 +1,13 @@
 # tests/test_service.py
+import os
+import sqlite3
+import tempfile
 import unittest
 # استبدلي اسم المستورد إذا أردتِ تشغيل الاختبارات ضد النسخة المعيبة أو المصححة:
 # from task_service_with_bug import RealDatabase, TaskService
-from ..task_service import RealDatabase, TaskService
+from ..task_service import (
+    CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID, RealDatabase, TaskService,
+)
 
 class TestTaskServiceIntegration(unittest.TestCase):
     def setUp(self):
@@ -23,6 +28,100 @@ class TestTaskServiceIntegration(unittest.TestCase):
             self.service.create_task("")
         self.assertIsNone(self.db.find(""))
 
+    def test_create_duplicate_task_raises_error(self):
+        self.service.create_task("Review PR")
+        with self.assertRaisesRegex(ValueError, "Task with name 'review pr' already exists."):
+            self.service.create_task("  review pr ")
+        self.assertEqual(len(self.service.get_all_tasks()), 1)
+
+    def test_create_task_is_a_single_statement(self):
+        statements = []
+        self.db.conn.set_trace_callback(statements.append)
+        self.service.create_task("One round trip")
+        self.db.conn.set_trace_callback(None)
+        # مشغّلات فهرس البحث تجعل SQLite يعيد طباعة الجملة نفسها؛ نعدّ الجمل المختلفة
+        queries = list(dict.fromkeys(s for s in statements if s.startswith(("SELECT", "INSERT"))))
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith("INSERT"))
+
+    def test_create_tasks_reports_status_per_item(self):
+        self.service.create_task("Existing")
+        results = self.service.create_tasks(["  Write docs ", "existing", "WRITE DOCS", "", None, "Ship"])
+        self.assertEqual(results, [
+            ("Write docs", CREATED),
+            ("existing", DUPLICATE_IN_DB),
+            ("WRITE DOCS", DUPLICATE_IN_BATCH),
+            ("", INVALID),
+            ("", INVALID),
+            ("Ship", CREATED),
+        ])
+        names = [t["name"] for t in self.service.get_all_tasks()]
+        self.assertEqual(names, ["Existing", "Write docs", "Ship"])
+
+    def test_create_tasks_detects_batch_duplicates_across_chunks(self):
+        self.service.create_task("Old")
+        results = self.service.create_tasks(["a", "b", "A", "old", "c", "B"], chunk_size=2)
+        self.assertEqual([status for _, status in results], [
+            CREATED, CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, CREATED, DUPLICATE_IN_BATCH,
+        ])
+        self.assertEqual(len(self.service.get_all_tasks()), 4)
+
+    def test_iter_tasks_streams_in_chunks(self):
+        self.service.create_tasks(f"Task_{i}" for i in range(25))
+        streamed = list(self.service.iter_tasks(chunk_size=4))
+        self.assertEqual(streamed, self.service.get_all_tasks())
+
+    def test_iter_tasks_survives_other_queries(self):
+        self.service.create_tasks(["a", "b", "c"])
+        names = []
+        for task in self.service.iter_tasks(chunk_size=1):
+            self.db.find(task["name"])
+            names.append(task["name"])
+        self.assertEqual(names, ["a", "b", "c"])
+
+    def test_list_tasks_pages_by_rowid(self):
+        self.service.create_tasks(f"Task_{i}" for i in range(7))
+        self.service.delete_task("Task_2")
+        pages = []
+        after = 0
+        while True:
+            page, after = self.service.list_tasks(after_rowid=after, limit=3)
+            if not page:
+                break
+            pages.append([t["name"] for t in page])
+        self.assertEqual(pages, [["Task_0", "Task_1", "Task_3"], ["Task_4", "Task_5", "Task_6"]])
+        self.assertIsNone(after)
+
+    def test_mark_task_complete_updates_row(self):
+        self.service.create_task("Report")
+        self.assertTrue(self.service.mark_task_complete("report"))
+        self.assertEqual(self.service.find_task("Report"), ("Report", 1))
+        self.assertFalse(self.service.mark_task_complete("Missing"))
+
+    def test_stats_counters_are_transactional(self):
+        self.service.create_tasks(["a", "b"])
+        self.db.cursor.execute("UPDATE tasks SET completed = 1 WHERE name = 'a'")
+        self.db.cursor.execute("DELETE FROM tasks WHERE name = 'b'")
+        self.db.conn.rollback()
+        self.assertEqual(self.service.stats(), {"total": 2, "completed": 0, "pending": 2})
+        # قراءة الإحصاءات لا تمسح جدول المهام
+        plan = self.db.conn.execute("EXPLAIN QUERY PLAN SELECT total, completed FROM task_stats WHERE id = 1").fetchall()
+        self.assertNotIn("tasks ", " ".join(row[-1] for row in plan))
+
+    def test_stats_are_seeded_for_an_existing_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.sqlite")
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE tasks (name TEXT UNIQUE COLLATE NOCASE, completed INTEGER)")
+            conn.executemany("INSERT INTO tasks VALUES (?, ?)", [("x", 1), ("y", 0), ("z", None)])
+            conn.commit()
+            conn.close()
+            with RealDatabase(path) as db:
+                self.assertEqual(db.task_stats(), {"total": 3, "completed": 1, "pending": 2})
+                db.update_completion("z", True)
+            with RealDatabase(path) as db:
+                self.assertEqual(db.task_stats(), {"total": 3, "completed": 2, "pending": 1})
+
 
 if __name__ == "__main__":
     unittest.main()
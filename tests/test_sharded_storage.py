@@ -0,0 +1,123 @@
+# tests/test_sharded_storage.py
+import collections
+import os
+import tempfile
+import unittest
+
+from ..sharded_storage import ShardedDatabase, shard_index
+from ..storage import CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID
+from ..task_service import RealDatabase
+from .test_storage_conformance import StorageConformance
+
+
+class TestShardedStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.directory = tmpdir.name
+        return ShardedDatabase(tmpdir.name, shards=3, pool_size=2, search_index=True)
+
+    # الترتيب محفوظ داخل كل ملف فقط، لذلك نقارن المجموعات في اختبارات التكرار والترقيم
+    def test_iteration_keeps_insertion_order(self):
+        self.db.insert_many({"name": f"T{i}", "completed": i % 2 == 1} for i in range(7))
+        self.db.delete("T2")
+        names = [t["name"] for t in self.db.iter_tasks(chunk_size=3)]
+        self.assertEqual(sorted(names), ["T0", "T1", "T3", "T4", "T5", "T6"])
+        for index in range(3):
+            in_shard = [name for name in names if shard_index(name, 3) == index]
+            self.assertEqual(in_shard, sorted(in_shard))
+        self.assertEqual(self.db.count(), 6)
+
+    def test_bulk_delete_and_paging(self):
+        self.db.insert_many({"name": f"T{i}", "completed": i < 3} for i in range(6))
+        self.assertEqual(self.db.delete_many(["t0", "missing", None]), [("t0", True), ("missing", False), ("", False)])
+        self.assertEqual(sorted(self.db.delete_where(completed=True)), ["T1", "T2"])
+        seen, after = [], 0
+        while True:
+            page, after = self.db.list_tasks(after_rowid=after, limit=2)
+            if not page:
+                break
+            self.assertLessEqual(len(page), 2)
+            seen.extend(t["name"] for t in page)
+        self.assertEqual(sorted(seen), ["T3", "T4", "T5"])
+
+    def test_insert_many_is_all_or_nothing(self):
+        # ذرية على مستوى الدفعة فقط (انظر test_insert_many_commits_chunk_by_chunk)
+        self.db.insert({"name": "Old", "completed": True})
+        with self.assertRaises(KeyError):
+            self.db.insert_many([{"name": "a", "completed": False}, {"name": "b", "completed": True},
+                                 {"name": "c"}])
+        self.assertEqual([t["name"] for t in self.db.get_all()], ["Old"])
+        self.assertEqual(self.db.task_stats(), {"total": 1, "completed": 1, "pending": 0})
+
+    def test_search_pages_merge_shards_without_gaps(self):
+        # أسماء متماثلة الطول: bm25 متساوٍ و rowid يتكرر بين الملفات
+        names = [f"Item {i:02d} plan" for i in range(30)]
+        self.db.insert_many({"name": n, "completed": False} for n in names)
+        for query in ("item", "plan"):
+            seen, after = [], None
+            while True:
+                page, after = self.db.search(query, limit=4, after=after)
+                seen.extend(task["name"] for task in page)
+                if after is None:
+                    break
+            self.assertEqual(sorted(seen), names)
+
+    def test_names_route_to_one_shard_ignoring_case(self):
+        self.db.insert({"name": "Mixed Case", "completed": False})
+        counts = [shard.count() for shard in self.db.shards]
+        self.assertEqual(sorted(counts), [0, 0, 1])
+        self.assertIs(self.db.shard_for("MIXED case"), self.db.shard_for(" mixed CASE "))
+
+    def test_shard_count_is_fixed_by_the_manifest(self):
+        with self.assertRaisesRegex(ValueError, "3 shards"):
+            ShardedDatabase(self.directory, shards=4)
+        self.db.insert({"name": "Kept", "completed": True})
+        self.db.close()
+        self.db = ShardedDatabase(self.directory, shards=3)
+        self.assertEqual(self.db.find("kept"), ("Kept", 1))
+
+    def test_ingest_uses_one_writer_per_shard(self):
+        tasks = [{"name": f"Job {i}", "completed": i % 5 == 0} for i in range(2000)]
+        tasks += [{"name": "job 7", "completed": False}, {"name": " ", "completed": False}]
+        totals = self.db.ingest(iter(tasks), transaction_size=300, processes=2)
+        self.assertEqual(totals, collections.Counter({CREATED: 2000, DUPLICATE_IN_DB: 1, INVALID: 1}))
+        self.assertEqual(self.db.count(), 2000)
+        self.assertEqual(self.db.find("JOB 1995"), ("Job 1995", 1))
+        # كل ملف مستقل بذاته: يفتحه RealDatabase عادي ويحتوي فقط أسماءه
+        path = os.path.join(self.directory, "shard-001.sqlite")
+        with RealDatabase(path) as shard:
+            self.assertTrue(all(shard_index(t["name"], 3) == 1 for t in shard.iter_tasks()))
+
+    def test_insert_many_reports_in_input_order_across_shards(self):
+        names = [f"N{i}" for i in range(20)] + ["n3", ""]
+        results = self.db.insert_many({"name": n, "completed": False} for n in names)
+        self.assertEqual([name for name, _ in results], names)
+        self.assertEqual(results[-2:], [("n3", DUPLICATE_IN_BATCH), ("", INVALID)])
+
+        results = self.db.insert_many(({"name": n, "completed": False} for n in ["a", "b", "c", "A", "d"]),
+                                      chunk_size=2)
+        self.assertEqual(results, [("a", CREATED), ("b", CREATED), ("c", CREATED),
+                                   ("A", DUPLICATE_IN_BATCH), ("d", CREATED)])
+
+    def test_insert_many_commits_chunk_by_chunk(self):
+        names = [f"Row {i}" for i in range(10)]
+        tasks = [{"name": n, "completed": False} for n in names]
+        # الدفعة التي فيها المهمة المعيبة لا يكتب منها أي ملف شيئاً...
+        with self.assertRaises(KeyError):
+            self.db.insert_many(tasks[:7] + [{"name": "Broken"}] + tasks[7:], chunk_size=20)
+        self.assertEqual(self.db.count(), 0)
+        # ...أما الدفعات السابقة لها فتبقى، فالعملية ليست ذرية عبر الدفعات والملفات
+        with self.assertRaises(TypeError):
+            self.db.insert_many(tasks[:4] + [{"name": "Broken", "completed": None}] + tasks[4:], chunk_size=4)
+        self.assertEqual(sorted(t["name"] for t in self.db.iter_tasks()), names[:4])
+
+    def test_insert_routes_the_cleaned_name(self):
+        self.assertFalse(self.db.insert({"name": None, "completed": False}))
+        self.assertFalse(self.db.insert({"name": "   ", "completed": False}))
+        self.assertEqual(shard_index(None, 3), shard_index("", 3))
+        self.assertEqual(self.db.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_snapshot.py
+import io
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from ..snapshot import SnapshotScheduler, save_snapshot
+from ..task_service import RealDatabase, TaskService, run_batch_cli
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.dir = tmpdir.name
+        self.path = os.path.join(tmpdir.name, "tasks.snapshot")
+
+    def test_warm_start_restores_tasks_and_constraints(self):
+        db = RealDatabase()
+        db.insert_many({"name": f"Task {i}", "completed": i % 2 == 0} for i in range(500))
+        self.assertGreater(db.snapshot(self.path, pages=2), 0)
+        db.close()
+
+        with RealDatabase.from_snapshot(self.path) as warm:
+            self.assertEqual(warm.count(), 500)
+            self.assertEqual(warm.find("task 10"), ("Task 10", 1))
+            # الفهرس UNIQUE NOCASE جاء مع اللقطة
+            self.assertFalse(warm.insert({"name": "TASK 3", "completed": False}))
+            with self.assertRaisesRegex(ValueError, "already exists"):
+                TaskService(warm).create_task("task 4")
+
+    def test_missing_snapshot_and_bad_destination(self):
+        with self.assertRaises(FileNotFoundError):
+            RealDatabase.from_snapshot(os.path.join(self.dir, "missing.snapshot"))
+        with self.assertRaises(OSError):
+            RealDatabase().snapshot(os.path.join(self.dir, "no-such-dir", "tasks.snapshot"))
+
+    def test_snapshot_waits_for_open_transaction(self):
+        db = RealDatabase(check_same_thread=False)
+        db.insert({"name": "Committed", "completed": False})
+        db.conn.execute("INSERT INTO tasks (name, completed) VALUES ('Uncommitted', 0)")
+        worker = threading.Thread(target=save_snapshot, args=(db.conn, self.path), kwargs={"pages": 1})
+        worker.start()
+        worker.join(0.2)
+        self.assertTrue(worker.is_alive())
+        db.conn.rollback()
+        worker.join(5)
+        with RealDatabase.from_snapshot(self.path) as warm:
+            self.assertEqual([t["name"] for t in warm.iter_tasks()], ["Committed"])
+
+    def test_scheduler_snapshots_in_background_and_on_close(self):
+        db = RealDatabase(check_same_thread=False)
+        scheduler = SnapshotScheduler(db.conn, self.path, interval=0.01)
+        db.insert({"name": "Early", "completed": False})
+        while scheduler.count == 0:
+            threading.Event().wait(0.01)
+        db.insert({"name": "Late", "completed": True})
+        scheduler.close()
+        self.assertIsNone(scheduler.last_error)
+        self.assertEqual([f for f in os.listdir(self.dir)], ["tasks.snapshot"])
+        with RealDatabase.from_snapshot(self.path) as warm:
+            self.assertEqual(warm.find("late"), ("Late", 1))
+
+    def test_batch_cli_resumes_from_snapshot(self):
+        script = os.path.join(self.dir, "commands.txt")
+        for commands in ("add One\nadd Two\n", "add three\nadd one\nshow\n"):
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(commands)
+            out = io.StringIO()
+            with redirect_stdout(out):
+                result = run_batch_cli(script, snapshot=self.path)
+        self.assertEqual(result.ok, {"add": 1})
+        self.assertIn("3. three | ⏳ Pending", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
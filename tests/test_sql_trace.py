@@ -0,0 +1,78 @@
+# tests/test_sql_trace.py
+import json
+import os
+import tempfile
+import unittest
+
+from ..sql_trace import SqlTracer, parameter_shape
+from ..task_service import RealDatabase, TaskService
+
+
+class TestSqlTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = SqlTracer(slow_threshold=0.0, explain=True)
+        self.db = RealDatabase(tracer=self.tracer)
+        self.service = TaskService(self.db)
+        self.service.create_tasks(f"Task_{i}" for i in range(20))
+        self.tracer.reset()
+
+    def test_records_statement_shape_and_rows(self):
+        self.service.mark_task_complete("Task_3")
+        update, commit = list(self.tracer.records)
+        self.assertEqual(update.sql, "UPDATE tasks SET completed = ? WHERE name = ?")
+        self.assertEqual(update.params, "tuple[2]")
+        self.assertEqual(update.rows, 1)
+        # BEGIN الضمني الذي يفتحه sqlite3 + UPDATE؛ إطلاق التوابع لا يُعدّ مرة أخرى
+        self.assertEqual(update.statements, 2)
+        self.assertEqual(commit.sql, "COMMIT")
+
+    def test_explain_flags_unindexed_scans(self):
+        self.db.find("Task_5")
+        indexed = self.tracer.records[-1]
+        self.assertFalse(indexed.full_scan)
+        self.db.cursor.execute("SELECT name FROM tasks WHERE LOWER(name) = ?", ("task_5",))
+        scan = self.tracer.records[-1]
+        self.assertTrue(scan.full_scan, scan.plan)
+
+    def test_slow_queries_go_to_the_log_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "slow.jsonl")
+            tracer = SqlTracer(slow_threshold=0.0, slow_log=path)
+            db = RealDatabase(tracer=tracer)
+            db.insert({"name": "Logged", "completed": False})
+            db.close()
+            with open(path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+        self.assertIn("INSERT INTO tasks (name, completed) VALUES (?, ?) ON CONFLICT(name) DO NOTHING",
+                      [e["sql"] for e in entries])
+
+    def test_slow_log_keeps_no_parameter_values(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "slow.jsonl")
+            tracer = SqlTracer(slow_threshold=0.0, slow_log=path)
+            service = TaskService(RealDatabase(tracer=tracer))
+            service.create_tasks(f"secret-{i}" for i in range(2000))
+            service.find_task("secret-7")
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        self.assertNotIn("secret-", "".join(lines))
+        self.assertLess(max(len(line) for line in lines), 2 * 1024)
+        inserts = [json.loads(line) for line in lines if '"sql": "INSERT INTO tasks (' in line]
+        self.assertTrue(inserts)
+        self.assertEqual({entry["statements"] for entry in inserts}, {1})
+
+    def test_fast_statements_stay_out_of_the_slow_log(self):
+        tracer = SqlTracer(slow_threshold=60.0)
+        db = RealDatabase(tracer=tracer)
+        db.find("anything")
+        self.assertTrue(tracer.records)
+        self.assertEqual(len(tracer.slow_queries), 0)
+
+    def test_parameter_shape_hides_values(self):
+        self.assertEqual(parameter_shape(("a", 1)), "tuple[2]")
+        self.assertEqual(parameter_shape([("a", 1)] * 3, many=True), "3 x tuple[2]")
+        self.assertEqual(parameter_shape({"b": 1, "a": 2}), "dict[a, b]")
+
+
+if __name__ == "__main__":
+    unittest.main()
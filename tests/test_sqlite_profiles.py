@@ -0,0 +1,77 @@
+# tests/test_sqlite_profiles.py
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from ..sqlite_profiles import PRAGMA_PROFILES, resolve_pragmas
+from ..task_service import RealDatabase, TaskService
+from ..task_EtoE import RealDatabase as EtoEDatabase
+
+
+class TestFileBackedDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tasks.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def pragma(self, db, name):
+        return db.conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_tasks_persist_across_connections(self):
+        db = RealDatabase(self.path)
+        TaskService(db).create_task("Persist me")
+        db.close()
+
+        reopened = EtoEDatabase(self.path)
+        self.assertEqual(reopened.find("persist me"), ("Persist me", 0))
+        reopened.close()
+
+    def test_profile_pragmas_are_applied(self):
+        for profile, expected_sync in (("durable", 2), ("fast-ingest", 0)):
+            db = RealDatabase(self.path, profile=profile)
+            self.assertEqual(self.pragma(db, "journal_mode"), "wal")
+            self.assertEqual(self.pragma(db, "synchronous"), expected_sync)
+            self.assertEqual(self.pragma(db, "cache_size"), PRAGMA_PROFILES[profile]["cache_size"])
+            db.close()
+
+    def test_single_pragma_override(self):
+        db = RealDatabase(self.path, profile="durable", pragmas={"synchronous": "NORMAL"})
+        self.assertEqual(self.pragma(db, "synchronous"), 1)
+        db.close()
+
+    def test_auto_vacuum_is_set_on_new_files_only(self):
+        RealDatabase(self.path).close()
+        writer = sqlite3.connect(self.path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            # فتح ملف موجود لا يحتاج قفل الكتابة ولا يفشل على ملف للقراءة فقط
+            db = RealDatabase(self.path, timeout=0.1)
+            self.assertEqual(self.pragma(db, "auto_vacuum"), 2)
+            db.close()
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        readonly = RealDatabase(f"file:{self.path}?mode=ro", uri=True)
+        self.assertEqual(readonly.get_all(), [])
+        readonly.close()
+
+    def test_memory_database_ignores_profile(self):
+        db = RealDatabase(profile="fast-ingest")
+        self.assertEqual(self.pragma(db, "journal_mode"), "memory")
+
+    def test_invalid_profiles_are_rejected(self):
+        with self.assertRaises(ValueError):
+            resolve_pragmas("turbo")
+        with self.assertRaises(ValueError):
+            resolve_pragmas("durable", {"journal_mode": "WAL; DROP TABLE tasks"})
+        with self.assertRaises(ValueError):
+            resolve_pragmas("durable", {"cache_size": "-2000"})
+        with self.assertRaises(ValueError):
+            resolve_pragmas("durable", {"foreign_keys": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# tests/test_storage_conformance.py
+# نفس الاختبارات على كل محرك تخزين: أي محرك جديد يضيف صنفاً فرعياً واحداً في آخر الملف.
+import os
+import tempfile
+import unittest
+
+from ..connection_pool import PooledDatabase
+from ..group_commit import GroupCommitDatabase
+from ..storage import (
+    CREATED, DUPLICATE_IN_BATCH, DUPLICATE_IN_DB, INVALID, MemoryStorage, TaskStorage, create_storage,
+)
+from ..task_EtoE import TaskService as EtoETaskService
+from ..task_record import Task
+from ..task_service import RealDatabase, TaskService
+
+
+class StorageConformance:
+    def make_storage(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.db = self.make_storage()
+        self.addCleanup(self.db.close)
+
+    def test_insert_reports_duplicates_ignoring_case(self):
+        self.assertTrue(self.db.insert({"name": "Write Docs", "completed": False}))
+        self.assertFalse(self.db.insert({"name": "WRITE docs", "completed": True}))
+        self.assertEqual(self.db.find("write DOCS"), ("Write Docs", 0))
+
+    def test_insert_many_statuses(self):
+        self.db.insert({"name": "Old", "completed": False})
+        results = self.db.insert_many([{"name": n, "completed": False}
+                                       for n in (" a ", "A", "old", "", "b")], chunk_size=2)
+        self.assertEqual(results, [("a", CREATED), ("A", DUPLICATE_IN_BATCH), ("old", DUPLICATE_IN_DB),
+                                   ("", INVALID), ("b", CREATED)])
+
+    def test_insert_strips_and_rejects_blank_names(self):
+        self.assertTrue(self.db.insert({"name": " x ", "completed": False}))
+        self.assertEqual(self.db.find("x"), ("x", 0))
+        self.assertFalse(self.db.insert({"name": "X", "completed": False}))
+        self.assertFalse(self.db.insert({"name": None, "completed": False}))
+        self.assertFalse(self.db.insert({"name": "   ", "completed": False}))
+        self.assertEqual(self.db.count(), 1)
+
+    def test_insert_many_is_all_or_nothing(self):
+        self.db.insert({"name": "Old", "completed": True})
+        with self.assertRaises(KeyError):
+            self.db.insert_many([{"name": "a", "completed": False}, {"name": "b", "completed": True},
+                                 {"name": "c"}], chunk_size=2)
+        self.assertEqual([t["name"] for t in self.db.get_all()], ["Old"])
+        self.assertEqual(self.db.task_stats(), {"total": 1, "completed": 1, "pending": 0})
+        self.assertEqual(self.db.insert_many([{"name": "a", "completed": False}]), [("a", CREATED)])
+
+    def test_find_trims_and_rejects_blank_names(self):
+        self.db.insert({"name": "Report", "completed": True})
+        self.assertEqual(self.db.find("  report "), ("Report", 1))
+        self.assertIsNone(self.db.find("   "))
+        self.assertIsNone(self.db.find(None))
+        self.assertIsNone(self.db.find("missing"))
+
+    def test_update_and_delete(self):
+        self.db.insert({"name": "Task", "completed": False})
+        self.assertTrue(self.db.update_completion("TASK", True))
+        self.assertFalse(self.db.update_completion("nope", True))
+        self.assertEqual(self.db.update_completion_many(["task", "nope", ""], False),
+                         [("task", True), ("nope", False), ("", False)])
+        self.assertTrue(self.db.delete("task"))
+        self.assertFalse(self.db.delete("task"))
+        self.assertEqual(self.db.get_all(), [])
+
+    def test_iteration_keeps_insertion_order(self):
+        self.db.insert_many({"name": f"T{i}", "completed": i % 2 == 1} for i in range(7))
+        self.db.delete("T2")
+        tasks = list(self.db.iter_tasks(chunk_size=3))
+        self.assertTrue(all(isinstance(t, Task) for t in tasks))
+        self.assertEqual([(t["name"], t["completed"]) for t in tasks],
+                         [("T0", False), ("T1", True), ("T3", True), ("T4", False), ("T5", True), ("T6", False)])
+        self.assertEqual(self.db.get_all(), tasks)
+
+    def test_bulk_delete_and_paging(self):
+        self.db.insert_many({"name": f"T{i}", "completed": i < 3} for i in range(6))
+        self.assertEqual(self.db.delete_many(["t0", "missing", None]), [("t0", True), ("missing", False), ("", False)])
+        self.assertEqual(self.db.delete_where(completed=True), ["T1", "T2"])
+        page, after = self.db.list_tasks(limit=2)
+        self.assertEqual([t["name"] for t in page], ["T3", "T4"])
+        page, after = self.db.list_tasks(after_rowid=after, limit=2)
+        self.assertEqual([t["name"] for t in page], ["T5"])
+        self.assertEqual(self.db.list_tasks(after_rowid=after), ([], None))
+
+    def test_search_ranks_exact_then_prefix_then_words(self):
+        self.db.insert_many({"name": n, "completed": False}
+                            for n in ("Buy milk", "Milk", "Almond plan", "milk the cows", "Report", "Task_5 review"))
+        page, more = self.db.search("MILK", limit=2)
+        self.assertEqual([t["name"] for t in page], ["Milk", "milk the cows"])
+        page, more = self.db.search("milk", limit=2, after=more)
+        self.assertEqual(([t["name"] for t in page], more), (["Buy milk"], None))
+        self.assertEqual([t["name"] for t in self.db.search("task_5 rev")[0]], ["Task_5 review"])
+        self.assertEqual(self.db.search("  "), ([], None))
+        page, last = self.db.search_prefix("m", limit=1)
+        self.assertEqual([t["name"] for t in page], ["Milk"])
+        self.assertEqual([t["name"] for t in self.db.search_prefix("M", after=last)[0]], ["milk the cows"])
+
+    def test_task_stats_follow_every_change(self):
+        self.assertEqual(self.db.task_stats(), {"total": 0, "completed": 0, "pending": 0})
+        self.db.insert_many({"name": f"T{i}", "completed": i < 2} for i in range(6))
+        self.db.insert({"name": "t0", "completed": False})
+        self.db.update_completion_many(["T2", "T0", "missing"], True)
+        self.db.update_completion("T1", False)
+        self.assertEqual(self.db.task_stats(), {"total": 6, "completed": 2, "pending": 4})
+        self.db.delete("T5")
+        self.db.delete_many(["T0", "T0"])
+        self.db.delete_where(completed=True)
+        self.assertEqual(self.db.task_stats(), {"total": 3, "completed": 0, "pending": 3})
+        self.assertEqual(self.db.count(), 3)
+
+    def test_both_task_services_run_on_the_engine(self):
+        service = TaskService(self.db)
+        service.create_task("Shared")
+        with self.assertRaisesRegex(ValueError, "already exists"):
+            EtoETaskService(self.db).create_task("shared")
+        self.assertTrue(EtoETaskService(self.db).mark_task_complete("SHARED"))
+        self.assertEqual([dict(t) for t in service.get_all_tasks()], [{"name": "Shared", "completed": True}])
+        self.assertEqual(service.stats(), EtoETaskService(self.db).stats())
+
+
+class TestSQLiteStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self):
+        return RealDatabase(search_index=True)
+
+    def test_is_a_task_storage(self):
+        self.assertIsInstance(self.db, TaskStorage)
+
+
+class TestPooledSQLiteStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        return PooledDatabase(os.path.join(tmpdir.name, "tasks.sqlite"), pool_size=2, search_index=True)
+
+
+class TestGroupCommitStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        return GroupCommitDatabase(os.path.join(tmpdir.name, "tasks.sqlite"), pool_size=2, search_index=True)
+
+
+class TestMemoryStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self):
+        return create_storage("memory")
+
+    def test_create_storage_rejects_unknown_engines(self):
+        self.assertIsInstance(create_storage("sqlite"), RealDatabase)
+        self.assertIsInstance(MemoryStorage(), TaskStorage)
+        with self.assertRaises(ValueError):
+            create_storage("redis")
+
+
+if __name__ == "__main__":
+    unittest.main()
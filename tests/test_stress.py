@@ -1,4 +1,3 @@
-import sqlite3
 import time
 import threading
 import concurrent.futures
@@ -6,6 +5,9 @@ import tempfile
 import os
 import pytest
 
+from ..connection_pool import PooledDatabase
+from ..task_service import TaskService
+
 # =========================================================
 # إعدادات اختبار الجهد
 # =========================================================
@@ -15,86 +17,13 @@ RESULTS_LOCK = threading.Lock()  # قفل لتحديث العدادات المش
 
 
 # =========================================================
-# (A) النسخة المعدلة لـ RealDatabase (آمنة للخيوط)
+# (A) قاعدة البيانات الآمنة للخيوط أصبحت جزءاً من المكتبة: PooledDatabase
+#     (connection_pool.py) تعيد استخدام مجموعة محدودة من الاتصالات بدل فتح
+#     اتصال جديد مع كل محاولة إدخال، وتعتمد على busy timeout داخل SQLite بدل
+#     حلقة إعادة المحاولة اليدوية.
 # =========================================================
-class SafeRealDatabase:
-    """نسخة آمنة للخيوط من قاعدة البيانات تستخدم ملفاً مؤقتاً على القرص."""
-
-    TEMP_DB_PATH = tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False).name
-    # FIX 1: زيادة عدد المحاولات لتجاوز أخطاء القفل المتكررة
-    MAX_RETRIES = 20
-    # FIX 2: زيادة طفيفة في تأخير إعادة المحاولة
-    RETRY_DELAY = 0.01
-    # FIX 3: زيادة المهلة الكلية لـ SQLite للسماح بمزيد من الانتظار
-    CONNECTION_TIMEOUT = 10.0  # المهلة بالثواني
-
-    def __init__(self):
-        # تهيئة قاعدة البيانات والتأكد من إنشاء الجدول
-        conn = sqlite3.connect(self.TEMP_DB_PATH, check_same_thread=False, timeout=self.CONNECTION_TIMEOUT)
-        conn.execute("CREATE TABLE IF NOT EXISTS tasks (name TEXT UNIQUE COLLATE NOCASE, completed INTEGER)")
-        conn.commit()
-        conn.close()
-
-    def _get_connection(self):
-        """يُنشئ اتصالاً جديداً لمجرى التنفيذ الحالي مع المهلة الصحيحة."""
-        # تمرير المهلة الصحيحة إلى sqlite3.connect
-        return sqlite3.connect(self.TEMP_DB_PATH, check_same_thread=False, timeout=self.CONNECTION_TIMEOUT)
-
-    def insert(self, task):
-        # لم يعد هناك حاجة لتعيين conn.timeout هنا لأنه تم تعيينه في _get_connection
-        for attempt in range(self.MAX_RETRIES):
-            conn = self._get_connection()
-            try:
-                # 🛑 تمت إزالة السطر conn.timeout = 5 🛑
-                conn.execute("INSERT INTO tasks (name, completed) VALUES (?, ?)",
-                             (task['name'], int(task['completed'])))
-                conn.commit()
-                conn.close()
-                return True
-            except sqlite3.IntegrityError:
-                conn.close()
-                return False
-            except sqlite3.OperationalError as e:
-                conn.close()
-                if 'database is locked' in str(e) and attempt < self.MAX_RETRIES - 1:
-                    # نستخدم تأخير إعادة المحاولة المتزايد (Exponential Backoff)
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
-                    continue
-                else:
-                    # إذا كان خطأ آخر أو نفدت المحاولات
-                    # نطبع الخطأ غير المتوقع ونرفعه
-                    print(f"FATAL DB ERROR after {attempt + 1} attempts: {e}")
-                    raise e
-            except Exception as e:
-                conn.close()
-                raise e
-        return False
-
-    def count_tasks(self):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM tasks")
-        result = cursor.fetchone()[0]
-        conn.close()
-        return result
-
-    def cleanup(self):
-        """إزالة ملف قاعدة البيانات المؤقت."""
-        if os.path.exists(self.TEMP_DB_PATH):
-            os.remove(self.TEMP_DB_PATH)
-
-
-class TaskService:
-    def __init__(self, db):
-        self.db = db
-
-    def create_task(self, name):
-        if name is None or not str(name).strip():
-            raise ValueError("Task name cannot be empty or just whitespace.")
-        task_name = str(name).strip()
-        if not self.db.insert({"name": task_name, "completed": False}):
-            return False
-        return True
+POOL_SIZE = 16  # عدد الاتصالات المفتوحة على الملف مهما كان عدد الخيوط
+CONNECTION_TIMEOUT = 10.0  # المهلة بالثواني
 
 
 # =========================================================
@@ -106,13 +35,14 @@ def create_task_concurrently(service, task_id, results):
     task_name = f"Task_{task_id}"
 
     try:
-        success = service.create_task(task_name)
+        service.create_task(task_name)
+
+        with RESULTS_LOCK:
+            results['success'] += 1
 
+    except ValueError:
         with RESULTS_LOCK:
-            if success:
-                results['success'] += 1
-            else:
-                results['duplicate_error'] += 1
+            results['duplicate_error'] += 1
 
     except Exception as e:
         with RESULTS_LOCK:
@@ -128,7 +58,9 @@ def test_stress_task_creation():
     # NOTE: تم إعادة تعيين TOTAL_TASKS إلى 1000
     global TOTAL_TASKS
 
-    db = SafeRealDatabase()
+    tmpdir = tempfile.TemporaryDirectory()
+    db = PooledDatabase(os.path.join(tmpdir.name, "stress.sqlite"),
+                        pool_size=POOL_SIZE, timeout=CONNECTION_TIMEOUT)
     service = TaskService(db)
 
     results = {'success': 0, 'duplicate_error': 0, 'unexpected_error': 0}
@@ -145,7 +77,7 @@ def test_stress_task_creation():
         end_time = time.time()
 
         total_time = end_time - start_time
-        tasks_in_db = db.count_tasks()
+        tasks_in_db = len(db.get_all())
 
         print("\n--- تقرير اختبار الجهد ---")
         print(f"مدة التشغيل الكلية: {total_time:.4f} ثانية")
@@ -167,4 +99,5 @@ def test_stress_task_creation():
 
     finally:
         # خطوة التنظيف لضمان إزالة ملف قاعدة البيانات المؤقت
-        db.cleanup()
+        db.close()
+        tmpdir.cleanup()
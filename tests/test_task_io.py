@@ -0,0 +1,57 @@
+# tests/test_task_io.py
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from ..task_io import export_tasks, import_tasks
+from ..task_service import RealDatabase
+
+
+class TestTaskImportExport(unittest.TestCase):
+    def setUp(self):
+        self.db = RealDatabase()
+        self.addCleanup(self.db.close)
+
+    def test_csv_import_counts_duplicates_across_transactions(self):
+        self.db.insert({"name": "Existing", "completed": False})
+        source = io.StringIO("name,completed\nA,1\nB,0\na,yes\nexisting,\n,1\nC,true\n")
+        reports = []
+        report = import_tasks(self.db, source, fmt="csv", transaction_size=2,
+                              progress=lambda r: reports.append(r.rows))
+        self.assertEqual(reports, [2, 4, 6])
+        self.assertEqual(report.transactions, 3)
+        self.assertEqual(dict(report.statuses), {"created": 3, "duplicate_in_db": 2, "invalid": 1})
+        self.assertEqual([(t["name"], t["completed"]) for t in self.db.get_all()],
+                         [("Existing", False), ("A", True), ("B", False), ("C", True)])
+
+    def test_jsonl_round_trip_through_files(self):
+        self.db.insert_many([{"name": f"Task_{i}", "completed": i % 2 == 0} for i in range(25)])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tasks.jsonl")
+            self.assertEqual(export_tasks(self.db, path, chunk_size=4), 25)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.loads(next(f)), {"name": "Task_0", "completed": True})
+            copy = RealDatabase()
+            report = import_tasks(copy, path)
+        self.assertEqual(report.statuses["created"], 25)
+        self.assertEqual(copy.get_all(), self.db.get_all())
+
+    def test_csv_export_writes_header_and_flags(self):
+        self.db.insert({"name": "Ship, v2", "completed": True})
+        out = io.StringIO()
+        export_tasks(self.db, out, fmt="csv")
+        self.assertEqual(out.getvalue().splitlines(), ["name,completed", '"Ship, v2",1'])
+
+    def test_bad_input_raises_value_error(self):
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            import_tasks(self.db, io.StringIO('{"name": "ok"}\nnot json\n'), fmt="jsonl")
+        with self.assertRaisesRegex(ValueError, "'name' column"):
+            import_tasks(self.db, io.StringIO("title\nx\n"), fmt="csv")
+        with self.assertRaisesRegex(ValueError, "Unknown format"):
+            import_tasks(self.db, "tasks.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
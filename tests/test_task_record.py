@@ -0,0 +1,55 @@
+# tests/test_task_record.py
+import json
+import pickle
+import unittest
+
+from ..task_record import Task
+from ..task_service import RealDatabase, TaskService
+
+
+class TestTaskRecord(unittest.TestCase):
+    def test_behaves_like_the_old_dict(self):
+        task = Task("Study")
+        self.assertEqual(task["name"], "Study")
+        self.assertFalse(task["completed"])
+        self.assertEqual(task, {"name": "Study", "completed": False})
+        self.assertEqual(dict(task), {"name": "Study", "completed": False})
+        self.assertNotIn("id", task)
+        self.assertIsNone(task.get("id"))
+        self.assertNotEqual(task, {"name": "Study", "completed": True})
+        self.assertNotEqual(task, ("Study", False))
+        task["completed"] = True
+        self.assertTrue(task.completed)
+
+    def test_json_and_pickle(self):
+        task = Task("Study", True, id=2)
+        # لا يجوز أن يخرج json المفاتيح وحدها بصمت
+        with self.assertRaises(TypeError):
+            json.dumps([task])
+        self.assertEqual(json.loads(json.dumps(task.to_dict())), {"id": 2, "name": "Study", "completed": True})
+        self.assertEqual(pickle.loads(pickle.dumps(task)), task)
+        self.assertEqual(pickle.loads(pickle.dumps(task)).id, 2)
+
+    def test_id_is_a_key_only_when_set(self):
+        task = Task("Study", id=3)
+        self.assertEqual(list(task), ["id", "name", "completed"])
+        self.assertEqual(task["id"], 3)
+        with self.assertRaises(KeyError):
+            task["priority"]
+        with self.assertRaises(KeyError):
+            task["priority"] = 1
+
+    def test_has_no_per_instance_dict(self):
+        self.assertFalse(hasattr(Task("x"), "__dict__"))
+
+    def test_database_rows_are_tasks(self):
+        service = TaskService(RealDatabase())
+        service.create_task("Row")
+        rows = service.get_all_tasks()
+        self.assertIsInstance(rows[0], Task)
+        self.assertEqual(rows, [{"name": "Row", "completed": False}])
+        self.assertIs(next(service.iter_tasks()).completed, False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
-from unittest.mock import patch
-from ..user_service import UserService
+from unittest.mock import Mock, patch
+from ..user_service import DUPLICATE, EMAIL_FAILED, INVALID, REGISTERED, EmailService, UserService
 
 
 class TestUserService(unittest.TestCase):
@@ -21,4 +21,48 @@ class TestUserService(unittest.TestCase):
                 self.assertTrue(result)
                 mock_instance.send_email.assert_called_once_with(
                     "alice@example.com", "Welcome!", "Hello Alice!"
-                )
\ No newline at end of file
+                )
+
+
+class TestRegisterUsers(unittest.TestCase):
+    def test_dedupes_by_normalized_email_and_sends_in_bulk(self):
+        email_service = Mock()
+        email_service.send_bulk.side_effect = lambda messages: [True] * len(messages)
+        users = [("Alice", "alice@example.com"), ("Bob", " ALICE@Example.com "), ("", "x@example.com"),
+                 ("Carol", "not-an-email"), ("Dave", "dave@example.com")]
+        results = list(UserService(email_service).register_users(users))
+        self.assertEqual([status for _, _, status in results],
+                         [REGISTERED, DUPLICATE, INVALID, INVALID, REGISTERED])
+        email_service.send_bulk.assert_called_once_with([
+            ("alice@example.com", "Welcome!", "Hello Alice!"),
+            ("dave@example.com", "Welcome!", "Hello Dave!"),
+        ])
+        email_service.send_email.assert_not_called()
+
+    def test_malformed_entries_are_invalid_and_the_rest_continue(self):
+        email_service = Mock()
+        email_service.send_bulk.side_effect = lambda messages: [True] * len(messages)
+        users = [("Alice", "alice@example.com"), "bob@example.com", ("Carol",), None,
+                 ("Dave", "dave@example.com", "extra"), ("Erin", "erin@example.com")]
+        results = list(UserService(email_service).register_users(users))
+        self.assertEqual(results[1], ("bob@example.com", None, INVALID))
+        self.assertEqual([status for _, _, status in results],
+                         [REGISTERED, INVALID, INVALID, INVALID, INVALID, REGISTERED])
+
+    def test_streams_one_bulk_send_per_batch(self):
+        email_service = Mock()
+        email_service.send_bulk.side_effect = lambda messages: [m[0] != "u3@example.com" for m in messages]
+        users = ((f"user{i}", f"u{i}@example.com") for i in range(10))
+        results = UserService(email_service).register_users(users, batch_size=4)
+        first = next(results)
+        self.assertEqual(first, ("user0", "u0@example.com", REGISTERED))
+        self.assertEqual(email_service.send_bulk.call_count, 1)
+        rest = list(results)
+        self.assertEqual(rest[2][2], EMAIL_FAILED)
+        self.assertEqual(email_service.send_bulk.call_count, 3)
+
+    def test_default_send_bulk_uses_send_email(self):
+        service = EmailService()
+        with patch.object(service, "send_email", return_value=True) as send_email:
+            self.assertEqual(service.send_bulk([("a@example.com", "Hi", "Body")]), [True])
+        send_email.assert_called_once_with("a@example.com", "Hi", "Body")
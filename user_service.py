@@ -1,8 +1,35 @@
+# user_service.py
+import itertools
+
+# نتائج register_users لكل مستخدم
+REGISTERED = "registered"
+INVALID = "invalid"
+DUPLICATE = "duplicate"
+EMAIL_FAILED = "email_failed"
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def normalize_email(email):
+    """Strip and lower-case an address; returns '' if it is not a plausible email."""
+    if not isinstance(email, str):
+        return ""
+    email = email.strip().lower()
+    local, at, domain = email.partition("@")
+    if not (local and at and domain) or "@" in domain:
+        return ""
+    return email
+
+
 class EmailService:
     def send_email(self, to, subject, body):
         print(f"Sending email to {to}: {subject}")
         return True
 
+    def send_bulk(self, messages):
+        """Send (to, subject, body) tuples; returns one success flag per message."""
+        return [self.send_email(to, subject, body) for to, subject, body in messages]
+
 
 class UserService:
     def __init__(self, email_service: EmailService):
@@ -13,3 +40,41 @@ class UserService:
             return False
         success = self.email_service.send_email(email, "Welcome!", f"Hello {username}!")
         return success
+
+    def register_users(self, users, batch_size=DEFAULT_BATCH_SIZE):
+        """Register (username, email) pairs, yielding (username, email, status) in input order.
+
+        Emails are deduplicated after normalization and welcome emails go out
+        through email_service.send_bulk, one call per batch. Only the current
+        batch and the set of seen addresses are kept in memory. An entry that
+        is not a (username, email) pair is yielded as (entry, None, INVALID).
+        """
+        seen = set()
+        users = iter(users)
+        while True:
+            chunk = list(itertools.islice(users, batch_size))
+            if not chunk:
+                return
+            results = []
+            messages = []
+            for entry in chunk:
+                try:
+                    username, email = entry
+                except (TypeError, ValueError):
+                    results.append((entry, None, INVALID))
+                    continue
+                name = username.strip() if isinstance(username, str) else ""
+                key = normalize_email(email)
+                if not name or not key:
+                    results.append((username, email, INVALID))
+                elif key in seen:
+                    results.append((username, email, DUPLICATE))
+                else:
+                    seen.add(key)
+                    results.append((username, email, None))
+                    messages.append((email.strip(), "Welcome!", f"Hello {name}!"))
+            sent = iter(self.email_service.send_bulk(messages) if messages else ())
+            for username, email, status in results:
+                if status is None:
+                    status = REGISTERED if next(sent) else EMAIL_FAILED
+                yield username, email, status